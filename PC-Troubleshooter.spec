@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('ui', 'ui'), ('scripts', 'scripts'), ('assets', 'assets'), ('config.ini', '.')],
+    datas=[('ui', 'ui'), ('core', 'core'), ('scripts', 'scripts'), ('assets', 'assets'), ('config.ini', '.'), ('tools.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
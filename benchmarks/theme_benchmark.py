@@ -0,0 +1,93 @@
+"""
+Benchmark theme switches and status indicator flips
+
+    python benchmarks/theme_benchmark.py [--rounds 20]
+
+Builds the main window (offscreen if no display is set), then reports the
+median and worst time, including the relayout and repaint, of a
+light/dark toggle, of the same toggle done the old way (setting that
+theme's own stylesheet on the same widget tree), and of a StatusIndicator
+status flip. The "restyle only" rows leave out the relayout and repaint.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QWidget
+
+
+def measure(action, rounds, app, repaint=True):
+    """Return (median, worst) milliseconds of action(i), followed by event processing if ``repaint``"""
+    timings = []
+    for i in range(rounds):
+        app.processEvents()
+        started = time.perf_counter()
+        action(i)
+        if repaint:
+            app.processEvents()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Theme switch benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    from ui import themes
+    from ui.custom_widgets import StatusIndicator
+    from ui.main_window import MainWindow
+
+    window = MainWindow()
+    window.show()
+    # Let deferred startup work (remaining cards, tray) finish first
+    QTimer.singleShot(500, lambda: app.exit(0))
+    app.exec()
+
+    indicator = StatusIndicator(window)
+    indicator.show()
+    states = ["ready", "running", "error"]
+
+    # Before themes shared one stylesheet, each toggle set the other theme's own sheet
+    categories = themes._category_rules(window.catalog.categories())
+    sheets = [base + themes.COMMON_QSS + categories + "\n" for base in (themes.LIGHT_QSS, themes.DARK_QSS)]
+
+    def toggle(i):
+        themes.apply_theme(window, themes.LIGHT if i % 2 == 0 else themes.DARK, window.catalog.categories())
+
+    def baseline_toggle(i):
+        window.setUpdatesEnabled(False)
+        window.setPalette(themes.theme_palette(themes.LIGHT if i % 2 == 0 else themes.DARK))
+        window.setStyleSheet(sheets[i % 2])
+        window.setUpdatesEnabled(True)
+
+    results = [
+        ("theme toggle", measure(toggle, args.rounds, app)),
+        ("  restyle only", measure(toggle, args.rounds, app, repaint=False)),
+        ("status flip", measure(lambda i: indicator.set_status(states[i % 3]), args.rounds, app)),
+        # Replaces the combined sheet, so it runs last
+        ("baseline toggle", measure(baseline_toggle, args.rounds, app)),
+        ("  restyle only", measure(baseline_toggle, args.rounds, app, repaint=False)),
+    ]
+
+    print(f"{len(window.findChildren(QWidget))} widgets, {args.rounds} rounds")
+    for name, (median, worst) in results:
+        print(f"{name:<24} median {median:8.3f} ms   worst {worst:8.3f} ms")
+
+    window.metrics_sampler.stop()
+    if window.shell_pool is not None:
+        window.shell_pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
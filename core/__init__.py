@@ -0,0 +1 @@
+# Core package for PC Troubleshooter
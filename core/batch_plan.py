@@ -0,0 +1,69 @@
+"""
+Translate simple diagnostic .bat scripts into steps for the shell host pool
+
+Only scripts made entirely of ``echo`` lines, comments and single-line
+``powershell -Command "..."`` calls are translated; anything else (net,
+sc, ipconfig, redirection, control flow) returns None and the script runs
+through cmd.exe as before.
+"""
+
+import os
+import re
+
+ECHO = "echo"
+SHELL = "shell"
+
+# cmd drops only the single separator after "echo"
+_ECHO_RE = re.compile(r"^echo(?:\.|\s(.*))?$", re.IGNORECASE)
+_POWERSHELL_RE = re.compile(r'^powershell(?:\.exe)?\s+-Command\s+"(.*)"$', re.IGNORECASE)
+_COMMENT_RE = re.compile(r"^(?:::|rem(?:\s|$))", re.IGNORECASE)
+_ENV_RE = re.compile(r"%%|%([A-Za-z_][A-Za-z0-9_()]*)%")
+_BATCH_SPECIAL = set("|&<>^")
+
+
+def expand_batch_variables(text, environ=None):
+    """Apply cmd's %VAR% expansion and %% -> % unescaping"""
+    environ = os.environ if environ is None else environ
+
+    def replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        name = match.group(1)
+        for key, value in environ.items():
+            if key.upper() == name.upper():
+                return value
+        # cmd leaves unknown variables untouched
+        return match.group(0)
+
+    return _ENV_RE.sub(replace, text)
+
+
+def plan_batch_script(path, environ=None):
+    """Return a list of (ECHO, text) / (SHELL, command) steps, or None if not translatable"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    steps = []
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if not line or line.lower() == "@echo off" or _COMMENT_RE.match(line):
+            continue
+
+        echo = _ECHO_RE.match(line)
+        if echo:
+            text = echo.group(1) or ""
+            if _BATCH_SPECIAL & set(text):
+                return None
+            steps.append((ECHO, expand_batch_variables(text, environ)))
+            continue
+
+        powershell = _POWERSHELL_RE.match(line)
+        if powershell and '"' not in powershell.group(1):
+            steps.append((SHELL, expand_batch_variables(powershell.group(1), environ)))
+            continue
+
+        return None
+    return steps
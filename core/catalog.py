@@ -0,0 +1,205 @@
+"""
+Tool catalog loaded from the tools.json manifest
+
+The manifest declares every tool once: its script, category, whether it
+only reads or also changes system state, whether it needs administrator
+rights, its typical duration and time limit, the resources it touches and
+how long its result may be cached. It is read once into a ToolCatalog indexed by id,
+script, category and resource that the UI, the suite scheduler, the
+result cache and the CLI all query. Script availability is checked with
+one directory listing at load time instead of on every run.
+"""
+
+import os
+import json
+
+from core import config
+
+MANIFEST_VERSION = 1
+
+
+class ManifestError(ValueError):
+    """Raised when tools.json is missing, malformed or inconsistent"""
+
+
+def default_manifest_path():
+    return os.path.join(config.get_base_path(), "tools.json")
+
+
+def default_scripts_dir():
+    return os.path.join(config.get_base_path(), "scripts")
+
+
+class ToolSpec:
+    """One tool declared in the manifest"""
+
+    def __init__(self, tool_id, name, script, category, read_only=False, admin=False,
+                 expected_duration=None, resources=(), cache_ttl=0, timeout=None):
+        self.id = tool_id
+        self.name = name
+        self.script = script
+        self.category = category
+        self.read_only = read_only
+        self.admin = admin
+        # Typical run time in seconds, used before the tool has any history
+        self.expected_duration = expected_duration
+        # Read-only tools read these resources; mutating tools change them
+        self.resources = frozenset(resources)
+        # Seconds a read-only result may be replayed (0 = never cached)
+        self.cache_ttl = cache_ttl
+        # Seconds before a run is stopped (None = the tool_timeout setting)
+        self.timeout = timeout
+        self.path = None
+        self.available = False
+
+    @property
+    def cacheable(self):
+        return self.read_only and self.cache_ttl > 0
+
+    @property
+    def deadline(self):
+        """Seconds a run may take before it is cancelled, or None for no limit"""
+        timeout = self.timeout if self.timeout is not None else config.get_int("tool_timeout", 600)
+        return timeout if timeout > 0 else None
+
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            tool_id = data["id"]
+            timeout = data.get("timeout")
+            return cls(tool_id, data.get("name", tool_id), data.get("script", f"{tool_id}.bat"),
+                       data["category"], bool(data.get("read_only", False)), bool(data.get("admin", False)),
+                       data.get("expected_duration"), data.get("resources", []), int(data.get("cache_ttl", 0)),
+                       None if timeout is None else float(timeout))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ManifestError(f"Invalid tool entry {data!r}: {e}")
+
+
+class Category:
+    """A group of tools shown as one card in the left panel"""
+
+    def __init__(self, category_id, name, description="", icon="", color="#607D8B"):
+        self.id = category_id
+        self.name = name
+        self.description = description
+        self.icon = icon
+        self.color = color
+        self.tools = []
+
+
+class Suite:
+    """A named set of tools run together through the suite scheduler"""
+
+    def __init__(self, suite_id, name, tools):
+        self.id = suite_id
+        self.name = name
+        self.tools = tools
+
+
+class ToolCatalog:
+    """Indexed, in-memory view of the manifest"""
+
+    def __init__(self, categories, tools, suites=(), scripts_dir=None):
+        self.scripts_dir = scripts_dir or default_scripts_dir()
+        self._categories = {}
+        self._tools = {}
+        self._by_script = {}
+        self._by_resource = {}
+        self._suites = {}
+
+        for category in categories:
+            if category.id in self._categories:
+                raise ManifestError(f"Duplicate category '{category.id}'")
+            self._categories[category.id] = category
+
+        for spec in tools:
+            if spec.id in self._tools:
+                raise ManifestError(f"Duplicate tool '{spec.id}'")
+            if spec.category not in self._categories:
+                raise ManifestError(f"Tool '{spec.id}' has unknown category '{spec.category}'")
+            self._tools[spec.id] = spec
+            self._by_script[spec.script.lower()] = spec
+            self._categories[spec.category].tools.append(spec)
+            for resource in spec.resources:
+                self._by_resource.setdefault(resource, []).append(spec)
+
+        for suite_id, name, tool_ids in suites:
+            unknown = [tool_id for tool_id in tool_ids if tool_id not in self._tools]
+            if unknown:
+                raise ManifestError(f"Suite '{suite_id}' references unknown tool(s): {', '.join(unknown)}")
+            self._suites[suite_id] = Suite(suite_id, name, [self._tools[tool_id] for tool_id in tool_ids])
+
+        self.refresh()
+
+    def refresh(self):
+        """Re-check which scripts exist (one directory listing)"""
+        try:
+            present = {name.lower() for name in os.listdir(self.scripts_dir)}
+        except OSError:
+            present = set()
+        for spec in self._tools.values():
+            spec.path = os.path.join(self.scripts_dir, spec.script)
+            spec.available = spec.script.lower() in present
+
+    def categories(self):
+        """Categories in manifest order, each with its tools"""
+        return list(self._categories.values())
+
+    def tools(self):
+        return list(self._tools.values())
+
+    def get(self, tool_id):
+        """Return the ToolSpec for an id, or None"""
+        return self._tools.get(tool_id)
+
+    def by_script(self, script):
+        """Return the ToolSpec for a script file name or path, or None"""
+        return self._by_script.get(os.path.basename(script).lower())
+
+    def resolve(self, name):
+        """Find a tool by id or script file name"""
+        return self._tools.get(name) or self.by_script(name)
+
+    def touching(self, resource):
+        """Tools that read or change a resource"""
+        return list(self._by_resource.get(resource, []))
+
+    def suite(self, suite_id):
+        """Return a Suite, or None"""
+        return self._suites.get(suite_id)
+
+
+def load_catalog(path=None, scripts_dir=None):
+    """Read and validate a manifest into a ToolCatalog"""
+    path = path or default_manifest_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError as e:
+        raise ManifestError(f"Cannot read tool manifest {path}: {e}")
+    except ValueError as e:
+        raise ManifestError(f"Tool manifest {path} is not valid JSON: {e}")
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        raise ManifestError(f"Unsupported tool manifest version in {path}")
+
+    try:
+        categories = [Category(entry["id"], entry.get("name", entry["id"]), entry.get("description", ""),
+                               entry.get("icon", ""), entry.get("color", "#607D8B"))
+                      for entry in data.get("categories", [])]
+        suites = [(entry["id"], entry.get("name", entry["id"]), list(entry.get("tools", [])))
+                  for entry in data.get("suites", [])]
+    except (KeyError, TypeError) as e:
+        raise ManifestError(f"Invalid entry in {path}: {e}")
+    tools = [ToolSpec.from_dict(entry) for entry in data.get("tools", [])]
+    return ToolCatalog(categories, tools, suites, scripts_dir)
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Return the application's catalog, loading tools.json on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+    return _catalog
@@ -0,0 +1,337 @@
+"""
+Incremental analyzer for the Component-Based Servicing log (CBS.log)
+
+System File Checker writes its results to CBS.log as lines tagged "[SR]",
+in a log that also holds every other servicing operation and commonly
+grows to hundreds of MB. The analyzer memory-maps the log and:
+
+- on the first run, searches backward from the end for "[SR]" lines and
+  stops at the start of the latest SFC run, so only the tail is touched;
+- on later runs, parses forward from the offset it stopped at, so only the
+  bytes appended since are read.
+
+The byte offsets of the latest run's "[SR]" lines are persisted as a line
+index together with the parsed offset. A log that shrank or whose first
+bytes changed was rotated and is analyzed from scratch.
+
+Findings (corrupt, repaired and unrepairable files with their paths) are
+read back through the line index:
+
+    index = CbsLogIndex("CBS.log", "cbs_state.json")
+    index.update()
+    for finding in index.findings():
+        print(finding.kind, finding.path)
+"""
+
+import os
+import re
+import json
+import mmap
+import time
+import hashlib
+import threading
+from datetime import datetime
+
+from core import config
+
+STATE_VERSION = 1
+
+CORRUPT = "corrupt"
+REPAIRED = "repaired"
+UNREPAIRABLE = "unrepairable"
+
+# A file's status is the most severe of its findings
+_SEVERITY = {CORRUPT: 0, REPAIRED: 1, UNREPAIRABLE: 2}
+
+SR_TAG = b"[SR]"
+
+# "[SR]" lines further apart than this belong to different SFC runs
+RUN_GAP = 15 * 60
+
+# Leading bytes hashed to recognise the same log on the next run
+HEAD_BYTES = 4096
+
+# Line offsets kept for the latest run; older lines of a longer run are dropped
+INDEX_LIMIT = 20000
+
+_PATTERNS = [
+    (UNREPAIRABLE, re.compile(r"Cannot repair member file (.+?) of ")),
+    (UNREPAIRABLE, re.compile(r"Could not reproject corrupted file (.+?)(?:;|$)")),
+    (CORRUPT, re.compile(r"Repairing corrupted file (.+?) from store")),
+    (REPAIRED, re.compile(r"Repaired file (.+?) by copying from backup")),
+    (REPAIRED, re.compile(r"Repairing file (.+?) from store")),
+]
+
+_LINE_TIME = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+# [l:10]'Amsi.dll' or [l:10]"Amsi.dll"
+_LENGTH_PREFIX = re.compile(r"^\[l:\d+(?:\{\d+\})?\]")
+
+
+def default_log_path():
+    windows = os.environ.get("SystemRoot", r"C:\Windows")
+    return os.path.join(windows, "Logs", "CBS", "CBS.log")
+
+
+def default_state_path():
+    return os.path.join(config.get_base_path(), "logs", "cbs_state.json")
+
+
+class Finding:
+    """One file SFC reported on"""
+
+    def __init__(self, kind, path, time, line):
+        self.kind = kind
+        self.path = path
+        # "YYYY-MM-DD HH:MM:SS" as written in the log, or None
+        self.time = time
+        self.line = line
+
+    def to_dict(self):
+        return {"kind": self.kind, "path": self.path, "time": self.time, "line": self.line}
+
+
+class UpdateStats:
+    """What one update read"""
+
+    def __init__(self):
+        # The log was analyzed from scratch (first run or rotated log)
+        self.full = False
+        self.size = 0
+        # Bytes searched by this update; the rest was known from the saved offset
+        self.parsed_bytes = 0
+        self.new_lines = 0
+        # Stopped by is_cancelled; the state was left as it was
+        self.cancelled = False
+        self.duration = 0.0
+
+
+def _timestamp(line):
+    """Time of a log line, or None when it does not start with one"""
+    try:
+        return datetime.fromisoformat(line[:19].decode("ascii"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def _clean_path(text):
+    text = _LENGTH_PREFIX.sub("", text.strip()).strip("'\"")
+    if text.startswith("\\??\\"):
+        text = text[4:]
+    return text.replace("\\\\", "\\")
+
+
+def classify(line):
+    """(kind, path) of a finding in one "[SR]" line, or None"""
+    for kind, pattern in _PATTERNS:
+        match = pattern.search(line)
+        if match is not None:
+            return kind, _clean_path(match.group(1))
+    return None
+
+
+def _open_data(f):
+    """Read-only view of a whole file: a memory map, or its bytes where mapping fails"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty file
+        return b""
+    except OSError:
+        return f.read()
+
+
+def _line_at(data, hit, floor, end):
+    """(start, end) of the line holding offset ``hit``, not reaching below ``floor``"""
+    start = data.rfind(b"\n", floor, hit) + 1 or floor
+    stop = data.find(b"\n", hit, end)
+    return start, (end if stop < 0 else stop)
+
+
+class CbsLogIndex:
+    """
+    Line index of the latest SFC run in one CBS.log, persisted as JSON at
+    ``state_path``.
+
+    update() brings the index up to date with the log; lines() and
+    findings() read the indexed lines back.
+    """
+
+    def __init__(self, path, state_path=None):
+        self.path = os.path.abspath(path)
+        self.state_path = state_path
+        # Bytes of the log that have been parsed (always ends on a line boundary)
+        self.offset = 0
+        self.head = ""
+        self.head_length = 0
+        # Time of the newest indexed line, as an ISO string
+        self.last_time = None
+        # Offsets of the latest run's "[SR]" lines, oldest first
+        self.line_offsets = []
+        self._lock = threading.Lock()
+        if state_path:
+            self.load()
+
+    def load(self):
+        """Read the state file; a missing, damaged or foreign file starts empty"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION or data.get("path") != self.path:
+            return
+        self.offset = int(data.get("offset", 0))
+        self.head = data.get("head", "")
+        self.head_length = int(data.get("head_length", 0))
+        self.last_time = data.get("last_time")
+        self.line_offsets = list(data.get("lines", []))
+
+    def save(self):
+        """Write the state file atomically"""
+        if not self.state_path:
+            return
+        data = {"version": STATE_VERSION, "path": self.path, "offset": self.offset, "head": self.head,
+                "head_length": self.head_length, "last_time": self.last_time, "lines": self.line_offsets}
+        temp_path = self.state_path + ".tmp"
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.state_path)
+                # A bare file name lives in the working directory
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temp_path, self.state_path)
+            except OSError:
+                pass
+
+    def _reset(self):
+        self.offset = 0
+        self.head = ""
+        self.head_length = 0
+        self.last_time = None
+        self.line_offsets = []
+
+    def update(self, is_cancelled=None):
+        """
+        Parse what the log gained since the last update and save the state;
+        returns UpdateStats. ``is_cancelled`` is polled between lines; a
+        cancelled update restores the previous state instead of saving.
+        """
+        is_cancelled = is_cancelled or (lambda: False)
+        started = time.perf_counter()
+        stats = UpdateStats()
+        previous = (self.offset, self.head, self.head_length, self.last_time, list(self.line_offsets))
+        with open(self.path, "rb") as f:
+            data = _open_data(f)
+            try:
+                size = len(data)
+                stats.size = size
+                if size < self.offset or _head_hash(data, self.head_length) != self.head:
+                    self._reset()
+                # Only complete lines are parsed; a line still being written is picked up next time
+                end = data.rfind(b"\n") + 1
+                if not self.offset:
+                    stats.full = True
+                    stats.new_lines = self._scan_backward(data, end, is_cancelled)
+                    stats.parsed_bytes = end - (self.line_offsets[0] if self.line_offsets else 0)
+                elif end > self.offset:
+                    stats.new_lines = self._scan_forward(data, self.offset, end, is_cancelled)
+                    stats.parsed_bytes = end - self.offset
+                self.offset = max(self.offset, end)
+                self.head_length = min(HEAD_BYTES, size)
+                self.head = _head_hash(data, self.head_length)
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+        if is_cancelled():
+            self.offset, self.head, self.head_length, self.last_time, self.line_offsets = previous
+            stats.cancelled = True
+        else:
+            self.save()
+        stats.duration = time.perf_counter() - started
+        return stats
+
+    def _scan_backward(self, data, end, is_cancelled):
+        """Index the latest run by searching "[SR]" lines backward from ``end``"""
+        offsets = []
+        newest = oldest = None
+        position = end
+        while len(offsets) < INDEX_LIMIT and not is_cancelled():
+            hit = data.rfind(SR_TAG, 0, position)
+            if hit < 0:
+                break
+            start, stop = _line_at(data, hit, 0, end)
+            when = _timestamp(data[start:stop])
+            if when is not None:
+                if oldest is not None and (oldest - when).total_seconds() > RUN_GAP:
+                    break
+                oldest = when
+                newest = newest or when
+            offsets.append(start)
+            position = start
+        offsets.reverse()
+        self.line_offsets = offsets
+        self.last_time = newest.isoformat(" ") if newest is not None else None
+        return len(offsets)
+
+    def _scan_forward(self, data, begin, end, is_cancelled):
+        """Add the "[SR]" lines between ``begin`` and ``end``; a long pause starts a new run"""
+        last = datetime.fromisoformat(self.last_time) if self.last_time else None
+        added = 0
+        position = begin
+        while not is_cancelled():
+            hit = data.find(SR_TAG, position, end)
+            if hit < 0:
+                break
+            start, stop = _line_at(data, hit, position, end)
+            when = _timestamp(data[start:stop])
+            if when is not None:
+                if last is not None and (when - last).total_seconds() > RUN_GAP:
+                    self.line_offsets = []
+                last = when
+            self.line_offsets.append(start)
+            added += 1
+            position = stop + 1
+        del self.line_offsets[:-INDEX_LIMIT]
+        self.last_time = last.isoformat(" ") if last is not None else None
+        return added
+
+    def lines(self):
+        """The indexed "[SR]" lines of the latest run, oldest first"""
+        if not self.line_offsets:
+            return []
+        lines = []
+        with open(self.path, "rb") as f:
+            for offset in self.line_offsets:
+                f.seek(offset)
+                lines.append(f.readline().rstrip(b"\r\n").decode("utf-8", errors="replace"))
+        return lines
+
+    def findings(self):
+        """Findings of the latest run in log order"""
+        found = []
+        for line in self.lines():
+            result = classify(line)
+            if result is not None:
+                kind, path = result
+                match = _LINE_TIME.match(line)
+                found.append(Finding(kind, path, match.group(0) if match else None, line))
+        return found
+
+
+def file_status(findings):
+    """{path: kind} with the most severe finding of each file"""
+    status = {}
+    for finding in findings:
+        key = finding.path.lower()
+        if key not in status or _SEVERITY[finding.kind] > _SEVERITY[status[key][1]]:
+            status[key] = (finding.path, finding.kind)
+    return dict(status.values())
+
+
+def _head_hash(data, length):
+    if not length:
+        return ""
+    return hashlib.blake2b(data[:length], digest_size=16).hexdigest()
@@ -0,0 +1,249 @@
+"""
+Parallel cleanup of temporary, cache and prefetch folders
+
+Each root is walked with os.scandir (sizes come from the directory entries,
+not from a second stat pass) and its files are deleted in batches on a
+thread pool. A dry run only walks and reports what could be reclaimed.
+Files that are locked or denied are skipped and counted, and the freed
+byte totals only include files that were actually removed. Symlinks and
+junctions are removed without following them.
+
+Roots are plain paths, so the engine can be pointed at any directory tree:
+
+    engine = CleanupEngine([CleanupRoot("Scratch", "/tmp/scratch")], dry_run=True)
+    for result in engine.run():
+        print(result.name, result.found_bytes)
+"""
+
+import fnmatch
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 8
+
+# Files handed to a worker at a time
+DELETE_BATCH = 256
+
+_REPARSE_POINT = getattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT", 0x400)
+
+
+class CleanupRoot:
+    """
+    A folder whose contents are removed (the folder itself is kept).
+
+    With ``pattern`` only top-level entries matching it are removed, e.g.
+    ``thumbcache*``.
+    """
+
+    def __init__(self, name, path, pattern=None):
+        self.name = name
+        self.path = path
+        self.pattern = pattern
+
+
+def default_roots(environ=None):
+    """The folders clear_temp.bat empties, resolved from the environment"""
+    environ = os.environ if environ is None else environ
+    windows = environ.get("SystemRoot", r"C:\Windows")
+    profile = environ.get("USERPROFILE", "")
+    local = environ.get("LOCALAPPDATA") or os.path.join(profile, "AppData", "Local")
+    roots = [
+        CleanupRoot("User temp", environ.get("TEMP", "")),
+        CleanupRoot("System temp", os.path.join(windows, "Temp")),
+        CleanupRoot("Prefetch", os.path.join(windows, "Prefetch")),
+        CleanupRoot("Recent documents", os.path.join(profile, "Recent")),
+        CleanupRoot("Internet cache", os.path.join(local, "Microsoft", "Windows", "INetCache")),
+        CleanupRoot("Windows Update cache", os.path.join(windows, "SoftwareDistribution", "Download")),
+    ]
+    # An unset variable must never turn into a relative path
+    return [root for root in roots if os.path.isabs(root.path)]
+
+
+class RootResult:
+    """What a cleanup found and removed under one root"""
+
+    def __init__(self, root):
+        self.name = root.name
+        self.path = root.path
+        self.missing = False
+        self.error = None
+        # Found by the walk
+        self.files = 0
+        self.found_bytes = 0
+        self.directories = 0
+        # Removed
+        self.deleted_files = 0
+        self.freed_bytes = 0
+        self.deleted_directories = 0
+        # Locked, denied, or in folders that could not be listed
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.unreadable_directories = 0
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "path": self.path,
+            "missing": self.missing,
+            "error": self.error,
+            "files": self.files,
+            "found_bytes": self.found_bytes,
+            "directories": self.directories,
+            "deleted_files": self.deleted_files,
+            "freed_bytes": self.freed_bytes,
+            "deleted_directories": self.deleted_directories,
+            "skipped_files": self.skipped_files,
+            "skipped_bytes": self.skipped_bytes,
+            "unreadable_directories": self.unreadable_directories,
+        }
+
+
+def is_link(entry):
+    """Symlink or Windows junction; directory walkers must not follow either"""
+    if entry.is_symlink():
+        return True
+    if _REPARSE_POINT and os.name == "nt":
+        try:
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & _REPARSE_POINT)
+        except OSError:
+            return False
+    return False
+
+
+def scan_tree(root, result):
+    """
+    Walk a root and return (files, directories) to remove.
+
+    ``files`` are (path, size, link) tuples; ``directories`` are ordered
+    deepest first so they can be removed once emptied.
+    """
+    files = []
+    directories = []
+    pending = [(root.path, 0)]
+    while pending:
+        path, depth = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                entries = list(entries)
+        except FileNotFoundError:
+            if depth == 0:
+                result.missing = True
+            continue
+        except OSError as e:
+            if depth == 0:
+                result.error = str(e)
+            else:
+                result.unreadable_directories += 1
+            continue
+        for entry in entries:
+            if depth == 0 and root.pattern is not None and not fnmatch.fnmatch(entry.name.lower(),
+                                                                                 root.pattern.lower()):
+                continue
+            try:
+                if is_link(entry):
+                    files.append((entry.path, 0, True))
+                elif entry.is_dir(follow_symlinks=False):
+                    directories.append((depth, entry.path))
+                    pending.append((entry.path, depth + 1))
+                else:
+                    files.append((entry.path, entry.stat(follow_symlinks=False).st_size, False))
+            except OSError:
+                result.skipped_files += 1
+    directories.sort(key=lambda item: item[0], reverse=True)
+    result.files = len(files)
+    result.found_bytes = sum(size for _, size, _ in files)
+    result.directories = len(directories)
+    return files, [path for _, path in directories]
+
+
+def _remove(path, link):
+    try:
+        os.remove(path)
+    except PermissionError:
+        if link and os.path.isdir(path):
+            # Directory junctions are removed like empty folders
+            os.rmdir(path)
+            return
+        if link or os.name != "nt":
+            raise
+        # Read-only files need their attribute cleared first (del /f); the other mode bits are kept
+        os.chmod(path, os.lstat(path).st_mode | stat.S_IWRITE)
+        os.remove(path)
+
+
+def delete_batch(batch):
+    """Delete files; returns (deleted, freed bytes, skipped, skipped bytes)"""
+    deleted = freed = skipped = skipped_bytes = 0
+    for path, size, link in batch:
+        try:
+            _remove(path, link)
+        except FileNotFoundError:
+            # Already gone: nothing to free, nothing left behind
+            continue
+        except OSError:
+            skipped += 1
+            skipped_bytes += size
+            continue
+        deleted += 1
+        freed += size
+    return deleted, freed, skipped, skipped_bytes
+
+
+class CleanupEngine:
+    """
+    Empties a set of roots in parallel.
+
+    ``on_progress(percent)`` is called from the calling thread as batches
+    complete. cancel() stops the run after the batches in flight.
+    """
+
+    def __init__(self, roots, dry_run=False, workers=DEFAULT_WORKERS, on_progress=None):
+        self.roots = list(roots)
+        self.dry_run = dry_run
+        self.workers = max(1, int(workers))
+        self.on_progress = on_progress or (lambda percent: None)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        """Clean (or size, on a dry run) every root and return their RootResults in order"""
+        results = [RootResult(root) for root in self.roots]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            scans = list(executor.map(scan_tree, self.roots, results))
+            if self.dry_run:
+                self.on_progress(100)
+                return results
+
+            total = sum(result.files for result in results) or 1
+            done = 0
+            futures = []
+            for result, (files, _) in zip(results, scans):
+                for start in range(0, len(files), DELETE_BATCH):
+                    futures.append((result, executor.submit(delete_batch, files[start:start + DELETE_BATCH])))
+            for result, future in futures:
+                if self.cancelled:
+                    future.cancel()
+                    continue
+                deleted, freed, skipped, skipped_bytes = future.result()
+                result.deleted_files += deleted
+                result.freed_bytes += freed
+                result.skipped_files += skipped
+                result.skipped_bytes += skipped_bytes
+                done += deleted + skipped
+                self.on_progress(min(99, done * 100 // total))
+
+        for result, (_, directories) in zip(results, scans):
+            if self.cancelled:
+                break
+            for path in directories:
+                try:
+                    os.rmdir(path)
+                    result.deleted_directories += 1
+                except OSError:
+                    # Still holds skipped files
+                    pass
+        self.on_progress(100)
+        return results
@@ -0,0 +1,238 @@
+"""
+Headless command-line runner
+
+    python main.py run --tools disk_space,memory_check --jobs 4 --json
+    python main.py cleanup --dry-run
+
+Runs tools through the same execution core as the GUI without importing
+PyQt. With --json every event is written to stdout as one JSON object per
+line (start, output, result, summary). The exit status is 0 when every
+tool succeeded, 1 when any failed and 2 for usage errors.
+
+``cleanup`` runs the temp-file cleanup engine directly, on the default
+folders or on ``--root`` paths; ``--dry-run`` only reports what could be
+reclaimed.
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from core import config
+from core.catalog import ManifestError, get_catalog
+from core.cleanup import DEFAULT_WORKERS, CleanupRoot
+from core.collectors import CollectorUnavailable, collect_temp_cleanup, get_collector
+from core.durations import DurationModel, default_stats_path
+from core.execution import ScriptExecution
+from core.scheduler import ScheduledTask, SuiteScheduler
+from core.shell_pool import ShellHostPool, default_dialect
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+def available_tools(catalog=None):
+    """Return the catalog's tools whose scripts exist"""
+    catalog = catalog or get_catalog()
+    return [spec for spec in catalog.tools() if spec.available]
+
+
+def resolve_tool(name, catalog=None):
+    """Map a tool id or script file name to its ToolSpec, or None"""
+    catalog = catalog or get_catalog()
+    spec = catalog.resolve(name)
+    return spec if spec is not None and spec.available else None
+
+
+class EventWriter:
+    """Serializes output from worker threads, as NDJSON or as plain text"""
+
+    def __init__(self, stream, as_json, show_output):
+        self.stream = stream
+        self.as_json = as_json
+        self.show_output = show_output
+        self._lock = threading.Lock()
+
+    def write(self, event, **fields):
+        with self._lock:
+            if self.as_json:
+                record = {"event": event, "time": round(time.time(), 3)}
+                record.update(fields)
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                self.stream.write(self._format(event, fields))
+            self.stream.flush()
+
+    def _format(self, event, fields):
+        if event == "start":
+            return f"[{fields['tool']}] started\n"
+        if event == "phase":
+            return f"[{fields['tool']}] ▶ {fields['phase']}\n"
+        if event == "output":
+            return "".join(f"[{fields['tool']}] {line}\n" for line in fields["lines"])
+        if event == "result":
+            return f"{fields['message']} ({fields['duration']:.2f} s)\n"
+        if event == "summary":
+            return f"{fields['succeeded']}/{fields['total']} tool(s) succeeded in {fields['duration']:.2f} s\n"
+        return f"{event}: {fields}\n"
+
+
+def run_tools(tools, jobs=1, writer=None, native=True, shell_pool=None, catalog=None, durations=None,
+              timeout=None):
+    """
+    Run tools in parallel and return their ExecutionResults in input order.
+
+    Like the GUI's suites, tools that share a resource from the manifest
+    never run at the same time; they start in the order given.
+
+    ``timeout`` overrides every tool's own time limit (0 for none). On
+    Ctrl+C the running tools' process trees are stopped before returning.
+    """
+    writer = writer or EventWriter(sys.stdout, True, False)
+    running = []
+
+    def run_one(name):
+        spec = resolve_tool(name, catalog)
+        path = spec.path
+        writer.write("start", tool=name)
+        on_output = None
+        if writer.show_output:
+            on_output = lambda lines: writer.write("output", tool=name, lines=lines)
+        collector = get_collector(path) if native else None
+        deadline = spec.deadline if timeout is None else (timeout or None)
+        execution = ScriptExecution(path, name, collector, shell_pool, on_output=on_output, durations=durations,
+                                    timeout=deadline,
+                                    on_phase=lambda phase: writer.write("phase", tool=name, phase=phase))
+        running.append(execution)
+        result = execution.run()
+        writer.write("result", **result.to_dict())
+        return result
+
+    # Tasks are keyed by position, so a tool listed twice runs twice
+    scheduler = SuiteScheduler([ScheduledTask(index, resolve_tool(name, catalog).resources, payload=name)
+                                for index, name in enumerate(tools)])
+    results = [None] * len(tools)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        try:
+            pending = {}
+            while not scheduler.is_done():
+                for task in scheduler.next_ready():
+                    pending[executor.submit(run_one, task.payload)] = task
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    results[task.name] = future.result()
+                    scheduler.mark_finished(task.name, results[task.name].success)
+            return results
+        except KeyboardInterrupt:
+            for execution in running:
+                execution.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="PC Troubleshooter headless runner")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run one or more tools without the GUI")
+    run.add_argument("--tools", help="Comma-separated tool names, e.g. disk_space,memory_check")
+    run.add_argument("--jobs", type=int, default=config.get_int("max_concurrent_jobs", 3),
+                     help="Number of tools to run at the same time")
+    run.add_argument("--json", action="store_true", help="Write newline-delimited JSON events")
+    run.add_argument("--output", action="store_true", help="Include tool output (always on without --json)")
+    run.add_argument("--timeout", type=float,
+                     help="Seconds each tool may run before it is stopped (0 for no limit; "
+                          "default: the tool's own limit)")
+    run.add_argument("--no-native", action="store_true", help="Always run the .bat scripts")
+    run.add_argument("--list", action="store_true", help="List the available tools and exit")
+
+    cleanup = subparsers.add_parser("cleanup", help="Delete temporary files, or size them with --dry-run")
+    cleanup.add_argument("--dry-run", action="store_true", help="Only report the reclaimable space")
+    cleanup.add_argument("--root", action="append", metavar="PATH",
+                         help="Folder to empty instead of the default temp folders (repeatable)")
+    cleanup.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Threads deleting files")
+    cleanup.add_argument("--json", action="store_true", help="Write the report as JSON")
+    return parser
+
+
+def run_cleanup(args, stdout):
+    """The ``cleanup`` command"""
+    roots = None
+    if args.root:
+        roots = [CleanupRoot(os.path.basename(os.path.normpath(path)) or path, os.path.abspath(path))
+                 for path in args.root]
+    try:
+        report = collect_temp_cleanup(args.dry_run, roots, args.workers)
+    except CollectorUnavailable as e:
+        sys.stderr.write(f"main.py cleanup: error: {e}\n")
+        return EXIT_USAGE
+    if args.json:
+        stdout.write(json.dumps(report.to_dict(), ensure_ascii=False) + "\n")
+    else:
+        stdout.write("".join(line + "\n" for line in report.to_lines()))
+    return EXIT_OK
+
+
+def main(argv=None, stdout=None):
+    stdout = stdout or sys.stdout
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+
+    if args.command == "cleanup":
+        return run_cleanup(args, stdout)
+
+    try:
+        catalog = get_catalog()
+    except ManifestError as e:
+        sys.stderr.write(f"main.py run: error: {e}\n")
+        return EXIT_USAGE
+
+    if args.list:
+        for spec in available_tools(catalog):
+            flags = "read-only" if spec.read_only else "changes system"
+            if spec.admin:
+                flags += ", admin"
+            stdout.write(f"{spec.id:<22} {spec.category:<12} {spec.name} ({flags})\n")
+        return EXIT_OK
+
+    tools = [name.strip() for name in (args.tools or "").split(",") if name.strip()]
+    if not tools:
+        sys.stderr.write("main.py run: error: --tools is required\n")
+        return EXIT_USAGE
+    unknown = [name for name in tools if resolve_tool(name, catalog) is None]
+    if unknown:
+        sys.stderr.write(f"main.py run: error: unknown tool(s): {', '.join(unknown)}\n")
+        return EXIT_USAGE
+
+    writer = EventWriter(stdout, args.json, args.output or not args.json)
+
+    shell_pool = None
+    dialect = default_dialect()
+    if dialect is not None and config.get_int("shell_hosts", 2) > 0:
+        shell_pool = ShellHostPool(dialect, min(max(1, args.jobs), len(tools)))
+
+    started = time.monotonic()
+    try:
+        # Share run history with the GUI so its estimates include headless runs
+        durations = DurationModel(default_stats_path(), catalog=catalog)
+        results = run_tools(tools, args.jobs, writer, not args.no_native, shell_pool, catalog, durations,
+                            args.timeout)
+    finally:
+        if shell_pool is not None:
+            shell_pool.close()
+
+    succeeded = sum(1 for result in results if result.success)
+    writer.write("summary", total=len(results), succeeded=succeeded,
+                 failed=len(results) - succeeded, duration=round(time.monotonic() - started, 3))
+    return EXIT_OK if succeeded == len(results) else EXIT_FAILED
@@ -0,0 +1,681 @@
+"""
+In-process Python collectors that replace the troubleshooting scripts
+
+Each collector builds a Report with the same sections its .bat script
+prints (see COLLECTORS):
+
+- performance_monitor, memory_check and disk_space read psutil, the
+  last through an incremental DiskIndex of the system drive
+- clear_temp empties the temp folders through a CleanupEngine and
+  reports the exact space freed
+- find_duplicates searches the user's folders with a DuplicateFinder
+- sfc_log reads SFC's findings from CBS.log through a CbsLogIndex
+- network_diagnostics probes every target concurrently
+
+A collector raises CollectorUnavailable when it cannot run here, and the
+.bat script runs instead.
+"""
+
+import os
+import sys
+import socket
+import time
+import glob
+import subprocess
+import xml.etree.ElementTree as ElementTree
+
+from core import config
+from core.cbs_log import (CORRUPT, REPAIRED, UNREPAIRABLE, CbsLogIndex, default_log_path, default_state_path,
+                           file_status)
+from core.cleanup import CleanupEngine, default_roots
+from core.disk_index import DiskIndex, default_index_path
+from core.duplicates import DEFAULT_MIN_SIZE, DuplicateFinder
+from core.net_probe import (DEFAULT_COUNT, DEFAULT_TIMEOUT, KIND_DNS, KIND_GATEWAY, KIND_PING, KIND_TCP, Probe,
+                            ProbeEngine, default_gateways, parse_target)
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+WINSAT_DATASTORE = r"C:\Windows\Performance\WinSAT\DataStore"
+
+
+class CollectorUnavailable(RuntimeError):
+    """Raised when a collector cannot run here (e.g. psutil is missing)"""
+
+
+class Section:
+    """A titled block of a report: an optional table plus leveled messages"""
+
+    def __init__(self, title, columns=None, rows=None):
+        self.title = title
+        self.columns = list(columns or [])
+        self.rows = [list(row) for row in (rows or [])]
+        self.messages = []
+
+    def add_message(self, level, text):
+        """Add a message; level is INFO, WARNING or ERROR like the scripts print"""
+        self.messages.append((level, text))
+
+    def to_lines(self):
+        """Render the section the way the .bat scripts print it"""
+        lines = [f"[{self.title}]"]
+        if self.columns:
+            lines.extend(format_table(self.columns, self.rows))
+        for level, text in self.messages:
+            lines.append(f"[{level}] {text}")
+        lines.append("")
+        return lines
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "columns": self.columns,
+            "rows": self.rows,
+            "messages": [{"level": level, "text": text} for level, text in self.messages],
+        }
+
+
+class Report:
+    """Structured result of a collector"""
+
+    def __init__(self, tool, title):
+        self.tool = tool
+        self.title = title
+        self.sections = []
+        self.duration = 0.0
+
+    def add_section(self, section):
+        self.sections.append(section)
+        return section
+
+    def to_dict(self):
+        return {
+            "tool": self.tool,
+            "title": self.title,
+            "duration": round(self.duration, 4),
+            "sections": [section.to_dict() for section in self.sections],
+        }
+
+    def to_lines(self):
+        """Render the report in the same layout the .bat scripts print"""
+        lines = ["=" * 40, f"   {self.title}", "=" * 40, ""]
+        for section in self.sections:
+            lines.extend(section.to_lines())
+        lines.extend(["=" * 40, f"{self.title} completed!", "=" * 40])
+        return lines
+
+
+def format_table(columns, rows):
+    """Format rows as a left-aligned text table (like Format-Table -AutoSize)"""
+    cells = [[str(value) for value in row] for row in rows]
+    widths = [len(column) for column in columns]
+    for row in cells:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(value))
+    lines = [
+        " ".join(column.ljust(widths[i]) for i, column in enumerate(columns)).rstrip(),
+        " ".join("-" * width for width in widths),
+    ]
+    for row in cells:
+        lines.append(" ".join(value.ljust(widths[i]) for i, value in enumerate(row)).rstrip())
+    return lines
+
+
+def _require_psutil():
+    try:
+        import psutil
+    except ImportError:
+        raise CollectorUnavailable("psutil is not installed")
+    return psutil
+
+
+def _processes(psutil, attrs):
+    """Snapshot process info, skipping processes that vanish or deny access"""
+    result = []
+    for process in psutil.process_iter(attrs):
+        info = process.info
+        if info.get("name"):
+            result.append(info)
+    return result
+
+
+def _format_duration(seconds):
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{days}.{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _winsat_score(datastore=WINSAT_DATASTORE):
+    """Return the newest WinSAT system score, or None"""
+    files = glob.glob(os.path.join(datastore, "*Formal*"))
+    if not files:
+        return None
+    newest = max(files, key=os.path.getmtime)
+    try:
+        node = ElementTree.parse(newest).getroot().find("WinSPR/SystemScore")
+    except (ElementTree.ParseError, OSError):
+        return None
+    return node.text if node is not None else None
+
+
+def collect_performance(snapshot=None, psutil=None, is_cancelled=None):
+    """
+    Build the performance_monitor report.
+
+    ``snapshot`` is an optional MetricsSnapshot from the background sampler;
+    with it the CPU, disk and network rates come for free, without it CPU is
+    measured over a short 100 ms window and rates are omitted. The report
+    takes well under a second, so ``is_cancelled`` is not polled.
+    """
+    psutil = psutil or _require_psutil()
+    started = time.perf_counter()
+    report = Report("performance_monitor", "Performance Monitor Tool")
+
+    cpu_percent = snapshot.cpu_percent if snapshot is not None else psutil.cpu_percent(interval=0.1)
+    report.add_section(Section("CPU USAGE", ["CPU Usage %"], [[round(cpu_percent, 2)]]))
+
+    memory = psutil.virtual_memory()
+    report.add_section(Section("MEMORY USAGE", ["Available Memory (MB)", "Memory Usage %"],
+                               [[round(memory.available / MB), round(memory.percent, 2)]]))
+
+    disk = report.add_section(Section("DISK USAGE", ["Mount", "Total (GB)", "Free (GB)", "Usage %"]))
+    for partition in psutil.disk_partitions(all=False):
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except (OSError, PermissionError):
+            continue
+        disk.rows.append([partition.mountpoint, round(usage.total / GB, 2),
+                          round(usage.free / GB, 2), round(usage.percent, 2)])
+    if snapshot is not None:
+        disk.add_message("INFO", f"Read {snapshot.disk_read_rate / MB:.2f} MB/s, "
+                                 f"write {snapshot.disk_write_rate / MB:.2f} MB/s")
+
+    network = report.add_section(Section("NETWORK USAGE", ["Interface", "Sent (MB)", "Received (MB)"]))
+    for name, counters in sorted(psutil.net_io_counters(pernic=True).items()):
+        if "loopback" in name.lower() or "isatap" in name.lower():
+            continue
+        network.rows.append([name, round(counters.bytes_sent / MB, 2), round(counters.bytes_recv / MB, 2)])
+    if snapshot is not None:
+        network.add_message("INFO", f"Total {snapshot.net_sent_rate + snapshot.net_recv_rate:.2f} bytes/sec")
+
+    processes = _processes(psutil, ["name", "cpu_times", "memory_info"])
+    top = sorted(processes, key=lambda p: sum(p["cpu_times"][:2]) if p.get("cpu_times") else 0, reverse=True)[:5]
+    report.add_section(Section("TOP CPU PROCESSES", ["ProcessName", "CPU Time", "Memory(MB)"], [
+        [p["name"],
+         round(sum(p["cpu_times"][:2]), 2) if p.get("cpu_times") else "",
+         round(p["memory_info"].rss / MB, 2) if p.get("memory_info") else ""]
+        for p in top
+    ]))
+
+    report.add_section(Section("SYSTEM UPTIME", ["System Uptime"],
+                               [[_format_duration(time.time() - psutil.boot_time())]]))
+
+    alerts = report.add_section(Section("PERFORMANCE ALERTS"))
+    if cpu_percent > 80:
+        alerts.add_message("WARNING", f"HIGH CPU USAGE: {cpu_percent:.1f}%")
+    if memory.percent > 85:
+        alerts.add_message("WARNING", f"HIGH MEMORY USAGE: {memory.percent:.1f}%")
+    if cpu_percent <= 80 and memory.percent <= 85:
+        alerts.add_message("INFO", "System performance is normal")
+
+    if sys.platform == "win32":
+        score = _winsat_score()
+        if score is not None:
+            report.add_section(Section("WINDOWS EXPERIENCE INDEX", ["WEI Score"], [[score]]))
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def collect_memory(psutil=None, is_cancelled=None):
+    """Build the memory_check report (too short to poll ``is_cancelled``)"""
+    psutil = psutil or _require_psutil()
+    started = time.perf_counter()
+    report = Report("memory_check", "Memory Usage Check Tool")
+
+    memory = psutil.virtual_memory()
+    used = memory.total - memory.available
+    report.add_section(Section("MEMORY OVERVIEW",
+                               ["Total RAM (GB)", "Available RAM (GB)", "Used RAM (GB)", "Memory Usage %"],
+                               [[round(memory.total / GB, 2), round(memory.available / GB, 2),
+                                 round(used / GB, 2), round(memory.percent, 2)]]))
+
+    attrs = ["pid", "name", "memory_info", "cpu_times", "num_threads"]
+    if sys.platform == "win32":
+        attrs.append("num_handles")
+    processes = _processes(psutil, attrs)
+
+    top = sorted(processes, key=lambda p: p["memory_info"].rss if p.get("memory_info") else 0, reverse=True)[:10]
+    report.add_section(Section("TOP MEMORY PROCESSES", ["ProcessName", "Memory(MB)", "Id", "CPU"], [
+        [p["name"],
+         round(p["memory_info"].rss / MB, 2) if p.get("memory_info") else "",
+         p["pid"],
+         round(sum(p["cpu_times"][:2]), 2) if p.get("cpu_times") else ""]
+        for p in top
+    ]))
+
+    swap = psutil.swap_memory()
+    report.add_section(Section("VIRTUAL MEMORY (PAGEFILE)", ["Size(MB)", "Used(MB)", "Usage %"],
+                               [[round(swap.total / MB), round(swap.used / MB), round(swap.percent, 2)]]))
+
+    # Handles only exist on Windows; threads work everywhere
+    suspects = [p for p in processes
+                if (p.get("num_handles") or 0) > 1000 or (p.get("num_threads") or 0) > 50]
+    suspects.sort(key=lambda p: (p.get("num_handles") or 0, p.get("num_threads") or 0), reverse=True)
+    leaks = report.add_section(Section("HIGH HANDLE/THREAD COUNT", ["ProcessName", "Handles", "Threads", "Memory(MB)"], [
+        [p["name"], p.get("num_handles", ""), p.get("num_threads") or "",
+         round(p["memory_info"].rss / MB, 2) if p.get("memory_info") else ""]
+        for p in suspects
+    ]))
+    if not suspects:
+        leaks.columns = []
+        leaks.add_message("INFO", "No processes with unusually high handle or thread counts")
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def _system_root():
+    return os.environ.get("SystemDrive", "C:") + "\\"
+
+
+def collect_disk_space(psutil=None, index=None, on_output=None, on_progress=None, is_cancelled=None):
+    """
+    Build the disk_space report.
+
+    Folder sizes and recent large files come from a DiskIndex of the system
+    drive that is updated incrementally, so only the first run walks the
+    whole drive. Each section is written to ``on_output`` as it is done;
+    ``is_cancelled`` stops the index scan.
+    """
+    if index is None and sys.platform != "win32":
+        raise CollectorUnavailable("the disk index only covers the Windows system drive")
+    psutil = psutil or _require_psutil()
+    started = time.perf_counter()
+    on_output = on_output or (lambda lines: None)
+    report = Report("disk_space", "Disk Space Check Tool")
+    on_output(["=" * 40, f"   {report.title}", "=" * 40, ""])
+
+    drives = report.add_section(Section("DISK SPACE", ["Drive", "Size(GB)", "Used(GB)", "Free(GB)", "%Free"]))
+    low = []
+    for partition in psutil.disk_partitions(all=False):
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except (OSError, PermissionError):
+            continue
+        if not usage.total:
+            continue
+        free_percent = usage.free / usage.total * 100
+        drives.rows.append([partition.mountpoint, round(usage.total / GB, 2), round(usage.used / GB, 2),
+                            round(usage.free / GB, 2), round(free_percent, 2)])
+        if free_percent < 15:
+            low.append((partition.mountpoint, free_percent))
+    for mountpoint, free_percent in low:
+        drives.add_message("WARNING", f"Drive {mountpoint} is running low on space ({free_percent:.2f}% free)")
+    on_output(drives.to_lines())
+
+    if index is None:
+        index = DiskIndex(_system_root(), default_index_path())
+    on_output([f"[INFO] Updating the folder index of {index.root}..."])
+    stats = index.scan(on_progress=on_progress, is_cancelled=is_cancelled)
+    folders = report.add_section(Section(f"LARGEST FOLDERS ON {index.root}", ["Folder", "Size(MB)"], [
+        [os.path.basename(path) or path, round(size / MB, 2)] for path, size in index.largest_folders(count=10)
+    ]))
+    if stats.cancelled:
+        folders.add_message("WARNING", "Scan cancelled; the sizes are from the previous scan, if any")
+    else:
+        how = "full scan" if stats.full else f"{stats.reused} of {stats.directories} unchanged"
+        folders.add_message("INFO", f"Index of {stats.directories} folders updated in {stats.duration:.1f} s ({how})")
+    if stats.unreadable:
+        folders.add_message("INFO", f"{len(stats.unreadable)} folder(s) could not be read and are not counted")
+    on_output(folders.to_lines())
+
+    profile = os.environ.get("USERPROFILE") or os.path.expanduser("~")
+    files = report.add_section(Section("RECENT LARGE FILES (LAST 7 DAYS)", ["Name", "Size(MB)", "LastWriteTime"], [
+        [os.path.basename(path), round(size / MB, 2), time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))]
+        for path, size, mtime in index.recent_large_files(profile, days=7, count=5)
+    ]))
+    if not files.rows:
+        files.columns = []
+        files.add_message("INFO", "No files over 100 MB changed in the last 7 days")
+    on_output(files.to_lines() + ["=" * 40, f"{report.title} completed!", "=" * 40])
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def default_duplicate_roots():
+    """The user's document and media folders that exist"""
+    profile = os.environ.get("USERPROFILE") or os.path.expanduser("~")
+    folders = ["Desktop", "Documents", "Downloads", "Pictures", "Music", "Videos"]
+    return [path for path in (os.path.join(profile, name) for name in folders) if os.path.isdir(path)]
+
+
+def collect_duplicates(roots=None, min_size=DEFAULT_MIN_SIZE, on_output=None, on_progress=None, is_cancelled=None):
+    """
+    Build the find_duplicates report.
+
+    Each confirmed group is written to ``on_output`` as soon as it is
+    found, before the report is complete; ``is_cancelled`` is polled
+    between size groups.
+    """
+    started = time.perf_counter()
+    on_output = on_output or (lambda lines: None)
+    is_cancelled = is_cancelled or (lambda: False)
+    roots = default_duplicate_roots() if roots is None else roots
+    report = Report("find_duplicates", "Duplicate File Finder")
+    groups_section = report.add_section(Section("DUPLICATE FILES", ["Group", "Size(MB)", "Copies", "Wasted(MB)", "Path"]))
+    on_output(["=" * 40, f"   {report.title}", "=" * 40, "",
+               f"[INFO] Searching {len(roots)} folder(s) for duplicate files of {min_size / MB:g} MB or more..."])
+
+    def group_found(group):
+        number = len(groups_section.rows) + 1
+        groups_section.rows.append([number, round(group.size / MB, 2), len(group.paths),
+                                    round(group.wasted / MB, 2), group.paths[0]])
+        on_output([f"[DUPLICATES] #{number}: {len(group.paths)} copies of {group.size / MB:.2f} MB "
+                   f"({group.wasted / MB:.2f} MB reclaimable)"] + [f"    {path}" for path in group.paths])
+
+    def progress(percent):
+        if is_cancelled():
+            finder.cancel()
+        if on_progress is not None:
+            on_progress(percent)
+
+    finder = DuplicateFinder(roots, min_size, on_group=group_found, on_progress=progress)
+    finder.run()
+    summary = finder.summary
+
+    totals = report.add_section(Section("SUMMARY"))
+    totals.add_message("INFO", f"Scanned {summary.files} file(s); {summary.candidates} shared a size, "
+                               f"{summary.fully_hashed} needed a full hash")
+    if summary.unreadable:
+        totals.add_message("WARNING", f"{summary.unreadable} file(s) could not be read")
+    if finder.cancelled:
+        totals.add_message("WARNING", "Search cancelled; the results are incomplete")
+    if summary.groups:
+        totals.add_message("INFO", f"{summary.groups} duplicate group(s); {summary.wasted / MB:.2f} MB can be "
+                                   f"reclaimed by keeping one copy of each")
+    else:
+        totals.add_message("INFO", "No duplicate files found")
+    on_output([""] + [f"[{level}] {text}" for level, text in totals.messages]
+              + ["", "=" * 40, f"{report.title} completed!", "=" * 40])
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def collect_sfc_log(path=None, index=None, is_cancelled=None):
+    """
+    Build the sfc_log report from the latest System File Checker run in
+    CBS.log. A CbsLogIndex remembers how far the log was read, so repeat
+    runs only parse what was appended since; ``is_cancelled`` stops the read.
+    """
+    if path is None and index is None:
+        if sys.platform != "win32":
+            raise CollectorUnavailable("CBS.log only exists on Windows")
+        path = default_log_path()
+    started = time.perf_counter()
+    report = Report("sfc_log", "SFC Log Analyzer")
+    results = report.add_section(Section("SFC RESULTS", ["Status", "File"]))
+
+    index = index or CbsLogIndex(path, default_state_path())
+    try:
+        stats = index.update(is_cancelled)
+    except FileNotFoundError:
+        results.columns = []
+        results.add_message("INFO", "CBS.log was not found; run System File Check first")
+        report.duration = time.perf_counter() - started
+        return report
+    except PermissionError:
+        results.columns = []
+        results.add_message("ERROR", "CBS.log could not be read; run the tool as administrator")
+        report.duration = time.perf_counter() - started
+        return report
+    if stats.cancelled:
+        results.columns = []
+        results.add_message("WARNING", "Cancelled before CBS.log was read")
+        report.duration = time.perf_counter() - started
+        return report
+
+    lines = index.lines()
+    if not lines:
+        results.columns = []
+        results.add_message("INFO", "No System File Checker run was found in CBS.log")
+    else:
+        status = file_status(index.findings())
+        order = {UNREPAIRABLE: 0, CORRUPT: 1, REPAIRED: 2}
+        results.rows = [[kind.upper(), path] for path, kind in sorted(status.items(), key=lambda item: order[item[1]])]
+        counts = {kind: sum(1 for value in status.values() if value == kind) for kind in order}
+        if counts[UNREPAIRABLE]:
+            results.add_message("ERROR", f"{counts[UNREPAIRABLE]} file(s) could not be repaired - run "
+                                         f"'dism /online /cleanup-image /restorehealth', then System File Check again")
+        if counts[CORRUPT]:
+            results.add_message("WARNING", f"{counts[CORRUPT]} corrupt file(s) were found")
+        if counts[REPAIRED]:
+            results.add_message("INFO", f"{counts[REPAIRED]} file(s) were repaired")
+        if not status:
+            results.columns = []
+            results.add_message("INFO", "No corruption detected")
+
+        recent = report.add_section(Section("RECENT SFC LOG ENTRIES", ["Time", "Entry"]))
+        for line in lines[-10:]:
+            recent.rows.append([line[:19], line[line.find("[SR]") + 5:]])
+
+    how = "full scan" if stats.full else "new entries only"
+    results.add_message("INFO", f"Read {stats.parsed_bytes / MB:.2f} MB of {stats.size / MB:.2f} MB "
+                                f"in {stats.duration * 1000:.0f} ms ({how})")
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def default_probes(gateways=None):
+    """Probes of the targets in config.ini plus the default gateways"""
+    probes = [Probe(KIND_GATEWAY, gateway) for gateway in (default_gateways() if gateways is None else gateways)]
+    for target in config.get_list("probe_dns", "google.com, microsoft.com"):
+        probes.append(Probe(KIND_DNS, parse_target(target)[0]))
+    for target in config.get_list("probe_tcp", "google.com:443, 1.1.1.1:53"):
+        probes.append(Probe(KIND_TCP, *parse_target(target, 443)))
+    for target in config.get_list("probe_ping", "8.8.8.8, 1.1.1.1"):
+        probes.append(Probe(KIND_PING, *parse_target(target)))
+    return probes
+
+
+def _milliseconds(seconds):
+    return "-" if seconds is None else round(seconds * 1000, 1)
+
+
+def collect_network(probes=None, count=None, timeout=None, method=None, psutil=None, is_cancelled=None):
+    """
+    Build the network_diagnostics report.
+
+    DNS, TCP, reachability and gateway probes run concurrently through a
+    ProbeEngine, each attempt with its own deadline, and are reported as
+    loss and latency distributions. ``probes`` replaces the configured
+    targets; ``is_cancelled`` stops the probes before their next attempt.
+    """
+    started = time.perf_counter()
+    report = Report("network_diagnostics", "Network Diagnostics Tool")
+    if psutil is None:
+        try:
+            psutil = _require_psutil()
+        except CollectorUnavailable:
+            psutil = None
+
+    if psutil is not None:
+        interfaces = report.add_section(Section("NETWORK ADAPTERS", ["Adapter", "Status", "IPv4", "Speed(Mb/s)"]))
+        addresses = psutil.net_if_addrs()
+        for name, stats in sorted(psutil.net_if_stats().items()):
+            ipv4 = [address.address for address in addresses.get(name, []) if address.family == socket.AF_INET]
+            interfaces.rows.append([name, "Up" if stats.isup else "Down", ", ".join(ipv4) or "-", stats.speed or "-"])
+
+    gateways = None if probes is None else [probe.host for probe in probes if probe.kind == KIND_GATEWAY]
+    probes = default_probes() if probes is None else probes
+    engine = ProbeEngine(probes,
+                         count=count or config.get_int("probe_count", DEFAULT_COUNT),
+                         timeout=timeout or config.get_float("probe_timeout", DEFAULT_TIMEOUT),
+                         method=method, is_cancelled=is_cancelled)
+    results = engine.run()
+    cancelled = is_cancelled is not None and is_cancelled()
+
+    checks = report.add_section(Section("CONNECTIVITY CHECKS", ["Check", "Target", "Method", "Sent", "Recv", "Loss%",
+                                                               "Min(ms)", "Median(ms)", "P90(ms)", "Max(ms)"]))
+    names = {KIND_GATEWAY: "Gateway", KIND_DNS: "DNS", KIND_TCP: "TCP connect", KIND_PING: "Ping"}
+    for result in results:
+        checks.rows.append([names.get(result.probe.kind, result.probe.kind), result.label, result.method or "-",
+                            result.sent, result.received, round(result.loss_percent),
+                            _milliseconds(result.minimum()), _milliseconds(result.median()),
+                            _milliseconds(result.p90()), _milliseconds(result.maximum())])
+    for result in results:
+        if not result.sent:
+            continue
+        if not result.received:
+            checks.add_message("WARNING", f"{names.get(result.probe.kind, result.probe.kind)} {result.label} "
+                                          f"failed: {result.error}")
+        elif result.received < result.sent:
+            checks.add_message("WARNING", f"{result.label} lost {result.sent - result.received} of "
+                                          f"{result.sent} attempts")
+
+    def answered(kind):
+        matching = [result for result in results if result.probe.kind == kind]
+        return matching, [result for result in matching if result.received]
+
+    gateway_results, gateway_ok = answered(KIND_GATEWAY)
+    dns_results, dns_ok = answered(KIND_DNS)
+    internet = [result for result in results if result.probe.kind in (KIND_TCP, KIND_PING)]
+    internet_ok = [result for result in internet if result.received]
+    summary = report.add_section(Section("SUMMARY"))
+    if cancelled:
+        summary.add_message("WARNING", "Checks cancelled; the results are incomplete")
+    elif gateways is None and not gateway_results:
+        summary.add_message("WARNING", "No default gateway found - the PC does not appear to be connected to a network")
+    elif gateway_results and not gateway_ok:
+        summary.add_message("ERROR", "The default gateway did not answer - check the cable or Wi-Fi connection "
+                                     "and restart the router")
+    if dns_results and not dns_ok and not cancelled:
+        if internet_ok:
+            summary.add_message("ERROR", "DNS resolution failed while the internet is reachable - "
+                                         "flush the DNS cache or check the DNS server settings")
+        else:
+            summary.add_message("ERROR", "DNS resolution failed")
+    if internet and not internet_ok and not cancelled:
+        summary.add_message("ERROR", "No internet connectivity")
+    if not summary.messages and len(gateway_ok) + len(dns_ok) + len(internet_ok) == len(results):
+        summary.add_message("INFO", "Network connectivity OK")
+    summary.add_message("INFO", f"{len(results)} checks ran concurrently in {engine.duration:.1f} s")
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+def _run_quiet(command):
+    """Run a system command without a console window, ignoring its output"""
+    try:
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except OSError:
+        pass
+
+
+def collect_temp_cleanup(dry_run=False, roots=None, workers=None, on_progress=None, is_cancelled=None):
+    """
+    Build the clear_temp report, deleting the temp, cache and prefetch
+    folders' contents through a CleanupEngine (only sizing them on a dry
+    run). Without ``roots`` the folders clear_temp.bat empties are used,
+    which only exist on Windows, and like the script a real run also
+    restarts Windows Update, flushes DNS and empties the Recycle Bin.
+    ``is_cancelled`` is polled as delete batches complete.
+    """
+    system_cleanup = roots is None and not dry_run
+    if roots is None:
+        if sys.platform != "win32":
+            raise CollectorUnavailable("the default cleanup folders only exist on Windows")
+        roots = default_roots()
+    started = time.perf_counter()
+    title = "Temporary Files Cleanup Preview" if dry_run else "Temporary Files Cleanup Tool"
+    report = Report("clear_temp", title)
+
+    def progress(percent):
+        if is_cancelled is not None and is_cancelled():
+            engine.cancel()
+        if on_progress is not None:
+            on_progress(percent)
+
+    engine = CleanupEngine(roots, dry_run=dry_run, on_progress=progress,
+                           **({"workers": workers} if workers else {}))
+    windows_update = system_cleanup and sys.platform == "win32"
+    if windows_update:
+        # The update service holds its download cache open
+        _run_quiet(["net", "stop", "wuauserv"])
+    try:
+        results = engine.run()
+    finally:
+        if windows_update:
+            _run_quiet(["net", "start", "wuauserv"])
+
+    if dry_run:
+        summary = report.add_section(Section("RECLAIMABLE SPACE", ["Location", "Files", "Folders", "Size (MB)"]))
+        for result in results:
+            summary.rows.append([result.name, result.files, result.directories, round(result.found_bytes / MB, 2)])
+    else:
+        summary = report.add_section(Section("CLEANUP SUMMARY", ["Location", "Deleted", "Skipped", "Freed (MB)"]))
+        for result in results:
+            summary.rows.append([result.name, result.deleted_files, result.skipped_files,
+                                 round(result.freed_bytes / MB, 2)])
+
+    for result in results:
+        if result.error:
+            summary.add_message("WARNING", f"{result.name}: {result.error}")
+    skipped = sum(result.skipped_files for result in results)
+    if skipped:
+        skipped_bytes = sum(result.skipped_bytes for result in results)
+        summary.add_message("WARNING", f"{skipped} file(s) ({skipped_bytes / MB:.2f} MB) were locked or denied "
+                                       f"and left in place")
+    if dry_run:
+        found = sum(result.found_bytes for result in results)
+        summary.add_message("INFO", f"{found / MB:.2f} MB can be reclaimed (nothing was deleted)")
+    else:
+        freed = sum(result.freed_bytes for result in results)
+        summary.add_message("INFO", f"Freed {freed / MB:.2f} MB")
+        if engine.cancelled:
+            summary.add_message("WARNING", "Cleanup cancelled; the remaining files were left in place")
+
+        if system_cleanup and sys.platform == "win32" and not engine.cancelled:
+            extras = report.add_section(Section("OTHER CLEANUP"))
+            _run_quiet(["ipconfig", "/flushdns"])
+            extras.add_message("INFO", "DNS cache flushed")
+            _run_quiet(["powershell", "-NoProfile", "-Command", "Clear-RecycleBin -Force -ErrorAction SilentlyContinue"])
+            extras.add_message("INFO", "Recycle Bin emptied")
+
+    report.duration = time.perf_counter() - started
+    return report
+
+
+# Script file -> collector producing the same report in-process
+COLLECTORS = {
+    "performance_monitor.bat": collect_performance,
+    "memory_check.bat": collect_memory,
+    "clear_temp.bat": collect_temp_cleanup,
+    "disk_space.bat": collect_disk_space,
+    "find_duplicates.bat": collect_duplicates,
+    "sfc_log.bat": collect_sfc_log,
+    "network_diagnostics.bat": collect_network,
+}
+
+# Collectors that write their own output as they run (see is_streaming)
+STREAMING_COLLECTORS = {collect_disk_space, collect_duplicates}
+
+
+def is_streaming(collector):
+    """
+    True for collectors also called with ``on_output`` and ``on_progress``
+    keyword arguments; their report's lines are not printed again at the
+    end. Every collector is called with ``is_cancelled``.
+    """
+    return collector in STREAMING_COLLECTORS
+
+
+def get_collector(script_file):
+    """Return the native collector for a script, or None"""
+    return COLLECTORS.get(os.path.basename(script_file))
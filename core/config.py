@@ -0,0 +1,78 @@
+"""
+Application settings loaded from config.ini
+"""
+
+import os
+import sys
+import configparser
+
+
+def get_base_path():
+    """Return the application root (bundle directory when frozen)"""
+    try:
+        # For bundled executable
+        return sys._MEIPASS
+    except AttributeError:
+        # For development
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+CONFIG_PATH = os.path.join(get_base_path(), "config.ini")
+
+_settings = None
+
+
+def load_settings(path=CONFIG_PATH):
+    """Load the DEFAULT section of config.ini (missing file gives empty settings)"""
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(path, encoding="utf-8")
+    except configparser.Error:
+        pass
+    return parser["DEFAULT"]
+
+
+def get_settings():
+    """Return the cached application settings"""
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def get_int(key, fallback):
+    """Read an integer setting, falling back on missing or invalid values"""
+    try:
+        return int(get_settings().get(key, fallback))
+    except (TypeError, ValueError):
+        return fallback
+
+
+def get_float(key, fallback):
+    """Read a float setting, falling back on missing or invalid values"""
+    try:
+        return float(get_settings().get(key, fallback))
+    except (TypeError, ValueError):
+        return fallback
+
+
+def get_bool(key, fallback):
+    """Read a boolean setting, falling back on missing or invalid values"""
+    value = str(get_settings().get(key, fallback)).strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return fallback
+
+
+def get_choice(key, choices, fallback):
+    """Read a setting that must be one of ``choices`` (case-insensitive)"""
+    value = str(get_settings().get(key, fallback)).strip().lower()
+    return value if value in choices else fallback
+
+
+def get_list(key, fallback):
+    """Read a comma-separated setting as a list of non-empty, stripped items"""
+    value = get_settings().get(key, fallback)
+    return [item.strip() for item in str(value).split(",") if item.strip()]
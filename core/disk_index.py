@@ -0,0 +1,263 @@
+"""
+Persistent, incrementally updated index of directory sizes
+
+The index keeps one record per directory: its modification time, the
+bytes and count of the files directly inside it, its subdirectory names
+and its large files. A re-scan stats every directory but only re-lists
+the ones whose modification time changed (a file was added, removed or
+renamed in them); the records of unchanged directories are reused. Sizes
+of whole subtrees are then summed bottom-up in memory, so "largest
+folders" and "recent large files" are queries over the index instead of
+recursive walks.
+
+Files rewritten in place do not touch their directory's modification
+time, so a full re-scan is forced once the last one is FULL_SCAN_AGE old.
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import config
+from core.cleanup import is_link
+
+INDEX_VERSION = 1
+
+# Files at least this large are remembered individually
+LARGE_FILE_BYTES = 100 * 1024 * 1024
+
+# Seconds after which a re-scan lists every directory again
+FULL_SCAN_AGE = 7 * 86400
+
+# Levels below the root that are split between workers; deeper subtrees are
+# walked by a single worker each
+FANOUT_DEPTH = 2
+
+DEFAULT_WORKERS = 8
+
+# Record fields
+_MTIME, _BYTES, _FILES, _SUBDIRS, _LARGE = range(5)
+
+
+def default_index_path():
+    return os.path.join(config.get_base_path(), "logs", "disk_index.json")
+
+
+class ScanStats:
+    """What one scan did"""
+
+    def __init__(self):
+        self.directories = 0
+        # Directories whose records were reused without listing them
+        self.reused = 0
+        # Directories that could not be read (appended to by the workers)
+        self.unreadable = []
+        self.full = False
+        # Stopped by is_cancelled; the index was left as it was
+        self.cancelled = False
+        self.duration = 0.0
+
+
+class DiskIndex:
+    """
+    Directory-size index of one root, persisted as JSON at ``path``.
+
+    scan() brings the index up to date; the query methods only read it.
+    """
+
+    def __init__(self, root, path=None, workers=DEFAULT_WORKERS):
+        self.root = os.path.abspath(root)
+        self.path = path
+        self.workers = max(1, int(workers))
+        # directory -> [mtime_ns, own bytes, own file count, subdirectory names, [[name, size, mtime]]]
+        self._records = {}
+        # directory -> bytes of the whole subtree
+        self._totals = {}
+        self.full_scan_time = 0.0
+        self.scan_time = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def load(self):
+        """Read the index file; a missing, damaged or foreign file starts empty"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or data.get("root") != self.root:
+            return
+        self._records = data.get("directories", {})
+        self.full_scan_time = float(data.get("full_scan_time", 0.0))
+        self.scan_time = float(data.get("scan_time", 0.0))
+        self._totals = _subtree_totals(self.root, self._records)
+
+    def save(self):
+        """Write the index file atomically"""
+        if not self.path:
+            return
+        data = {"version": INDEX_VERSION, "root": self.root, "full_scan_time": self.full_scan_time,
+                "scan_time": self.scan_time, "directories": self._records}
+        temp_path = self.path + ".tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temp_path, self.path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._records)
+
+    def scan(self, full=False, on_progress=None, is_cancelled=None):
+        """
+        Update the index from disk and save it; returns ScanStats.
+
+        ``on_progress`` gets the percentage of subtrees walked.
+        ``is_cancelled`` is polled by the workers between directories; a
+        cancelled scan keeps the previous index instead of a partial one.
+        """
+        is_cancelled = is_cancelled or (lambda: False)
+        started = time.time()
+        stats = ScanStats()
+        stats.full = full or not self._records or started - self.full_scan_time > FULL_SCAN_AGE
+        previous = {} if stats.full else self._records
+        records = {}
+
+        # The first levels are visited breadth-first so their subtrees can be split between workers
+        level = [self.root]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in range(FANOUT_DEPTH):
+                if is_cancelled():
+                    break
+                next_level = []
+                for path, record in zip(level, executor.map(lambda path: _visit(path, previous, stats), level)):
+                    if record is not None:
+                        records[path] = record
+                        next_level.extend(os.path.join(path, name) for name in record[_SUBDIRS])
+                level = next_level
+            for done, subtree in enumerate(executor.map(lambda path: _walk(path, previous, stats, is_cancelled),
+                                                        level), 1):
+                records.update(subtree)
+                if on_progress is not None:
+                    on_progress(done * 100 // len(level))
+
+        if is_cancelled():
+            stats.cancelled = True
+            stats.duration = time.time() - started
+            return stats
+
+        stats.directories = len(records)
+        stats.reused = sum(1 for path, record in records.items() if previous.get(path) is record)
+        stats.duration = time.time() - started
+        self._records = records
+        self._totals = _subtree_totals(self.root, records)
+        self.scan_time = started
+        if stats.full:
+            self.full_scan_time = started
+        self.save()
+        return stats
+
+    def size(self, path):
+        """Bytes under a directory, or None if it is not indexed"""
+        return self._totals.get(os.path.abspath(path))
+
+    def largest_folders(self, path=None, count=10):
+        """(path, bytes) of a directory's largest immediate subfolders, largest first"""
+        path = os.path.abspath(path) if path else self.root
+        record = self._records.get(path)
+        if record is None:
+            return []
+        children = [os.path.join(path, name) for name in record[_SUBDIRS]]
+        sizes = [(child, self._totals.get(child, 0)) for child in children]
+        sizes.sort(key=lambda item: item[1], reverse=True)
+        return sizes[:count]
+
+    def recent_large_files(self, path=None, days=7, min_size=LARGE_FILE_BYTES, count=5):
+        """(path, bytes, mtime) of large files under a directory modified in the last ``days``, largest first"""
+        path = os.path.abspath(path) if path else self.root
+        prefix = path.rstrip(os.sep) + os.sep
+        since = time.time() - days * 86400
+        files = []
+        for directory, record in self._records.items():
+            if not record[_LARGE] or (directory != path and not directory.startswith(prefix)):
+                continue
+            for name, size, mtime in record[_LARGE]:
+                if size >= min_size and mtime >= since:
+                    files.append((os.path.join(directory, name), size, mtime))
+        files.sort(key=lambda item: item[1], reverse=True)
+        return files[:count]
+
+
+def _visit(path, previous, stats):
+    """Record of one directory: reused when its mtime is unchanged, otherwise listed"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        stats.unreadable.append(path)
+        return None
+    record = previous.get(path)
+    if record is not None and record[_MTIME] == mtime:
+        return record
+
+    own_bytes = 0
+    own_files = 0
+    subdirs = []
+    large = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if is_link(entry):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                        continue
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                own_bytes += info.st_size
+                own_files += 1
+                if info.st_size >= LARGE_FILE_BYTES:
+                    large.append([entry.name, info.st_size, int(info.st_mtime)])
+    except OSError:
+        stats.unreadable.append(path)
+    return [mtime, own_bytes, own_files, subdirs, large]
+
+
+def _walk(root, previous, stats, is_cancelled):
+    """Records of a whole subtree, visited by one worker until cancelled"""
+    records = {}
+    pending = [root]
+    while pending and not is_cancelled():
+        path = pending.pop()
+        record = _visit(path, previous, stats)
+        if record is None:
+            continue
+        records[path] = record
+        pending.extend(os.path.join(path, name) for name in record[_SUBDIRS])
+    return records
+
+
+def _subtree_totals(root, records):
+    """Bytes of every indexed subtree, summed bottom-up"""
+    order = []
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        record = records.get(path)
+        if record is None:
+            continue
+        order.append(path)
+        pending.extend(os.path.join(path, name) for name in record[_SUBDIRS])
+    totals = {}
+    # Children always come after their parent in ``order``
+    for path in reversed(order):
+        record = records[path]
+        totals[path] = record[_BYTES] + sum(totals.get(os.path.join(path, name), 0) for name in record[_SUBDIRS])
+    return totals
@@ -0,0 +1,272 @@
+"""
+Duplicate-file finder with staged hashing
+
+Files are only read when they could still be duplicates:
+
+1. Sizes: a first walk counts file sizes; a second walk keeps the paths of
+   files whose size occurs more than once. Memory grows with the number of
+   distinct sizes and of same-size files, not with the number of files.
+   Hard links to the same file are kept once; removing one frees nothing.
+2. Edges: files of equal size are compared by a hash of their first and
+   last EDGE_BYTES, which separates most look-alikes (same-size media,
+   archives, installers) after reading a few KB.
+3. Contents: files that still match are hashed in full through a memory
+   map, without copying the file into Python buffers.
+
+Size groups are checked on a worker pool, largest size first, and every
+confirmed group is handed to ``on_group`` as soon as it is known.
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from core.cleanup import is_link
+
+# Bytes read from each end of a file in the edge stage
+EDGE_BYTES = 4096
+
+# Bytes hashed per step of a full hash
+HASH_CHUNK = 1024 * 1024
+
+# Files smaller than this are ignored by default
+DEFAULT_MIN_SIZE = 1024 * 1024
+
+DEFAULT_WORKERS = 8
+
+# Size groups queued per worker; bounds memory while keeping workers busy
+QUEUE_DEPTH = 4
+
+# Directories listed between progress reports (and cancel checks) while walking
+WALK_REPORT_EVERY = 256
+
+
+class DuplicateGroup:
+    """Files with identical contents"""
+
+    def __init__(self, size, digest, paths):
+        self.size = size
+        self.digest = digest
+        self.paths = sorted(paths)
+
+    @property
+    def wasted(self):
+        """Bytes freed by keeping a single copy"""
+        return self.size * (len(self.paths) - 1)
+
+    def to_dict(self):
+        return {"size": self.size, "digest": self.digest, "paths": self.paths, "wasted": self.wasted}
+
+
+class ScanSummary:
+    """Counts of one search"""
+
+    def __init__(self):
+        self.files = 0
+        self.candidates = 0
+        # Files whose edges matched another file's and were hashed in full
+        self.fully_hashed = 0
+        self.unreadable = 0
+        self.groups = 0
+        self.wasted = 0
+
+
+def walk_files(roots, min_size=DEFAULT_MIN_SIZE, stop=None):
+    """
+    Yield (path, size) of the regular files under the roots, without
+    following links. ``stop()`` is called before each directory is listed;
+    the walk ends when it returns True.
+    """
+    pending = list(roots)
+    while pending:
+        if stop is not None and stop():
+            return
+        path = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if is_link(entry):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            size = entry.stat(follow_symlinks=False).st_size
+                            if size >= min_size:
+                                yield entry.path, size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _outermost(roots):
+    """Roots without those inside another root, so no file is seen twice"""
+    result = []
+    for root in sorted({os.path.abspath(root) for root in roots}):
+        if not any(root.startswith(kept.rstrip(os.sep) + os.sep) for kept in result):
+            result.append(root)
+    return result
+
+
+def edge_hash(path, size):
+    """Hash of a file's first and last EDGE_BYTES"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(EDGE_BYTES))
+        if size > EDGE_BYTES:
+            f.seek(max(EDGE_BYTES, size - EDGE_BYTES))
+            digest.update(f.read(EDGE_BYTES))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    """Hash of a whole file, read through a memory map"""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return digest.hexdigest()
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(view), HASH_CHUNK):
+                    digest.update(view[start:start + HASH_CHUNK])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+def _group_by(paths, key):
+    """Groups of two or more paths with equal key(path); unreadable paths are counted and dropped"""
+    groups = defaultdict(list)
+    unreadable = 0
+    for path in paths:
+        try:
+            groups[key(path)].append(path)
+        except OSError:
+            unreadable += 1
+    return [(value, members) for value, members in groups.items() if len(members) > 1], unreadable
+
+
+def confirm_duplicates(size, paths):
+    """Return (groups, fully hashed count, unreadable count) for files of one size"""
+    groups = []
+    hashed = 0
+    edges, unreadable = _group_by(paths, lambda path: edge_hash(path, size))
+    for edge_digest, members in edges:
+        if size <= 2 * EDGE_BYTES:
+            # The edges covered the whole file
+            contents = [(edge_digest, members)]
+        else:
+            hashed += len(members)
+            contents, failed = _group_by(members, full_hash)
+            unreadable += failed
+        for digest, same in contents:
+            groups.append(DuplicateGroup(size, digest, same))
+    return groups, hashed, unreadable
+
+
+class DuplicateFinder:
+    """
+    Finds duplicate files under a set of roots.
+
+    ``on_group(group)`` and ``on_progress(percent)`` are called from the
+    thread that runs run(). cancel() stops after the size groups in flight.
+    """
+
+    def __init__(self, roots, min_size=DEFAULT_MIN_SIZE, workers=DEFAULT_WORKERS, on_group=None,
+                 on_progress=None):
+        self.roots = _outermost(roots)
+        self.min_size = max(1, int(min_size))
+        self.workers = max(1, int(workers))
+        self.on_group = on_group or (lambda group: None)
+        self.on_progress = on_progress or (lambda percent: None)
+        self.summary = ScanSummary()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _walk_stop(self, percent):
+        """stop() for walk_files: reports ``percent`` now and then and ends the walk on cancel"""
+        listed = [0]
+
+        def stop():
+            listed[0] += 1
+            if listed[0] % WALK_REPORT_EVERY == 0:
+                self.on_progress(percent)
+            return self.cancelled
+        return stop
+
+    def candidates(self):
+        """{size: paths} of the sizes shared by two or more distinct files ({} when cancelled)"""
+        sizes = Counter(size for _, size in walk_files(self.roots, self.min_size, self._walk_stop(0)))
+        self.summary.files = sum(sizes.values())
+        shared = {size for size, count in sizes.items() if count > 1}
+        del sizes
+        groups = defaultdict(list)
+        # Hard links are one file under several names: deleting one frees nothing
+        seen = set()
+        for path, size in walk_files(self.roots, self.min_size, self._walk_stop(5)):
+            if size not in shared:
+                continue
+            try:
+                info = os.stat(path, follow_symlinks=False)
+            except OSError:
+                continue
+            if info.st_nlink > 1 and info.st_ino:
+                key = (info.st_dev, info.st_ino)
+                if key in seen:
+                    continue
+                seen.add(key)
+            groups[size].append(path)
+        if self.cancelled:
+            return {}
+        # A file that grew into a shared size between the walks, or whose partners were links to it, has no partner
+        return {size: paths for size, paths in groups.items() if len(paths) > 1}
+
+    def run(self):
+        """Search the roots and return the confirmed DuplicateGroups, largest waste first"""
+        summary = self.summary
+        by_size = self.candidates()
+        if self.cancelled:
+            return []
+        summary.candidates = sum(len(paths) for paths in by_size.values())
+        self.on_progress(10)
+        found = []
+        total = len(by_size) or 1
+        done = 0
+        # Largest sizes first (popped from the end): they free the most space and are reported earliest
+        queue = sorted(by_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = set()
+            while (queue or running) and not self.cancelled:
+                while queue and len(running) < self.workers * QUEUE_DEPTH:
+                    size = queue.pop()
+                    running.add(executor.submit(confirm_duplicates, size, by_size.pop(size)))
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    groups, hashed, unreadable = future.result()
+                    summary.fully_hashed += hashed
+                    summary.unreadable += unreadable
+                    for group in groups:
+                        summary.groups += 1
+                        summary.wasted += group.wasted
+                        found.append(group)
+                        self.on_group(group)
+                    done += 1
+                self.on_progress(10 + done * 89 // total)
+            for future in running:
+                future.cancel()
+        found.sort(key=lambda group: group.wasted, reverse=True)
+        return found
@@ -0,0 +1,236 @@
+"""
+Per-tool run history used to estimate progress and time remaining
+
+Every successful run records its wall-clock time, output lines and bytes.
+The history is kept per tool and execution mode as exponentially weighted
+moving averages plus a short window of recent durations for percentiles,
+and persisted as JSON so estimates survive restarts. Before a tool has
+any history, the expected duration declared in the tool catalog is used.
+"""
+
+import os
+import json
+import threading
+
+from core import config
+
+STATS_VERSION = 1
+
+# Weight of the newest run in the moving averages
+EWMA_ALPHA = 0.3
+
+# Recent durations kept per tool for percentiles
+HISTORY_SIZE = 20
+
+# Progress never claims more than this before the tool has actually finished
+MAX_ESTIMATED_PERCENT = 95
+
+
+def default_stats_path():
+    return os.path.join(config.get_base_path(), "logs", "tool_stats.json")
+
+
+def tool_key(script_path):
+    """Stable tool identifier shared by the GUI and the CLI (script name without .bat)"""
+    return os.path.splitext(os.path.basename(script_path))[0].lower()
+
+
+def format_remaining(seconds):
+    """Format a time remaining as e.g. '45 s', '3 min 20 s' or '1 h 05 min'"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
+
+
+class ToolStats:
+    """Aggregated history of one tool in one execution mode"""
+
+    def __init__(self, runs=0, duration=0.0, lines=0.0, byte_count=0.0, recent=None):
+        self.runs = runs
+        # Moving averages
+        self.duration = duration
+        self.lines = lines
+        self.byte_count = byte_count
+        # Most recent durations, oldest first
+        self.recent = list(recent or [])
+
+    def add(self, duration, lines, byte_count, alpha=EWMA_ALPHA, history=HISTORY_SIZE):
+        if self.runs == 0:
+            self.duration, self.lines, self.byte_count = float(duration), float(lines), float(byte_count)
+        else:
+            self.duration += alpha * (duration - self.duration)
+            self.lines += alpha * (lines - self.lines)
+            self.byte_count += alpha * (byte_count - self.byte_count)
+        self.runs += 1
+        self.recent.append(round(float(duration), 3))
+        del self.recent[:-history]
+
+    def percentile(self, p):
+        """Linearly interpolated percentile (0-100) of the recent durations"""
+        if not self.recent:
+            return None
+        values = sorted(self.recent)
+        position = (len(values) - 1) * p / 100.0
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    def expected_duration(self):
+        """
+        Typical run time: the average, pulled towards the median so one
+        outlier can't dominate. Without recent durations (e.g. a stats file
+        written without them) it is the average alone.
+        """
+        if not self.runs:
+            return None
+        median = self.percentile(50)
+        if median is None:
+            return self.duration
+        return (self.duration + median) / 2
+
+    def to_dict(self):
+        return {
+            "runs": self.runs,
+            "duration": round(self.duration, 3),
+            "lines": round(self.lines, 1),
+            "bytes": round(self.byte_count, 1),
+            "recent": self.recent,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(int(data.get("runs", 0)), float(data.get("duration", 0.0)), float(data.get("lines", 0.0)),
+                   float(data.get("bytes", 0.0)), [float(value) for value in data.get("recent", [])])
+
+
+class ProgressEstimate:
+    """
+    Progress and time remaining for one run, from the tool's history.
+
+    Elapsed time is compared with the expected duration and output volume
+    with the typical line and byte counts. Once a run outlasts its 90th
+    percentile the remaining time is unknown and progress holds just below
+    completion instead of pretending to know.
+    """
+
+    def __init__(self, stats):
+        self.expected = stats.expected_duration()
+        slow = stats.percentile(90)
+        self.slow = self.expected if slow is None else slow
+        self.lines = stats.lines
+        self.byte_count = stats.byte_count
+        self._fraction = 0.0
+
+    def update(self, elapsed, lines=0, byte_count=0):
+        """Return (percent, seconds remaining or None) for the current run"""
+        expected = self.expected
+        if elapsed > expected:
+            expected = max(expected, self.slow)
+        fractions = [min(1.0, elapsed / expected)] if expected > 0 else []
+        if self.lines >= 1:
+            fractions.append(min(1.0, lines / self.lines))
+        if self.byte_count >= 1:
+            fractions.append(min(1.0, byte_count / self.byte_count))
+        if fractions:
+            # Never move backwards when output stalls
+            self._fraction = max(self._fraction, sum(fractions) / len(fractions))
+
+        percent = min(MAX_ESTIMATED_PERCENT, int(self._fraction * 100))
+        remaining = None
+        if elapsed <= expected:
+            remaining = max(0.0, (1 - self._fraction) * expected)
+        return percent, remaining
+
+
+class DurationModel:
+    """Thread-safe store of ToolStats keyed by tool and execution mode, persisted as JSON"""
+
+    def __init__(self, path=None, alpha=EWMA_ALPHA, history=HISTORY_SIZE, catalog=None):
+        self.path = path
+        # Optional ToolCatalog providing expected durations for tools without history
+        self.catalog = catalog
+        self.alpha = alpha
+        self.history = history
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Serializes writers of the shared temp file
+        self._save_lock = threading.Lock()
+        if path:
+            self.load()
+
+    def load(self):
+        """Read the stats file; a missing or damaged file starts an empty history"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != STATS_VERSION:
+            return
+        stats = {}
+        for tool, modes in data.get("tools", {}).items():
+            for mode, values in modes.items():
+                try:
+                    stats[(tool, mode)] = ToolStats.from_dict(values)
+                except (TypeError, ValueError, AttributeError):
+                    continue
+        with self._lock:
+            self._stats = stats
+
+    def save(self):
+        """Write the stats file atomically"""
+        if not self.path:
+            return
+        with self._lock:
+            tools = {}
+            for (tool, mode), stats in sorted(self._stats.items()):
+                tools.setdefault(tool, {})[mode] = stats.to_dict()
+        data = {"version": STATS_VERSION, "tools": tools}
+        temp_path = self.path + ".tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=1)
+                os.replace(temp_path, self.path)
+            except OSError:
+                pass
+
+    def get(self, tool, mode):
+        """Return the ToolStats for a tool and mode, or None before its first run"""
+        with self._lock:
+            return self._stats.get((tool, mode))
+
+    def record(self, tool, result):
+        """Add a finished ExecutionResult; only successful, complete runs count"""
+        if not result.success or result.cancelled:
+            return
+        with self._lock:
+            stats = self._stats.setdefault((tool, result.mode), ToolStats())
+            stats.add(result.duration, result.line_count, result.byte_count, self.alpha, self.history)
+        self.save()
+
+    def estimate(self, tool, mode):
+        """Return a ProgressEstimate for a new run, or None when nothing is known"""
+        stats = self.get(tool, mode)
+        if stats is None or not stats.runs:
+            stats = self.prior(tool, mode)
+        if stats is None:
+            return None
+        return ProgressEstimate(stats)
+
+    def prior(self, tool, mode):
+        """ToolStats built from the catalog's expected duration for the script, or None"""
+        # Declared durations are for the script; native collectors take milliseconds
+        if self.catalog is None or mode == "native":
+            return None
+        spec = self.catalog.get(tool)
+        if spec is None or not spec.expected_duration:
+            return None
+        expected = float(spec.expected_duration)
+        return ToolStats(1, expected, recent=[expected])
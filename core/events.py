@@ -0,0 +1,259 @@
+"""
+Structured events parsed from tool output as it streams
+
+Every line a tool prints is classified once, when it arrives: ``[INFO]``,
+``[WARNING]`` and ``[ERROR]`` messages, section headers (banner titles and
+``[SECTION]`` lines), table rows (under a ``---- ----`` underline or with
+several space-separated columns) and ``Key: value`` pairs. Ordinary text
+is not indexed. Events are compact - the session line number of the raw
+text in the LogStore, a small integer kind and, for key/value lines, the
+pair - and are indexed per run and kind, so a filter such as "warnings
+from the last 10 runs" is a lookup instead of a regex pass over the log.
+"""
+
+import re
+import time
+import heapq
+from array import array
+from collections import deque
+
+TEXT = 0
+INFO = 1
+WARNING = 2
+ERROR = 3
+SUCCESS = 4
+HEADER = 5
+TABLE = 6
+KEY_VALUE = 7
+
+KIND_NAMES = {
+    TEXT: "text",
+    INFO: "info",
+    WARNING: "warning",
+    ERROR: "error",
+    SUCCESS: "success",
+    HEADER: "header",
+    TABLE: "table",
+    KEY_VALUE: "key_value",
+}
+
+# Bracketed tags and "TAG:" prefixes that carry a level
+LEVELS = {
+    "INFO": INFO, "NOTE": INFO,
+    "WARNING": WARNING, "WARN": WARNING,
+    "ERROR": ERROR, "FAIL": ERROR, "FAILED": ERROR, "CRITICAL": ERROR,
+    "OK": SUCCESS, "SUCCESS": SUCCESS, "PASS": SUCCESS, "DONE": SUCCESS,
+}
+
+# Runs kept in the index; older runs are forgotten first
+MAX_RUNS = 500
+
+_TAG = re.compile(r"\[([A-Za-z][A-Za-z0-9 _/&%-]*)\]\s*(.*)$")
+_RULE = re.compile(r"[=\-_*#~]{3,}$")
+_UNDERLINE = re.compile(r"-{2,}(?: +-{2,})+$")
+_LEVEL_PREFIX = re.compile(r"([A-Za-z]+)\s*:\s")
+_KEY_VALUE = re.compile(r"([A-Za-z][^:=\[\]]{0,59}?)[ .]*[:=]\s+(\S.*)$")
+_COLUMNS = re.compile(r"\S(?: ?\S)*(?: {2,}|\t+)\S(?: ?\S)*(?: {2,}|\t+)\S")
+
+
+class OutputParser:
+    """
+    Incremental classifier for one run's output.
+
+    One line of look-ahead tells a table's header row (followed by a
+    dashed underline) from ordinary text, so each line's event is produced
+    when the next non-empty line arrives, or by flush() at the end of the
+    run.
+    """
+
+    def __init__(self):
+        self._held = None
+        self._after_rule = False
+        self._in_table = False
+
+    def feed(self, first_number, lines):
+        """Classify lines numbered from ``first_number``; returns (number, kind, key, value) events"""
+        events = []
+        for number, line in enumerate(lines, first_number):
+            line = line.strip()
+            if not line:
+                # A blank line ends tables and banners
+                self._release(events)
+                self._in_table = False
+                self._after_rule = False
+                continue
+            if _RULE.match(line):
+                if self._held is not None and line.strip("-") == "":
+                    # Underline of a one-column table
+                    events.append((self._held[0], TABLE, None, None))
+                    self._held = None
+                    self._in_table = True
+                    continue
+                self._release(events)
+                self._after_rule = True
+                self._in_table = False
+                continue
+            if _UNDERLINE.match(line):
+                # The held line was the table's header row
+                if self._held is not None:
+                    events.append((self._held[0], TABLE, None, None))
+                    self._held = None
+                self._in_table = True
+                continue
+            self._release(events)
+            self._held = (number, line)
+        return events
+
+    def flush(self):
+        """Events for the line still held back at the end of a run"""
+        events = []
+        self._release(events)
+        return events
+
+    def _release(self, events):
+        if self._held is None:
+            return
+        number, line = self._held
+        self._held = None
+        event = self.classify(line)
+        self._after_rule = False
+        if event is not None:
+            events.append((number,) + event)
+
+    def classify(self, line):
+        """Return (kind, key, value) for a non-empty line, or None for plain text"""
+        if line[0] == "[":
+            match = _TAG.match(line)
+            if match is not None:
+                tag, rest = match.group(1), match.group(2)
+                level = LEVELS.get(tag.upper())
+                if level is not None:
+                    return level, None, None
+                if not rest:
+                    return HEADER, None, None
+        if self._after_rule:
+            return HEADER, None, None
+        match = _LEVEL_PREFIX.match(line)
+        if match is not None and match.group(1).upper() in LEVELS:
+            return LEVELS[match.group(1).upper()], None, None
+        if self._in_table:
+            return TABLE, None, None
+        match = _KEY_VALUE.match(line)
+        if match is not None:
+            return KEY_VALUE, match.group(1).rstrip(" ."), match.group(2)
+        if _COLUMNS.search(line):
+            return TABLE, None, None
+        return None
+
+
+def line_level(line):
+    """Level kind of a single line from its tag or "TAG:" prefix, or None"""
+    line = line.lstrip()
+    if line.startswith("["):
+        match = _TAG.match(line)
+        if match is not None:
+            return LEVELS.get(match.group(1).upper())
+        return None
+    match = _LEVEL_PREFIX.match(line)
+    if match is not None:
+        return LEVELS.get(match.group(1).upper())
+    return None
+
+
+class RunEvents:
+    """Events of one tool run, indexed by kind"""
+
+    def __init__(self, run_id, tool):
+        self.run_id = run_id
+        self.tool = tool
+        self.started = time.time()
+        self.finished = None
+        self.success = None
+        # kind -> line numbers in ascending order
+        self.lines = {}
+        # line number -> (key, value) for key/value events
+        self.fields = {}
+        # (first line number, line count) of every output batch, flattened
+        self.spans = array("Q")
+        self.parser = OutputParser()
+
+    def add(self, events):
+        for number, kind, key, value in events:
+            numbers = self.lines.get(kind)
+            if numbers is None:
+                numbers = self.lines[kind] = array("Q")
+            numbers.append(number)
+            if kind == KEY_VALUE:
+                self.fields[number] = (key, value)
+
+    def count(self, kind):
+        return len(self.lines.get(kind, ()))
+
+
+class EventIndex:
+    """Structured events of the session's runs, most recent MAX_RUNS kept"""
+
+    def __init__(self, max_runs=MAX_RUNS):
+        self.max_runs = max_runs
+        self._runs = deque()
+        self._by_id = {}
+        self._next_id = 1
+
+    def begin_run(self, tool):
+        """Start indexing a run and return its id"""
+        run = RunEvents(self._next_id, tool)
+        self._next_id += 1
+        self._runs.append(run)
+        self._by_id[run.run_id] = run
+        while len(self._runs) > self.max_runs:
+            del self._by_id[self._runs.popleft().run_id]
+        return run.run_id
+
+    def add(self, run_id, first_number, lines):
+        """Parse a batch of a run's output whose first line has session number ``first_number``"""
+        run = self._by_id.get(run_id)
+        if run is not None:
+            run.spans.extend((first_number, len(lines)))
+            run.add(run.parser.feed(first_number, lines))
+
+    def end_run(self, run_id, success):
+        run = self._by_id.get(run_id)
+        if run is None:
+            return
+        run.add(run.parser.flush())
+        run.parser = None
+        run.finished = time.time()
+        run.success = success
+
+    def get(self, run_id):
+        return self._by_id.get(run_id)
+
+    def runs(self, tool=None, last=None):
+        """Runs oldest first, optionally only a tool's and only the ``last`` few"""
+        runs = [run for run in self._runs if tool is None or run.tool == tool]
+        return runs[-last:] if last else runs
+
+    def query(self, kinds, last_runs=None, tool=None):
+        """Session line numbers of events of the given kinds, in log order"""
+        streams = [run.lines[kind] for run in self.runs(tool, last_runs) for kind in kinds if kind in run.lines]
+        # Concurrent runs interleave in the log, so merge their sorted lists
+        return list(heapq.merge(*streams))
+
+    def counts(self, kinds, last_runs=None, tool=None):
+        """Number of events per kind over the selected runs"""
+        runs = self.runs(tool, last_runs)
+        return {kind: sum(run.count(kind) for run in runs) for kind in kinds}
+
+    def tool_spans(self):
+        """(first, end, tool) line ranges written by the kept runs, in log order"""
+        spans = []
+        for run in self._runs:
+            for position in range(0, len(run.spans), 2):
+                first = run.spans[position]
+                spans.append((first, first + run.spans[position + 1], run.tool))
+        spans.sort()
+        return spans
+
+    def clear(self):
+        self._runs.clear()
+        self._by_id.clear()
@@ -0,0 +1,392 @@
+"""
+Qt-free execution core shared by the GUI's ScriptRunner and the headless CLI
+"""
+
+import subprocess
+import threading
+import time
+
+from core.batch_plan import ECHO, plan_batch_script
+from core.collectors import CollectorUnavailable, is_streaming
+from core.durations import format_remaining, tool_key
+from core.output import LineBatcher, stream_batches
+from core.process_tree import GRACE_PERIOD, ProcessTree, new_group_options
+from core.protocol import split_directives
+from core.result_cache import format_age
+from core.shell_pool import ShellHostError
+from core.timer_wheel import get_timer_wheel
+
+# How a tool was executed
+MODE_NATIVE = "native"
+MODE_SHELL_POOL = "shell_pool"
+MODE_SCRIPT = "script"
+MODE_CACHED = "cached"
+
+# Seconds between progress/ETA updates while a script is silent
+PROGRESS_INTERVAL = 0.5
+
+
+def _in_background(function, *args):
+    """Run ``function`` on a thread of its own; taskkill can block for seconds"""
+    threading.Thread(target=function, args=args, name="stop-tree", daemon=True).start()
+
+
+class ExecutionResult:
+    """Outcome of one tool run"""
+
+    def __init__(self, tool, success, message, return_code=None, mode=MODE_SCRIPT,
+                 duration=0.0, line_count=0, byte_count=0, cancelled=False, report=None, cached_age=None,
+                 timed_out=False):
+        self.tool = tool
+        self.success = success
+        self.message = message
+        self.return_code = return_code
+        self.mode = mode
+        self.duration = duration
+        self.line_count = line_count
+        self.byte_count = byte_count
+        self.cancelled = cancelled
+        # Cancelled because the tool overran its deadline
+        self.timed_out = timed_out
+        self.report = report
+        # Seconds since the replayed result was produced (None when run live)
+        self.cached_age = cached_age
+
+    def to_dict(self):
+        data = {
+            "tool": self.tool,
+            "success": self.success,
+            "return_code": self.return_code,
+            "cancelled": self.cancelled,
+            "mode": self.mode,
+            "duration": round(self.duration, 3),
+            "lines": self.line_count,
+            "bytes": self.byte_count,
+            "message": self.message,
+        }
+        if self.timed_out:
+            data["timed_out"] = True
+        if self.cached_age is not None:
+            data["cached_age"] = round(self.cached_age, 1)
+        if self.report is not None:
+            data["report"] = self.report.to_dict()
+        return data
+
+
+class ScriptExecution:
+    """
+    Runs one tool: its native collector if there is one, otherwise its steps in
+    warm shell hosts if the script can be translated, otherwise the script
+    itself through the shell.
+
+    Callbacks are invoked on the calling thread: ``on_output(lines)`` with
+    batches of lines, ``on_progress(percent)`` (-1 while progress is
+    unknown), ``on_eta(seconds)`` (-1 when unknown), ``on_report(report)``
+    and ``on_phase(name)``. Progress a script reports itself through
+    ``##pct``/``##phase`` directives (core.protocol) takes precedence over
+    estimates. With a DurationModel, progress and ETA come from the tool's past runs
+    and successful runs are added to its history. With a ResultCache,
+    read-only tools replay a recent result unless ``force_refresh`` is set,
+    and mutating tools invalidate what they make stale. With a ``timeout``
+    the tool is cancelled once it runs that many seconds; cancelling stops
+    the script's whole process tree, forcefully after a grace period.
+    """
+
+    def __init__(self, script_path, script_name, collector=None, shell_pool=None,
+                 on_output=None, on_progress=None, on_report=None, durations=None, on_eta=None,
+                 cache=None, force_refresh=False, timeout=None, timers=None, on_phase=None):
+        self.script_path = script_path
+        self.script_name = script_name
+        self.collector = collector
+        self.shell_pool = shell_pool
+        self.on_output = on_output or (lambda lines: None)
+        self.on_progress = on_progress or (lambda value: None)
+        self.on_report = on_report or (lambda report: None)
+        self.on_eta = on_eta or (lambda seconds: None)
+        self.on_phase = on_phase or (lambda name: None)
+        self.durations = durations
+        self.cache = cache
+        self.force_refresh = force_refresh
+        self.timeout = timeout
+        # Deadlines and kill escalation share one TimerWheel
+        self.timers = timers or get_timer_wheel()
+        # Output kept for the cache while a cacheable tool runs
+        self._captured = None
+        self.tool = tool_key(script_path)
+        self.process = None
+        self.active_host = None
+        self.cancelled = False
+        self.timed_out = False
+        # Set once the process tree has been force-killed
+        self.killed = False
+        self._stopping = False
+        self.line_count = 0
+        self.byte_count = 0
+        self.started = None
+        # Progress reported by the script itself (##pct), and its current ##phase
+        self.reported_percent = None
+        self.phase = None
+
+    def cancel(self):
+        """Request cancellation and stop the running process tree"""
+        self.cancelled = True
+        host = self.active_host
+        if host is not None:
+            # The pool replaces a killed host on release
+            _in_background(host.kill)
+        process = self.process
+        if process is not None and process.poll() is None and not self._stopping:
+            self._stopping = True
+            # Snapshotting and signalling the tree happen off the calling thread
+            # (the GUI, or the timer wheel when a deadline expires)
+            _in_background(self._stop_tree, process)
+
+    def expire(self):
+        """Deadline reached: cancel the run and report it as timed out"""
+        self.timed_out = True
+        self.cancel()
+
+    def _stop_tree(self, process):
+        tree = ProcessTree(process.pid)
+        tree.stop()
+        # The wheel only times the escalation; its one thread must not wait on taskkill
+        self.timers.schedule(GRACE_PERIOD, lambda: _in_background(self._kill_tree, tree))
+
+    def _kill_tree(self, tree):
+        tree.kill()
+        # Stop waiting for output even if something outside the tree holds the pipe
+        self.killed = True
+
+    def _emit(self, lines):
+        if lines:
+            self.line_count += len(lines)
+            self.byte_count += sum(len(line) + 1 for line in lines)
+            if self._captured is not None:
+                self._captured.extend(lines)
+            self.on_output(lines)
+
+    def _emit_output(self, lines):
+        """Emit script output, acting on protocol directives instead of printing them"""
+        lines, percent, phases = split_directives(lines)
+        self._emit(lines)
+        for phase in phases:
+            self.phase = phase
+            self.on_phase(phase)
+        if percent is not None:
+            self.reported_percent = percent
+
+    def _estimate(self, mode):
+        if self.durations is None:
+            return None
+        return self.durations.estimate(self.tool, mode)
+
+    def _update_progress(self, estimate, floor=None):
+        """Report estimated progress and ETA; ``floor`` is a known minimum fraction"""
+        if self.reported_percent is not None:
+            # The script's own figure beats any estimate; 100 waits for the exit
+            percent = min(99, self.reported_percent)
+            self.on_progress(percent)
+            elapsed = time.monotonic() - self.started
+            self.on_eta(elapsed * (100 - percent) / percent if percent > 0 else -1)
+            return
+        if estimate is None:
+            self.on_progress(-1 if floor is None else 10 + int(floor * 85))
+            return
+        percent, remaining = estimate.update(time.monotonic() - self.started, self.line_count, self.byte_count)
+        if floor is not None:
+            percent = max(percent, 10 + int(floor * 85))
+        self.on_progress(percent)
+        self.on_eta(-1 if remaining is None else remaining)
+
+    def run(self):
+        """Execute the tool and return an ExecutionResult"""
+        started = self.started = time.monotonic()
+        cache_key = None
+        if self.cache is not None:
+            # Taken before running, so a mutating tool finishing meanwhile voids this result
+            generation = self.cache.generation
+            cache_key = self.cache.key(self.script_path)
+            entry = None if self.force_refresh else self.cache.lookup(cache_key)
+            if entry is not None:
+                result = self.replay(entry)
+                result.duration = time.monotonic() - started
+                return result
+            if cache_key is not None:
+                self._captured = []
+
+        deadline = self.timers.schedule(self.timeout, self.expire) if self.timeout else None
+        try:
+            result = self.run_live()
+        finally:
+            self.timers.cancel(deadline)
+        result.duration = time.monotonic() - started
+        result.line_count = self.line_count
+        result.byte_count = self.byte_count
+        if self.durations is not None:
+            self.durations.record(self.tool, result)
+        if self.cache is not None:
+            if cache_key is not None:
+                self.cache.store(cache_key, self._captured, result, generation)
+            else:
+                # Even a failed run may have changed something
+                self.cache.tool_ran(self.script_path)
+        self._captured = None
+        return result
+
+    def _finish(self, return_code, mode):
+        if self.timed_out:
+            return ExecutionResult(self.script_name, False,
+                                   f"⏱️ {self.script_name} timed out after {format_remaining(self.timeout)}",
+                                   return_code, mode, cancelled=True, timed_out=True)
+        if self.cancelled:
+            return ExecutionResult(self.script_name, False, f"🛑 {self.script_name} cancelled",
+                                   return_code, mode, cancelled=True)
+        if return_code == 0:
+            return ExecutionResult(self.script_name, True, f"✅ {self.script_name} completed successfully",
+                                   return_code, mode)
+        return ExecutionResult(self.script_name, False,
+                               f"❌ {self.script_name} failed with return code {return_code}", return_code, mode)
+
+    def _error(self, error, mode):
+        return ExecutionResult(self.script_name, False, f"💥 Error running {self.script_name}: {str(error)}",
+                               None, mode)
+
+    def replay(self, entry):
+        """Emit a cached result's output instead of running the tool"""
+        age = format_age(entry.age())
+        self._emit([f"♻️ Cached result from {age} ago (force refresh to run it again)"])
+        self._emit(entry.lines)
+        self.on_progress(100)
+        return ExecutionResult(self.script_name, entry.success,
+                               f"✅ {self.script_name} completed successfully (cached {age} ago)",
+                               entry.return_code, MODE_CACHED, line_count=self.line_count,
+                               byte_count=self.byte_count, cached_age=entry.age())
+
+    def run_live(self):
+        """Run the tool itself, bypassing the cache and the run history"""
+        result = None
+        if self.collector is not None:
+            result = self.run_collector()
+        if result is None and self.shell_pool is not None:
+            steps = plan_batch_script(self.script_path)
+            if steps is not None:
+                result = self.run_steps(steps)
+        if result is None:
+            result = self.run_script()
+        return result
+
+    def run_collector(self):
+        """Produce the report in-process; returns None to fall back to the script"""
+        streaming = is_streaming(self.collector)
+        try:
+            if streaming:
+                # Long searches print their findings as they go
+                report = self.collector(on_output=self._emit, on_progress=self.on_progress,
+                                        is_cancelled=lambda: self.cancelled)
+            else:
+                report = self.collector(is_cancelled=lambda: self.cancelled)
+        except CollectorUnavailable:
+            return None
+        except Exception as e:
+            return self._error(e, MODE_NATIVE)
+
+        self.on_report(report)
+        if not streaming:
+            self._emit(report.to_lines())
+        if self.cancelled:
+            return self._finish(0, MODE_NATIVE)
+        self.on_progress(100)
+        return ExecutionResult(
+            self.script_name, True,
+            f"✅ {self.script_name} completed successfully ({report.duration * 1000:.0f} ms, native)",
+            0, MODE_NATIVE, report=report)
+
+    def run_steps(self, steps):
+        """Run a translated script: echo lines locally, commands in warm shell hosts"""
+        total = sum(1 for kind, _ in steps if kind != ECHO) or 1
+        done = 0
+        return_code = 0
+        pending = []
+        estimate = self._estimate(MODE_SHELL_POOL)
+        self._update_progress(estimate, 0)
+
+        try:
+            for kind, text in steps:
+                if self.cancelled:
+                    break
+                if kind == ECHO:
+                    pending.append(text.strip())
+                    continue
+
+                self._emit_output(pending)
+                pending = []
+
+                try:
+                    # Every host may be busy with other jobs; cancelling must not wait for them
+                    host = self.shell_pool.acquire(cancelled=lambda: self.cancelled)
+                except ShellHostError:
+                    if self.cancelled:
+                        break
+                    raise
+                self.active_host = host
+                try:
+                    result = host.execute(text)
+                    return_code = result.exit_code
+                    self._emit_output([line.strip() for line in result.lines])
+                except ShellHostError as e:
+                    if self.cancelled:
+                        break
+                    return_code = 1
+                    self._emit([f"[ERROR] {e}"])
+                finally:
+                    self.active_host = None
+                    self.shell_pool.release(host)
+
+                done += 1
+                self._update_progress(estimate, done / total)
+
+            self._emit_output(pending)
+            self.on_progress(100)
+
+            # Like cmd, the script's status is that of its last command
+            return self._finish(return_code, MODE_SHELL_POOL)
+
+        except Exception as e:
+            return self._error(e, MODE_SHELL_POOL)
+
+    def run_script(self):
+        try:
+            # Run the script and capture output
+            self.process = subprocess.Popen(
+                [self.script_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                shell=True,
+                # Own process group, so cancelling can stop everything the script starts
+                **new_group_options()
+            )
+            process = self.process
+
+            # Cancelled before the process handle was published
+            if self.cancelled:
+                self.cancel()
+
+            # Progress and ETA from this tool's previous runs (unknown on the first run)
+            estimate = self._estimate(MODE_SCRIPT)
+            self._update_progress(estimate)
+
+            # Read raw output in large chunks and emit coalesced batches
+            batcher = LineBatcher()
+            for lines in stream_batches(process.stdout, batcher, idle_interval=PROGRESS_INTERVAL):
+                self._emit_output(lines)
+                self._update_progress(estimate)
+                if self.killed:
+                    break
+
+            # Wait for process to complete
+            return_code = process.wait()
+            self.on_progress(100)
+            return self._finish(return_code, MODE_SCRIPT)
+
+        except Exception as e:
+            return self._error(e, MODE_SCRIPT)
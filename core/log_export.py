@@ -0,0 +1,175 @@
+"""
+Streaming export of the session log
+
+The exporter reads a LogSnapshot in chunks and writes each chunk with a
+single call, so a session of any size is exported with flat memory and
+without the GUI thread taking part. Two layouts are supported, each
+plain, gzip- or zstd-compressed (zstd needs the optional ``zstandard``
+package):
+
+- text: the console lines as shown, under a short header
+- NDJSON: one JSON object per line with the line number, the console
+  timestamp, the tool that wrote it, its level and the text
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+
+from core.events import KIND_NAMES, line_level
+
+FORMAT_TEXT = "text"
+FORMAT_NDJSON = "ndjson"
+
+COMPRESSION_NONE = None
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+# Lines formatted and written per chunk
+CHUNK_LINES = 5000
+
+_COMPRESSION_SUFFIXES = {".gz": COMPRESSION_GZIP, ".zst": COMPRESSION_ZSTD}
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl", ".json")
+
+_TIMESTAMP = re.compile(r"\[(\d\d:\d\d:\d\d)\] ")
+
+_encode_string = json.JSONEncoder(ensure_ascii=False).encode
+_LEVEL_JSON = {kind: f'"{name}"' for kind, name in KIND_NAMES.items()}
+
+
+class ExportCancelled(Exception):
+    """Raised by LogExport.run() when cancel() was called"""
+
+
+def zstd_available():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def detect_format(path):
+    """(format, compression) implied by a file name such as ``session.ndjson.gz``"""
+    root, suffix = os.path.splitext(path.lower())
+    compression = _COMPRESSION_SUFFIXES.get(suffix)
+    if compression is not None:
+        root, suffix = os.path.splitext(root)
+    return (FORMAT_NDJSON if suffix in _NDJSON_SUFFIXES else FORMAT_TEXT), compression
+
+
+def _open_output(path, compression):
+    """Binary stream writing (and compressing) to ``path``"""
+    if compression == COMPRESSION_GZIP:
+        # Level 6 is several times faster than the default 9 for nearly the same size
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == COMPRESSION_ZSTD:
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression needs the 'zstandard' package") from None
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb")
+
+
+class LogExport:
+    """
+    Export of one LogSnapshot to a file.
+
+    ``tool_spans`` are (first, end, tool) line ranges in log order, as
+    returned by EventIndex.tool_spans(). ``on_progress(done, total)`` is
+    called after every chunk. The file is written under a temporary name
+    and only renamed into place once complete.
+    """
+
+    def __init__(self, snapshot, path, format=None, compression=COMPRESSION_NONE, tool_spans=(),
+                 on_progress=None):
+        if format is None:
+            format, compression = detect_format(path)
+        self.snapshot = snapshot
+        self.path = path
+        self.format = format
+        self.compression = compression
+        self.tool_spans = tool_spans
+        self.on_progress = on_progress
+        self.cancelled = False
+        self.line_count = 0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        """Write the export and return the number of lines written"""
+        partial = self.path + ".part"
+        stream = _open_output(partial, self.compression)
+        try:
+            with stream:
+                if self.format == FORMAT_TEXT:
+                    stream.write(self._text_header().encode("utf-8"))
+                    format_chunk = self._format_text
+                else:
+                    format_chunk = self._format_ndjson
+                self._spans = iter(self.tool_spans)
+                self._span = next(self._spans, None)
+                total = len(self.snapshot)
+                chunk = []
+                for entry in self.snapshot:
+                    chunk.append(entry)
+                    if len(chunk) == CHUNK_LINES:
+                        self._write(stream, format_chunk(chunk), total)
+                        chunk = []
+                if chunk:
+                    self._write(stream, format_chunk(chunk), total)
+            os.replace(partial, self.path)
+        except BaseException:
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            raise
+        return self.line_count
+
+    def _write(self, stream, text, total):
+        if self.cancelled:
+            raise ExportCancelled()
+        stream.write(text.encode("utf-8"))
+        self.line_count += text.count("\n")
+        if self.on_progress is not None:
+            self.on_progress(self.line_count, total)
+
+    def _text_header(self):
+        return ("PC Troubleshooter Log Export\n" + "=" * 50 + "\n"
+                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+    @staticmethod
+    def _format_text(chunk):
+        return "".join(line + "\n" for _, line in chunk)
+
+    def _tool(self, number):
+        """Tool that wrote a line; spans are consumed in order as the lines go by"""
+        while self._span is not None and self._span[1] <= number:
+            self._span = next(self._spans, None)
+        if self._span is not None and self._span[0] <= number:
+            return self._span[2]
+        return None
+
+    def _format_ndjson(self, chunk):
+        # Records are assembled by hand around the encoder's fast string path
+        encode = _encode_string
+        records = []
+        for number, line in chunk:
+            time = "null"
+            match = _TIMESTAMP.match(line)
+            if match is not None:
+                time = f'"{match.group(1)}"'
+                line = line[match.end():]
+            tool = self._tool(number)
+            if tool is not None and line.startswith(f"[{tool}] "):
+                # Tag added while several jobs were running
+                line = line[len(tool) + 3:]
+            level = line_level(line)
+            records.append(f'{{"n": {number}, "time": {time}, "tool": {encode(tool) if tool is not None else "null"}, '
+                           f'"level": {_LEVEL_JSON.get(level, "null")}, "text": {encode(line)}}}\n')
+        return "".join(records)
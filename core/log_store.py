@@ -0,0 +1,258 @@
+"""
+Bounded in-memory log storage that spills evicted lines to disk
+"""
+
+import os
+import time
+
+SPILL_PREFIX = "session_"
+SPILL_SUFFIX = ".log"
+
+
+def prune_spill_files(directory, max_age_days, now=None):
+    """Delete session spill files in ``directory`` older than ``max_age_days``; returns how many"""
+    if max_age_days <= 0:
+        return 0
+    cutoff = (time.time() if now is None else now) - max_age_days * 86400
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not (entry.name.startswith(SPILL_PREFIX) and entry.name.endswith(SPILL_SUFFIX)):
+            continue
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            # Still open in another instance, or already gone
+            continue
+    return removed
+
+
+class LogStore:
+    """
+    Fixed-capacity ring buffer of log lines.
+
+    Appends and indexed reads are O(1). Once the buffer is full the oldest
+    lines are written to ``spill_path`` (or dropped when no path is given), so
+    memory stays flat no matter how long the session runs. Iterating the store
+    yields the spilled lines first and then the in-memory ones.
+
+    Every line gets a session-wide number (never reused, not even after
+    clear()) that stays valid while the line is in memory or on disk. An
+    optional SearchIndex is updated with every appended line and forgets
+    lines once they leave memory.
+    """
+
+    def __init__(self, capacity=100000, spill_path=None, index=None):
+        self.capacity = max(1, int(capacity))
+        self.spill_path = spill_path
+        self._spill_base = spill_path
+        # Spill files started so far; clear() moves on to a new one
+        self._spill_generation = 0
+        self.index = index
+        self._buffer = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+        self._spill_file = None
+        self.spilled_count = 0
+        self.dropped_count = 0
+        # Number the next appended line will get
+        self.next_number = 0
+        # Number of the first line in the spill file
+        self._spill_first = None
+
+    def __len__(self):
+        """Number of lines held in memory"""
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0 or self.spilled_count > 0
+
+    def total_count(self):
+        """Number of lines held in memory or on disk"""
+        return self._size + self.spilled_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("log index out of range")
+        return self._buffer[(self._start + index) % self.capacity]
+
+    def first_number(self):
+        """Number of the oldest line held in memory"""
+        return self.next_number - self._size
+
+    def append(self, line):
+        """Append a line and return its number"""
+        if self._size == self.capacity:
+            self.evict(1)
+        self._buffer[(self._start + self._size) % self.capacity] = line
+        self._size += 1
+        self.next_number += 1
+        if self.index is not None:
+            self.index.add(self.next_number - 1, [line])
+        return self.next_number - 1
+
+    def extend(self, lines):
+        """Append lines and return the number of the first one"""
+        lines = list(lines)
+        first = self.next_number
+        if self.index is not None:
+            self.index.add(first, lines)
+        overflow = len(lines) - self.capacity
+        if overflow > 0:
+            # Lines that could never fit go straight to disk
+            self.evict(self._size)
+            self._spill(lines[:overflow], first)
+            self.next_number += overflow
+            lines = lines[overflow:]
+        room = self.capacity - self._size
+        if len(lines) > room:
+            self.evict(len(lines) - room)
+        for line in lines:
+            self._buffer[(self._start + self._size) % self.capacity] = line
+            self._size += 1
+        # Numbered last, so evict() sees the numbers of the lines it moves
+        self.next_number += len(lines)
+        return first
+
+    def evict(self, count):
+        """Move the ``count`` oldest in-memory lines to disk"""
+        count = min(count, self._size)
+        if count <= 0:
+            return
+        first = self.first_number()
+        evicted = []
+        for _ in range(count):
+            evicted.append(self._buffer[self._start])
+            self._buffer[self._start] = None
+            self._start = (self._start + 1) % self.capacity
+        self._size -= count
+        self._spill(evicted, first)
+
+    def _spill(self, lines, first):
+        if not lines:
+            return
+        if self.index is not None:
+            self._prune_index(first + len(lines))
+        if self.spill_path is None:
+            self.dropped_count += len(lines)
+            return
+        if self._spill_file is None:
+            os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            self._spill_first = first
+        self._spill_file.writelines(line + "\n" for line in lines)
+        self.spilled_count += len(lines)
+
+    def _prune_index(self, before):
+        # A prune visits every token, so it waits until a quarter of the capacity is stale
+        if before - self.index.first_number >= max(1, self.capacity // 4):
+            self.index.prune(before)
+
+    def recent(self):
+        """Iterate the in-memory lines, oldest first"""
+        for index in range(self._size):
+            yield self._buffer[(self._start + index) % self.capacity]
+
+    def iter_spilled(self):
+        """Iterate the lines that were spilled to disk, oldest first"""
+        if self._spill_file is None:
+            return
+        self._spill_file.flush()
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+    def lines_by_number(self, numbers):
+        """Yield (number, line) for ascending line numbers that are still available"""
+        first = self.first_number()
+        numbers = list(numbers)
+        on_disk = [number for number in numbers if number < first]
+        if on_disk and self._spill_first is not None and self._spill_file is not None:
+            # One sequential pass over the spill file for all requested lines
+            wanted = iter(on_disk)
+            target = next(wanted, None)
+            for number, line in enumerate(self.iter_spilled(), self._spill_first):
+                while target is not None and target < number:
+                    target = next(wanted, None)
+                if target is None:
+                    break
+                if target == number:
+                    yield number, line
+                    target = next(wanted, None)
+        for number in numbers:
+            if number >= first and number < self.next_number:
+                yield number, self._buffer[(self._start + number - first) % self.capacity]
+
+    def __iter__(self):
+        yield from self.iter_spilled()
+        yield from self.recent()
+
+    def snapshot(self):
+        """
+        Freeze the current contents for reading on another thread.
+
+        Only the in-memory lines are copied (as references); spilled lines
+        are read back from the spill file, which only ever grows.
+        """
+        spill_path = None
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            spill_path = self.spill_path
+        return LogSnapshot(spill_path, self._spill_first, self.spilled_count, list(self.recent()),
+                           self.first_number())
+
+    def clear(self):
+        """Drop every line, including the spill file (later lines spill to a new file)"""
+        self._buffer = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+        self.spilled_count = 0
+        self.dropped_count = 0
+        self._spill_first = None
+        if self.index is not None:
+            self.index.clear()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                # Still open elsewhere, e.g. by an export on Windows
+                pass
+            # Later lines never go to the old file, so a reader of it keeps its numbering
+            self._spill_generation += 1
+            root, extension = os.path.splitext(self._spill_base)
+            self.spill_path = f"{root}_{self._spill_generation}{extension}"
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+
+class LogSnapshot:
+    """Lines of a LogStore at one point in time, iterated as (number, line)"""
+
+    def __init__(self, spill_path, spill_first, spilled_count, lines, first_number):
+        self.spill_path = spill_path
+        self.spill_first = spill_first
+        self.spilled_count = spilled_count if spill_path is not None else 0
+        self.lines = lines
+        self.first_number = first_number
+
+    def __len__(self):
+        return self.spilled_count + len(self.lines)
+
+    def __iter__(self):
+        if self.spilled_count:
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                for number, line in zip(range(self.spill_first, self.spill_first + self.spilled_count), f):
+                    yield number, line.rstrip("\n")
+        yield from enumerate(self.lines, self.first_number)
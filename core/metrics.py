@@ -0,0 +1,118 @@
+"""
+Background system metrics sampler
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+MetricsSnapshot = namedtuple("MetricsSnapshot", [
+    "timestamp",        # time.time() of the reading
+    "cpu_percent",      # CPU utilisation since the previous reading
+    "memory_percent",   # Physical memory in use
+    "disk_read_rate",   # Bytes/s read across all disks
+    "disk_write_rate",  # Bytes/s written across all disks
+    "net_sent_rate",    # Bytes/s sent across all interfaces
+    "net_recv_rate",    # Bytes/s received across all interfaces
+])
+
+
+class MetricsSampler:
+    """
+    Samples CPU, memory, disk and network counters on a daemon thread.
+
+    Every reading is delta-based (no ``interval=`` sleeps inside psutil), and
+    the result is published as an immutable snapshot. Readers call
+    :meth:`latest` and never wait for a counter. When psutil is not installed
+    the sampler stays idle and :meth:`latest` returns None.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        try:
+            import psutil
+            self._psutil = psutil
+        except ImportError:
+            self._psutil = None
+
+    @property
+    def available(self):
+        return self._psutil is not None
+
+    def latest(self):
+        """Return the most recent MetricsSnapshot (or None before the first one)"""
+        return self._snapshot
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` from the sampler thread after each reading"""
+        self._listeners.append(callback)
+
+    def start(self):
+        if not self.available or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _counters(self):
+        psutil = self._psutil
+        disk = net = None
+        try:
+            disk = psutil.disk_io_counters()
+        except (OSError, RuntimeError):
+            pass
+        try:
+            net = psutil.net_io_counters()
+        except (OSError, RuntimeError):
+            pass
+        return time.monotonic(), disk, net
+
+    def _run(self):
+        psutil = self._psutil
+        # Prime the CPU and I/O baselines; the first real reading is one interval later
+        psutil.cpu_percent(interval=None)
+        previous = self._counters()
+
+        while not self._stop.wait(self.interval):
+            try:
+                current = self._counters()
+                elapsed = max(current[0] - previous[0], 1e-6)
+                disk_read = disk_write = net_sent = net_recv = 0.0
+                if current[1] is not None and previous[1] is not None:
+                    disk_read = max(0, current[1].read_bytes - previous[1].read_bytes) / elapsed
+                    disk_write = max(0, current[1].write_bytes - previous[1].write_bytes) / elapsed
+                if current[2] is not None and previous[2] is not None:
+                    net_sent = max(0, current[2].bytes_sent - previous[2].bytes_sent) / elapsed
+                    net_recv = max(0, current[2].bytes_recv - previous[2].bytes_recv) / elapsed
+                previous = current
+
+                snapshot = MetricsSnapshot(
+                    timestamp=time.time(),
+                    cpu_percent=psutil.cpu_percent(interval=None),
+                    memory_percent=psutil.virtual_memory().percent,
+                    disk_read_rate=disk_read,
+                    disk_write_rate=disk_write,
+                    net_sent_rate=net_sent,
+                    net_recv_rate=net_recv,
+                )
+            except Exception:
+                # A transient counter failure must not kill the sampler
+                continue
+
+            # Publishing a new tuple is a single reference swap
+            self._snapshot = snapshot
+            for callback in list(self._listeners):
+                try:
+                    callback(snapshot)
+                except Exception:
+                    pass
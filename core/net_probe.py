@@ -0,0 +1,406 @@
+"""
+Concurrent network probes on asyncio
+
+Every probe (DNS resolution, TCP connect, reachability of a host or of the
+default gateway) runs as its own task, so a dead network costs the time of
+the slowest probe instead of the sum of all of them. Each attempt has its own deadline and
+every probe makes ``count`` attempts; results are latency samples, so a
+report shows loss and a latency distribution instead of raw ping text.
+
+Reachability uses ICMP echo where the system allows it without
+administrator rights (IcmpSendEcho on Windows, datagram ICMP sockets on
+Linux and macOS) and a UDP probe otherwise: a datagram sent to a closed
+port comes back as "port unreachable", which proves the host answered.
+
+Targets are plain hosts and ports, so the engine can be pointed at local
+stand-in servers:
+
+    engine = ProbeEngine([Probe(KIND_TCP, "127.0.0.1", 8080)], count=3, timeout=0.5)
+    for result in engine.run():
+        print(result.label, result.received, result.median())
+"""
+
+import os
+import sys
+import time
+import socket
+import struct
+import asyncio
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+KIND_DNS = "dns"
+KIND_TCP = "tcp"
+KIND_PING = "ping"
+KIND_GATEWAY = "gateway"
+
+METHOD_ICMP = "icmp"
+METHOD_UDP = "udp"
+
+DEFAULT_COUNT = 4
+DEFAULT_TIMEOUT = 2.0
+
+# Seconds between the attempts of one probe
+INTERVAL = 0.2
+
+# Destination port of UDP reachability probes (the traceroute range, normally closed)
+UDP_PROBE_PORT = 33434
+
+_PAYLOAD = b"pc-troubleshooter-probe"
+
+# Threads for blocking calls (name resolution, IcmpSendEcho)
+_BLOCKING_WORKERS = 16
+
+
+class Probe:
+    """One check: ``kind`` is KIND_DNS, KIND_TCP, KIND_PING or KIND_GATEWAY"""
+
+    def __init__(self, kind, host, port=None):
+        self.kind = kind
+        self.host = host
+        self.port = port
+
+    @property
+    def label(self):
+        if self.port is None:
+            return self.host
+        return f"[{self.host}]:{self.port}" if ":" in self.host else f"{self.host}:{self.port}"
+
+
+def parse_target(text, default_port=None):
+    """(host, port) of ``host``, ``host:port`` or ``[v6 address]:port``"""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else None
+    elif text.count(":") == 1:
+        host, port = text.split(":")
+    else:
+        host, port = text, None
+    return host, (int(port) if port else default_port)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    return ordered[int(rank) - 1]
+
+
+class ProbeResult:
+    """Latency samples (seconds) and errors of one probe"""
+
+    def __init__(self, probe):
+        self.probe = probe
+        self.samples = []
+        self.sent = 0
+        # How reachability was measured (METHOD_ICMP or METHOD_UDP)
+        self.method = None
+        # Resolved address the attempts went to
+        self.address = None
+        self.error = None
+
+    @property
+    def label(self):
+        return self.probe.label
+
+    @property
+    def received(self):
+        return len(self.samples)
+
+    @property
+    def loss_percent(self):
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 100.0
+
+    def minimum(self):
+        return min(self.samples) if self.samples else None
+
+    def median(self):
+        return percentile(self.samples, 0.5) if self.samples else None
+
+    def p90(self):
+        return percentile(self.samples, 0.9) if self.samples else None
+
+    def maximum(self):
+        return max(self.samples) if self.samples else None
+
+    def to_dict(self):
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+        return {
+            "kind": self.probe.kind,
+            "target": self.label,
+            "address": self.address,
+            "method": self.method,
+            "sent": self.sent,
+            "received": self.received,
+            "loss_percent": round(self.loss_percent, 1),
+            "min_ms": ms(self.minimum()),
+            "median_ms": ms(self.median()),
+            "p90_ms": ms(self.p90()),
+            "max_ms": ms(self.maximum()),
+            "error": self.error,
+        }
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident, sequence):
+    header = struct.pack("!BBHHH", 8, 0, 0, ident, sequence)
+    return struct.pack("!BBHHH", 8, 0, _checksum(header + _PAYLOAD), ident, sequence) + _PAYLOAD
+
+
+def _icmp_socket():
+    """Unprivileged ICMP socket, or None where the system does not allow one"""
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except (OSError, AttributeError):
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+def _windows_icmp_echo(address, timeout):
+    """Round-trip seconds of one IcmpSendEcho, or None without a reply (blocking)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class IpOptionInformation(ctypes.Structure):
+        _fields_ = [("Ttl", ctypes.c_ubyte), ("Tos", ctypes.c_ubyte), ("Flags", ctypes.c_ubyte),
+                    ("OptionsSize", ctypes.c_ubyte), ("OptionsData", ctypes.c_void_p)]
+
+    class IcmpEchoReply(ctypes.Structure):
+        _fields_ = [("Address", wintypes.ULONG), ("Status", wintypes.ULONG), ("RoundTripTime", wintypes.ULONG),
+                    ("DataSize", wintypes.USHORT), ("Reserved", wintypes.USHORT), ("Data", ctypes.c_void_p),
+                    ("Options", IpOptionInformation)]
+
+    iphlpapi = ctypes.windll.iphlpapi
+    iphlpapi.IcmpCreateFile.restype = wintypes.HANDLE
+    iphlpapi.IcmpSendEcho.argtypes = [wintypes.HANDLE, wintypes.ULONG, ctypes.c_void_p, wintypes.WORD,
+                                      ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD]
+    iphlpapi.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+    handle = iphlpapi.IcmpCreateFile()
+    if handle in (None, wintypes.HANDLE(-1).value):
+        raise OSError("IcmpCreateFile failed")
+    try:
+        reply = ctypes.create_string_buffer(ctypes.sizeof(IcmpEchoReply) + len(_PAYLOAD) + 8)
+        # IPAddr is the address in network byte order as laid out in memory
+        destination = struct.unpack("=L", socket.inet_aton(address))[0]
+        started = time.perf_counter()
+        count = iphlpapi.IcmpSendEcho(handle, destination, _PAYLOAD, len(_PAYLOAD), None, reply,
+                                      len(reply), max(1, int(timeout * 1000)))
+        elapsed = time.perf_counter() - started
+        if not count or IcmpEchoReply.from_buffer(reply).Status != 0:
+            return None
+        return elapsed
+    finally:
+        iphlpapi.IcmpCloseHandle(handle)
+
+
+def icmp_method():
+    """METHOD_ICMP when echo requests can be sent without administrator rights here, else METHOD_UDP"""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            ctypes.windll.iphlpapi
+        except (ImportError, OSError, AttributeError):
+            return METHOD_UDP
+        return METHOD_ICMP
+    sock = _icmp_socket()
+    if sock is None:
+        return METHOD_UDP
+    sock.close()
+    return METHOD_ICMP
+
+
+class ProbeEngine:
+    """
+    Runs probes concurrently on an event loop of its own.
+
+    Each probe makes ``count`` attempts, ``INTERVAL`` apart, and each attempt
+    is abandoned after ``timeout`` seconds. ``method`` forces METHOD_ICMP or
+    METHOD_UDP for reachability probes; by default ICMP is used where allowed.
+    ``is_cancelled`` is polled before each attempt; a cancelled probe stops
+    with the attempts it made.
+    """
+
+    def __init__(self, probes, count=DEFAULT_COUNT, timeout=DEFAULT_TIMEOUT, method=None, is_cancelled=None):
+        self.probes = list(probes)
+        self.count = max(1, int(count))
+        self.timeout = max(0.01, float(timeout))
+        self.method = method
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.duration = 0.0
+        self._executor = None
+        self._sequence = 0
+
+    def run(self):
+        """Run every probe and return their ProbeResults in order"""
+        started = time.perf_counter()
+        # A resolver call that outlives its deadline must not hold up the end of the run
+        self._executor = ThreadPoolExecutor(max_workers=_BLOCKING_WORKERS)
+        try:
+            return asyncio.run(self._run_all())
+        finally:
+            self._executor.shutdown(wait=False)
+            self.duration = time.perf_counter() - started
+
+    async def _run_all(self):
+        if self.method is None and any(probe.kind in (KIND_PING, KIND_GATEWAY) for probe in self.probes):
+            self.method = icmp_method()
+        return list(await asyncio.gather(*(self._run_probe(probe) for probe in self.probes)))
+
+    async def _blocking(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _run_probe(self, probe):
+        result = ProbeResult(probe)
+        if probe.kind == KIND_DNS:
+            attempt = self._resolve_attempt
+        else:
+            try:
+                result.address = await self._resolve(probe)
+            except (OSError, asyncio.TimeoutError) as e:
+                result.error = f"could not resolve {probe.host}: {_describe(e)}"
+                return result
+            if probe.kind == KIND_TCP:
+                attempt = self._connect_attempt
+            else:
+                result.method = self.method
+                attempt = self._echo_attempt if self.method == METHOD_ICMP else self._udp_attempt
+        for number in range(self.count):
+            if number:
+                await asyncio.sleep(INTERVAL)
+            if self.is_cancelled():
+                break
+            result.sent += 1
+            try:
+                elapsed = await asyncio.wait_for(attempt(probe, result), self.timeout)
+            except asyncio.TimeoutError:
+                result.error = f"no reply within {self.timeout:g} s"
+                continue
+            except OSError as e:
+                result.error = _describe(e)
+                continue
+            if elapsed is None:
+                result.error = f"no reply within {self.timeout:g} s"
+            else:
+                result.samples.append(elapsed)
+        return result
+
+    async def _resolve(self, probe):
+        """First address of a probe's host, within one timeout"""
+        infos = await asyncio.wait_for(
+            self._blocking(socket.getaddrinfo, probe.host, probe.port, 0, socket.SOCK_STREAM), self.timeout)
+        return infos[0][4][0]
+
+    async def _resolve_attempt(self, probe, result):
+        started = time.perf_counter()
+        infos = await self._blocking(socket.getaddrinfo, probe.host, None, 0, socket.SOCK_STREAM)
+        elapsed = time.perf_counter() - started
+        result.address = infos[0][4][0]
+        return elapsed
+
+    async def _connect_attempt(self, probe, result):
+        family = socket.AF_INET6 if ":" in result.address else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.setblocking(False)
+            started = time.perf_counter()
+            await asyncio.get_running_loop().sock_connect(sock, (result.address, probe.port))
+            return time.perf_counter() - started
+
+    async def _udp_attempt(self, probe, result):
+        loop = asyncio.get_running_loop()
+        family = socket.AF_INET6 if ":" in result.address else socket.AF_INET
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.connect((result.address, probe.port or UDP_PROBE_PORT))
+            started = time.perf_counter()
+            try:
+                await loop.sock_sendall(sock, _PAYLOAD)
+                await loop.sock_recv(sock, 512)
+            except (ConnectionRefusedError, ConnectionResetError):
+                # "Port unreachable": the host itself answered
+                pass
+            return time.perf_counter() - started
+
+    async def _echo_attempt(self, probe, result):
+        if ":" in result.address:
+            # ICMPv6 is not implemented; the UDP probe works for both families
+            result.method = METHOD_UDP
+            return await self._udp_attempt(probe, result)
+        if sys.platform == "win32":
+            return await self._blocking(_windows_icmp_echo, result.address, self.timeout)
+        sock = _icmp_socket()
+        if sock is None:
+            result.method = METHOD_UDP
+            return await self._udp_attempt(probe, result)
+        loop = asyncio.get_running_loop()
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        sequence = self._sequence
+        with sock:
+            sock.connect((result.address, 0))
+            started = time.perf_counter()
+            # The kernel replaces the identifier with the socket's own
+            await loop.sock_sendall(sock, _echo_request(os.getpid() & 0xFFFF, sequence))
+            while True:
+                reply = await loop.sock_recv(sock, 1024)
+                if len(reply) >= 20 and reply[0] >> 4 == 4:
+                    # macOS includes the IP header
+                    reply = reply[(reply[0] & 0x0F) * 4:]
+                if len(reply) >= 8 and reply[0] == 0 and struct.unpack("!H", reply[6:8])[0] == sequence:
+                    return time.perf_counter() - started
+
+
+def _describe(error):
+    if isinstance(error, asyncio.TimeoutError):
+        return "timed out"
+    if isinstance(error, ConnectionRefusedError):
+        return "connection refused"
+    if isinstance(error, socket.gaierror):
+        return error.strerror or str(error)
+    return error.strerror or str(error) or type(error).__name__
+
+
+def default_gateways():
+    """IPv4 addresses of the default gateways"""
+    gateways = []
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/net/route", "r") as f:
+                for line in f.readlines()[1:]:
+                    fields = line.split()
+                    if len(fields) > 2 and fields[1] == "00000000" and fields[2] != "00000000":
+                        gateways.append(socket.inet_ntoa(struct.pack("<L", int(fields[2], 16))))
+        except (OSError, ValueError):
+            pass
+    else:
+        command = ["route", "print", "-4", "0.0.0.0"] if sys.platform == "win32" else ["route", "-n", "get", "default"]
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=5,
+                                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)).stdout
+        except (OSError, subprocess.SubprocessError):
+            output = ""
+        for line in output.splitlines():
+            fields = line.split()
+            if sys.platform == "win32" and len(fields) >= 3 and fields[:2] == ["0.0.0.0", "0.0.0.0"]:
+                gateways.append(fields[2])
+            elif len(fields) == 2 and fields[0] == "gateway:":
+                gateways.append(fields[1])
+    valid = []
+    for gateway in gateways:
+        try:
+            socket.inet_aton(gateway)
+        except OSError:
+            # "On-link" routes have no gateway
+            continue
+        if gateway not in valid:
+            valid.append(gateway)
+    return valid
@@ -0,0 +1,154 @@
+"""
+Chunked, incrementally decoded output pipeline for script processes
+"""
+
+import os
+import codecs
+import locale
+import queue
+import threading
+import time
+
+# Raw bytes requested per read from the child's stdout pipe
+READ_CHUNK_SIZE = 64 * 1024
+
+# A batch is handed to the consumer every BATCH_INTERVAL seconds or as soon
+# as BATCH_MAX_BYTES of output are pending, whichever comes first
+BATCH_INTERVAL = 0.05
+BATCH_MAX_BYTES = 64 * 1024
+
+
+def console_encoding():
+    """Return the code page console programs use when writing to a pipe"""
+    if os.name == "nt":
+        try:
+            import ctypes
+            # cmd.exe and most console tools write the OEM code page (e.g. cp437,
+            # cp850) when stdout is redirected, not the ANSI one Python defaults to
+            encoding = f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+            codecs.lookup(encoding)
+            return encoding
+        except (AttributeError, OSError, LookupError):
+            pass
+    return locale.getpreferredencoding(False) or "utf-8"
+
+
+class LineBatcher:
+    """Decodes raw byte chunks into lines and groups them into batches"""
+
+    def __init__(self, encoding=None, interval=BATCH_INTERVAL, max_bytes=BATCH_MAX_BYTES, clock=time.monotonic):
+        self.encoding = encoding or console_encoding()
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        self._clock = clock
+        self._partial = ""
+        self._lines = []
+        self._pending_bytes = 0
+        self._last_flush = clock()
+        self.total_lines = 0
+        self.total_bytes = 0
+
+    def feed(self, chunk):
+        """Decode a chunk and buffer the complete lines it contains"""
+        self.total_bytes += len(chunk)
+        self._pending_bytes += len(chunk)
+        self._split(self._decoder.decode(chunk))
+
+    def _split(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._lines.append(self._collapse(line))
+
+        # A tool that never prints a newline must not grow the partial line forever
+        if len(self._partial) >= self.max_bytes:
+            self._lines.append(self._collapse(self._partial))
+            self._partial = ""
+
+    @staticmethod
+    def _collapse(line):
+        """Apply carriage-return overwrites (sfc/DISM progress) and trim"""
+        line = line.rstrip("\r")
+        if "\r" in line:
+            segments = [segment for segment in line.split("\r") if segment.strip()]
+            line = segments[-1] if segments else ""
+        return line.strip()
+
+    def has_pending(self):
+        return bool(self._lines)
+
+    def time_until_due(self):
+        """Seconds until the pending lines should be flushed"""
+        return max(0.0, self.interval - (self._clock() - self._last_flush))
+
+    def due(self):
+        """True when pending lines should be handed to the consumer"""
+        if not self._lines:
+            return False
+        return self._pending_bytes >= self.max_bytes or self.time_until_due() == 0.0
+
+    def take(self):
+        """Return and clear the pending batch of lines"""
+        batch = self._lines
+        self._lines = []
+        self._pending_bytes = 0
+        self._last_flush = self._clock()
+        self.total_lines += len(batch)
+        return batch
+
+    def finish(self):
+        """Flush the decoder and any unterminated last line"""
+        self._split(self._decoder.decode(b"", final=True))
+        if self._partial:
+            self._lines.append(self._collapse(self._partial))
+            self._partial = ""
+        return self.take()
+
+
+def stream_batches(stream, batcher=None, chunk_size=READ_CHUNK_SIZE, idle_interval=None):
+    """
+    Yield lists of lines read from a binary stream in large chunks.
+
+    Reads happen on a helper thread so a batch is flushed on time even while
+    the child is silent and the read is blocked. With ``idle_interval`` an
+    empty batch is yielded whenever the stream stays silent that long, so
+    the consumer can keep time-based progress moving.
+    """
+    batcher = batcher or LineBatcher()
+    chunks = queue.Queue()
+
+    def reader():
+        read = getattr(stream, "read1", stream.read)
+        try:
+            while True:
+                chunk = read(chunk_size)
+                if not chunk:
+                    break
+                chunks.put(chunk)
+        except (OSError, ValueError):
+            # Pipe closed underneath us (process killed)
+            pass
+        finally:
+            chunks.put(None)
+
+    threading.Thread(target=reader, name="output-reader", daemon=True).start()
+
+    while True:
+        timeout = batcher.time_until_due() if batcher.has_pending() else idle_interval
+        try:
+            chunk = chunks.get(timeout=timeout)
+        except queue.Empty:
+            chunk = b""
+        if chunk is None:
+            break
+        if chunk:
+            batcher.feed(chunk)
+        if batcher.due():
+            yield batcher.take()
+        elif not chunk and not batcher.has_pending():
+            yield []
+
+    final = batcher.finish()
+    if final:
+        yield final
@@ -0,0 +1,208 @@
+"""
+Process-isolated execution backend
+
+With ``execution_backend = process`` every tool is supervised by a worker
+process instead of a thread of the GUI process. The worker runs the usual
+ScriptExecution - reading the child's pipe, decoding, collapsing and
+batching its output - and sends whole batches back over a one-way
+multiprocessing pipe. The GUI side drains everything pending in one bulk
+read at most every DRAIN_INTERVAL seconds, so however chatty a script is
+the GUI process handles a bounded number of messages per second. When the
+GUI falls behind, the pipe fills and the worker (and through its stdout
+pipe, the script) waits instead of output piling up in the GUI process.
+
+Cache lookups and run history stay in the GUI process; the worker only
+runs the tool. Warm shell hosts belong to the GUI process, so isolated
+runs always start the script (or native collector) themselves.
+"""
+
+import time
+import threading
+import multiprocessing
+
+from core.catalog import ManifestError, get_catalog
+from core.collectors import get_collector
+from core.durations import DurationModel
+from core.execution import MODE_SCRIPT, ExecutionResult, ScriptExecution
+from core.process_tree import GRACE_PERIOD, ProcessTree
+
+# Messages sent from the worker: (kind, payload)
+OUTPUT = "output"
+PROGRESS = "progress"
+ETA = "eta"
+REPORT = "report"
+PHASE = "phase"
+RESULT = "result"
+
+# Minimum seconds between two bulk reads of a worker's pipe
+DRAIN_INTERVAL = 0.1
+
+# Lines handed to the consumer per bulk read; the rest waits for the next one
+DRAIN_MAX_LINES = 5000
+
+# Seconds a cancelled worker gets to stop its script's tree before it is terminated
+CANCEL_GRACE = GRACE_PERIOD + 2.0
+
+
+def _watch_cancel(cancel_event, execution):
+    cancel_event.wait()
+    execution.cancel()
+
+
+def _worker_main(conn, cancel_event, script_path, script_name, native, stats_path):
+    """Entry point of a worker process: run one tool and stream its output back"""
+    durations = None
+    if stats_path:
+        # Read-only copy for progress estimates; the GUI process records the run
+        try:
+            catalog = get_catalog()
+        except ManifestError:
+            catalog = None
+        durations = DurationModel(stats_path, catalog=catalog)
+
+    send_lock = threading.Lock()
+
+    def send(kind, payload):
+        with send_lock:
+            conn.send((kind, payload))
+
+    execution = ScriptExecution(
+        script_path, script_name, get_collector(script_path) if native else None,
+        on_output=lambda lines: send(OUTPUT, lines),
+        on_progress=lambda value: send(PROGRESS, value),
+        on_report=lambda report: send(REPORT, report),
+        durations=durations,
+        on_eta=lambda seconds: send(ETA, seconds),
+        on_phase=lambda name: send(PHASE, name),
+    )
+    threading.Thread(target=_watch_cancel, args=(cancel_event, execution), daemon=True).start()
+
+    execution.started = time.monotonic()
+    result = execution.run_live()
+    send(RESULT, result)
+    conn.close()
+
+
+class ProcessExecution(ScriptExecution):
+    """
+    ScriptExecution whose live run happens in a worker process.
+
+    ``native`` asks the worker to use the script's native collector;
+    ``stats_path`` lets it load the run history for progress estimates.
+    Callbacks are invoked on the calling thread, once per bulk read.
+    """
+
+    def __init__(self, script_path, script_name, native=False, stats_path=None, **kwargs):
+        super().__init__(script_path, script_name, **kwargs)
+        self.native = native
+        self.stats_path = stats_path
+        self.worker = None
+        self._cancel_event = None
+
+    def cancel(self):
+        """Ask the worker to stop its script's tree; it is terminated if it doesn't stop in time"""
+        self.cancelled = True
+        event = self._cancel_event
+        if event is not None:
+            event.set()
+
+    def run_live(self):
+        # Spawn, never fork: the GUI process has Qt and worker threads running
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self._cancel_event = context.Event()
+        if self.cancelled:
+            self._cancel_event.set()
+        self.worker = context.Process(
+            target=_worker_main, name=f"tool-{self.tool}", daemon=True,
+            args=(sender, self._cancel_event, self.script_path, self.script_name, self.native, self.stats_path))
+        try:
+            self.worker.start()
+        except (OSError, ValueError) as e:
+            receiver.close()
+            sender.close()
+            return self._error(e, MODE_SCRIPT)
+        # Only the worker writes; closing our end lets recv() see EOF if it dies
+        sender.close()
+
+        try:
+            return self._pump(receiver)
+        finally:
+            receiver.close()
+            self._reap()
+
+    def _pump(self, receiver):
+        """Forward the worker's messages in bulk until its result arrives"""
+        cancel_deadline = None
+        last_drain = 0.0
+        while True:
+            if self.cancelled and cancel_deadline is None:
+                cancel_deadline = time.monotonic() + CANCEL_GRACE
+            if cancel_deadline is not None and time.monotonic() > cancel_deadline:
+                # Take the worker's script tree down with it
+                ProcessTree(self.worker.pid).kill()
+                self.worker.terminate()
+                return self._finish(None, MODE_SCRIPT)
+
+            # Rate limit: a chatty worker is read in bulk, not message by message
+            wait = last_drain + DRAIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                if not receiver.poll(DRAIN_INTERVAL):
+                    if not self.worker.is_alive() and not receiver.poll(0):
+                        return self._lost()
+                    continue
+                last_drain = time.monotonic()
+                lines = []
+                progress = eta = phase = result = None
+                while len(lines) < DRAIN_MAX_LINES and receiver.poll(0):
+                    kind, payload = receiver.recv()
+                    if kind == OUTPUT:
+                        lines.extend(payload)
+                    elif kind == PROGRESS:
+                        progress = payload
+                    elif kind == ETA:
+                        eta = payload
+                    elif kind == PHASE:
+                        phase = payload
+                    elif kind == REPORT:
+                        self.on_report(payload)
+                    elif kind == RESULT:
+                        result = payload
+                        break
+            except (EOFError, OSError):
+                return self._lost()
+
+            # One callback of each kind per drain, latest values only
+            self._emit(lines)
+            if progress is not None:
+                self.on_progress(progress)
+            if eta is not None:
+                self.on_eta(eta)
+            if phase is not None:
+                self.phase = phase
+                self.on_phase(phase)
+            if result is not None:
+                if self.cancelled:
+                    # Cancelled or timed out here, whatever the worker made of it
+                    return self._finish(result.return_code, result.mode)
+                return result
+
+    def _lost(self):
+        """Result for a worker that exited without reporting one"""
+        if self.cancelled:
+            return self._finish(None, MODE_SCRIPT)
+        self.worker.join(1.0)
+        return ExecutionResult(self.script_name, False,
+                               f"💥 {self.script_name} worker process exited unexpectedly "
+                               f"(exit code {self.worker.exitcode})", self.worker.exitcode, MODE_SCRIPT)
+
+    def _reap(self):
+        worker = self.worker
+        if worker is None:
+            return
+        worker.join(1.0)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join(1.0)
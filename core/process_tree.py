@@ -0,0 +1,101 @@
+"""
+Stopping a tool's whole process tree
+
+Scripts run through a shell that starts further processes (powershell,
+sfc, DISM, netsh). Killing only the shell leaves those running and, since
+they inherit its stdout, keeps the output pipe open. Tools are therefore
+started in their own process group / session, and stopped in two steps:
+a polite request to the whole tree, then after a grace period a forced
+kill of whatever is left.
+
+With psutil the tree's members are snapshotted up front, so children
+survive neither their parent's exit nor an escape from the group.
+Without it, ``taskkill /T`` (Windows) or the process group (elsewhere)
+does the work.
+"""
+
+import os
+import signal
+import subprocess
+
+# Seconds between the polite request and the forced kill
+GRACE_PERIOD = 3.0
+
+
+def new_group_options():
+    """Popen keyword arguments starting the child in its own process group / session"""
+    if os.name == "nt":
+        return {"creationflags": getattr(subprocess, "CREATE_NO_WINDOW", 0)
+                | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+    return {"start_new_session": True}
+
+
+def _taskkill(pid, force):
+    command = ["taskkill", "/T", "/PID", str(pid)]
+    if force:
+        command.insert(1, "/F")
+    try:
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10,
+                       creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+def _signal_group(pid, sig):
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+class ProcessTree:
+    """A process and its descendants at the time the tree was created"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self._members = self._snapshot(pid)
+
+    @staticmethod
+    def _snapshot(pid):
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def alive(self):
+        """Members still running; None when that cannot be told (no psutil)"""
+        if self._members is None:
+            return None
+        return [process for process in self._members if process.is_running()]
+
+    def _each(self, method):
+        import psutil
+        for process in self._members:
+            try:
+                getattr(process, method)()
+            except psutil.Error:
+                pass
+
+    def stop(self):
+        """Politely ask every member to exit"""
+        if os.name == "nt":
+            # Closes windowed tools; console tools only stop when forced
+            _taskkill(self.pid, force=False)
+        else:
+            _signal_group(self.pid, signal.SIGTERM)
+            if self._members is not None:
+                self._each("terminate")
+
+    def kill(self):
+        """Forcefully kill every member still running"""
+        if self._members is not None:
+            self._each("kill")
+        elif os.name == "nt":
+            _taskkill(self.pid, force=True)
+        if os.name != "nt":
+            _signal_group(self.pid, signal.SIGKILL)
@@ -0,0 +1,49 @@
+"""
+In-band progress protocol for tool scripts
+
+A script can report its real progress by printing directive lines:
+
+    ##pct 40
+    ##phase "DISM health check"
+
+``##pct`` takes a percentage (0-100), ``##phase`` a name, quoted or not.
+Directives are taken out of the output before it reaches the console,
+the logs or the result cache. Lines starting with ``##`` that are not
+well-formed directives are passed through as ordinary output.
+"""
+
+import re
+
+DIRECTIVE_PREFIX = "##"
+
+_DIRECTIVE = re.compile(r'##(pct|phase)\s+(?:"([^"]*)"|(\S.*?))\s*$')
+
+
+def split_directives(lines):
+    """
+    Separate directives from a batch of output lines.
+
+    Returns (output lines, last percentage or None, phase names in order).
+    A batch without directives costs one prefix check per line.
+    """
+    if not any(line.startswith(DIRECTIVE_PREFIX) for line in lines):
+        return lines, None, []
+
+    output = []
+    percent = None
+    phases = []
+    for line in lines:
+        match = _DIRECTIVE.match(line) if line.startswith(DIRECTIVE_PREFIX) else None
+        if match is None:
+            output.append(line)
+            continue
+        name = match.group(1)
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        if name == "pct":
+            try:
+                percent = min(100, max(0, int(float(value))))
+            except (ValueError, OverflowError):
+                output.append(line)
+        else:
+            phases.append(value.strip())
+    return output, percent, phases
@@ -0,0 +1,178 @@
+"""
+Short-lived cache of read-only diagnostic results
+
+Read-only tools (device lists, disk space, startup entries) are replayed
+from here instead of re-running their WMI/PowerShell queries. An entry is
+keyed by the tool, a hash of its script and a fingerprint of the system
+state it depends on, expires after the tool's TTL, and is dropped as soon
+as a tool that changes one of the resources it reads has run. TTLs,
+read-only flags and resources come from the tool catalog (tools.json).
+"""
+
+import os
+import time
+import socket
+import hashlib
+import threading
+
+from core.catalog import get_catalog
+
+
+def _mounted_volumes():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return tuple(sorted(partition.mountpoint for partition in psutil.disk_partitions(all=False)))
+
+
+# Resource -> probe whose value changes when cached output would be stale
+FINGERPRINTS = {
+    "filesystem": _mounted_volumes,
+}
+
+
+def _boot_time():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return int(psutil.boot_time())
+
+
+def system_fingerprint(resources=()):
+    """Hash of the host, the boot and the probes of the given resources"""
+    parts = [socket.gethostname(), os.environ.get("USERNAME") or os.environ.get("USER", ""), _boot_time()]
+    for resource in sorted(resources):
+        probe = FINGERPRINTS.get(resource)
+        if probe is not None:
+            parts.append((resource, probe()))
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def script_hash(script_path):
+    """SHA-256 of the script file, or None if it cannot be read"""
+    try:
+        with open(script_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def format_age(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    return f"{seconds // 60} min {seconds % 60:02d} s"
+
+
+class CachedResult:
+    """Output and outcome of one cached run"""
+
+    def __init__(self, key, lines, success, message, return_code, mode, resources, ttl, created=None):
+        self.key = key
+        self.lines = list(lines)
+        self.success = success
+        self.message = message
+        self.return_code = return_code
+        self.mode = mode
+        self.resources = set(resources)
+        self.ttl = ttl
+        self.created = time.time() if created is None else created
+
+    def age(self, now=None):
+        return (time.time() if now is None else now) - self.created
+
+    def expired(self, now=None):
+        return self.age(now) >= self.ttl
+
+
+class ResultCache:
+    """Thread-safe TTL cache of read-only tool results"""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_catalog()
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Bumped whenever entries are invalidated; a run that overlapped one must not be stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def policy(self, script_path):
+        """Return (ttl, resources) for a cacheable tool, or None"""
+        spec = self.catalog.by_script(script_path)
+        if spec is None or not spec.cacheable:
+            return None
+        return spec.cache_ttl, spec.resources
+
+    def key(self, script_path):
+        """Cache key for a tool in the current system state, or None if it is not cacheable"""
+        policy = self.policy(script_path)
+        if policy is None:
+            return None
+        digest = script_hash(script_path)
+        if digest is None:
+            return None
+        return (os.path.basename(script_path).lower(), digest, system_fingerprint(policy[1]))
+
+    def lookup(self, key):
+        """Return a live CachedResult for the key, or None"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expired():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def store(self, key, lines, result, generation=None):
+        """
+        Cache a successful ExecutionResult and its output.
+
+        ``generation`` is the cache's generation when the run started; if
+        entries were invalidated since, the output may predate the change
+        and is not stored.
+        """
+        if key is None or not result.success or result.cancelled:
+            return
+        ttl, resources = self.policy(key[0])
+        entry = CachedResult(key, lines, result.success, result.message, result.return_code,
+                             result.mode, resources, ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            # One entry per tool: an older script or system state is stale now
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[old_key]
+            self._entries[key] = entry
+
+    def tool_ran(self, script_path):
+        """Drop entries made stale by a tool that changes system state. Returns the number dropped"""
+        spec = self.catalog.by_script(script_path)
+        if spec is not None and spec.read_only:
+            return 0
+        with self._lock:
+            self.generation += 1
+            # A tool missing from the manifest may have changed anything
+            if spec is None:
+                stale = list(self._entries)
+            else:
+                stale = [key for key, entry in self._entries.items() if entry.resources & spec.resources]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
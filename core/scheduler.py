@@ -0,0 +1,148 @@
+"""
+Dependency- and conflict-aware scheduler for running tool suites in parallel
+"""
+
+
+class SchedulerError(ValueError):
+    """Raised when a suite definition is invalid (unknown dependency or cycle)"""
+
+
+class ScheduledTask:
+    """A tool in a suite with the resource classes it touches"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(self, name, resources=(), depends_on=(), payload=None):
+        self.name = name
+        self.resources = frozenset(resources)
+        self.depends_on = frozenset(depends_on)
+        self.payload = payload
+        self.state = ScheduledTask.PENDING
+
+    def conflicts_with(self, other):
+        """Two tasks conflict when they share any resource class"""
+        return bool(self.resources & other.resources)
+
+    def __repr__(self):
+        return f"ScheduledTask({self.name!r}, state={self.state!r})"
+
+
+class SuiteScheduler:
+    """
+    Hands out tasks whose dependencies have succeeded and whose resources are free.
+
+    Tasks that share a resource class never run at the same time and start in
+    declaration order, so the declared order doubles as the tie-breaker for
+    conflicting tools. Everything else runs in parallel. When a task fails,
+    the tasks that depend on it are skipped.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self._by_name = {}
+        for task in self.tasks:
+            if task.name in self._by_name:
+                raise SchedulerError(f"Duplicate task name: {task.name}")
+            self._by_name[task.name] = task
+        self._validate()
+
+    def _validate(self):
+        """Reject unknown dependencies and dependency cycles"""
+        for task in self.tasks:
+            missing = task.depends_on - self._by_name.keys()
+            if missing:
+                raise SchedulerError(f"{task.name} depends on unknown task(s): {', '.join(sorted(missing))}")
+
+        # Kahn's algorithm: anything left over is part of a cycle
+        indegree = {task.name: len(task.depends_on) for task in self.tasks}
+        dependents = {task.name: [] for task in self.tasks}
+        for task in self.tasks:
+            for dependency in task.depends_on:
+                dependents[dependency].append(task.name)
+        ready = [name for name, count in indegree.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self.tasks):
+            cyclic = sorted(name for name, count in indegree.items() if count > 0)
+            raise SchedulerError(f"Dependency cycle between: {', '.join(cyclic)}")
+
+    def get(self, name):
+        return self._by_name[name]
+
+    def next_ready(self):
+        """Mark and return every task that may start now"""
+        held = set()
+        for task in self.tasks:
+            if task.state == ScheduledTask.RUNNING:
+                held |= task.resources
+
+        self._propagate_skips()
+
+        started = []
+        for task in self.tasks:
+            if task.state != ScheduledTask.PENDING:
+                continue
+            if not all(self._by_name[name].state == ScheduledTask.SUCCEEDED for name in task.depends_on):
+                # Still waiting on dependencies; reserving here could deadlock
+                continue
+            if not task.resources & held:
+                task.state = ScheduledTask.RUNNING
+                started.append(task)
+            # Started or blocked on a resource, the task holds its resources
+            # so later conflicting tasks cannot overtake it
+            held |= task.resources
+        return started
+
+    def _propagate_skips(self):
+        """Skip pending tasks whose dependencies failed or were skipped"""
+        changed = True
+        while changed:
+            changed = False
+            for task in self.tasks:
+                if task.state != ScheduledTask.PENDING:
+                    continue
+                if any(self._by_name[name].state in (ScheduledTask.FAILED, ScheduledTask.SKIPPED)
+                       for name in task.depends_on):
+                    task.state = ScheduledTask.SKIPPED
+                    changed = True
+
+    def mark_finished(self, name, success):
+        """Record the outcome of a running task"""
+        task = self._by_name[name]
+        if task.state != ScheduledTask.RUNNING:
+            raise SchedulerError(f"{name} is not running")
+        task.state = ScheduledTask.SUCCEEDED if success else ScheduledTask.FAILED
+
+    def cancel(self):
+        """Skip every task that has not started yet"""
+        for task in self.tasks:
+            if task.state == ScheduledTask.PENDING:
+                task.state = ScheduledTask.SKIPPED
+
+    def running(self):
+        return [task for task in self.tasks if task.state == ScheduledTask.RUNNING]
+
+    def finished_count(self):
+        """Number of tasks that will not run again (succeeded, failed or skipped)"""
+        return sum(1 for task in self.tasks
+                   if task.state not in (ScheduledTask.PENDING, ScheduledTask.RUNNING))
+
+    def is_done(self):
+        return self.finished_count() == len(self.tasks)
+
+    def summary(self):
+        """Return a {state: count} mapping for reporting"""
+        counts = {}
+        for task in self.tasks:
+            counts[task.state] = counts.get(task.state, 0) + 1
+        return counts
@@ -0,0 +1,183 @@
+"""
+Incremental full-text index over the session log
+
+Each appended line is split into lowercase word tokens once, and its
+session line number is appended to every token's posting list. Because
+line numbers only grow, posting lists stay sorted without any work and a
+query is a few dictionary lookups plus a merge or intersection of sorted
+arrays - no pass over the log however long the session gets.
+
+Every query term must occur in a line (AND). The last term also matches
+longer tokens it is a prefix of, so results follow the user's typing.
+"""
+
+import re
+import heapq
+from array import array
+from bisect import bisect_left
+
+_TOKEN = re.compile(r"\w+")
+
+# Shorter tokens are not indexed (they match nearly everything)
+MIN_TOKEN_LENGTH = 2
+
+# Most tokens a trailing prefix may expand to; more are cut off
+MAX_PREFIX_TERMS = 512
+
+# Intersections probe by binary search when one list is this many times longer
+GALLOP_RATIO = 16
+
+
+def tokenize(text):
+    """Distinct lowercase tokens of a line that are worth indexing"""
+    return {token for token in _TOKEN.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH}
+
+
+class SearchIndex:
+    """
+    Inverted index from tokens to ascending line numbers.
+
+    ``skip`` is an optional regex for a prefix every line carries (such as
+    the console's timestamp) that should not be indexed.
+    """
+
+    def __init__(self, skip=None):
+        self._skip = re.compile(skip) if skip else None
+        self._postings = {}
+        # Sorted vocabulary for prefix lookups, merged lazily with new tokens
+        self._vocabulary = []
+        self._new_tokens = []
+        self.line_count = 0
+        # Lowest line number that may still be indexed
+        self.first_number = 0
+
+    def add(self, first_number, lines):
+        """Index lines numbered consecutively from ``first_number``"""
+        postings = self._postings
+        skip = self._skip
+        if not self.line_count:
+            self.first_number = first_number
+        for number, line in enumerate(lines, first_number):
+            if skip is not None:
+                match = skip.match(line)
+                if match is not None:
+                    line = line[match.end():]
+            for token in tokenize(line):
+                numbers = postings.get(token)
+                if numbers is None:
+                    numbers = postings[token] = array("I")
+                    self._new_tokens.append(token)
+                numbers.append(number)
+            self.line_count += 1
+
+    def _terms(self, prefix):
+        """Indexed tokens starting with ``prefix``"""
+        if self._new_tokens:
+            self._new_tokens.sort()
+            self._vocabulary = list(heapq.merge(self._vocabulary, self._new_tokens))
+            self._new_tokens = []
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\uffff", start)
+        return self._vocabulary[start:min(end, start + MAX_PREFIX_TERMS)]
+
+    def search(self, query):
+        """Ascending line numbers of lines containing every term of the query"""
+        terms = _TOKEN.findall(query.lower())
+        if not terms:
+            return []
+        *exact, last = terms
+
+        lists = []
+        for term in exact:
+            numbers = self._postings.get(term)
+            if numbers is None:
+                if len(term) >= MIN_TOKEN_LENGTH:
+                    return []
+                continue
+            lists.append(numbers)
+        if len(last) >= MIN_TOKEN_LENGTH:
+            expanded = [self._postings[token] for token in self._terms(last)]
+            if not expanded:
+                return []
+            lists.append(expanded[0] if len(expanded) == 1 else array("I", _unique(heapq.merge(*expanded))))
+        if not lists:
+            return []
+        return _intersect(lists)
+
+    def prune(self, before):
+        """Forget lines numbered below ``before`` (lines the log no longer holds)"""
+        emptied = []
+        for token, numbers in self._postings.items():
+            if numbers[0] >= before:
+                continue
+            stale = bisect_left(numbers, before)
+            if stale == len(numbers):
+                emptied.append(token)
+            else:
+                del numbers[:stale]
+        for token in emptied:
+            del self._postings[token]
+        if emptied:
+            # Rebuilt from the remaining tokens on the next prefix lookup
+            self._vocabulary = []
+            self._new_tokens = list(self._postings)
+        self.line_count = max(0, self.line_count - max(0, before - self.first_number))
+        self.first_number = max(self.first_number, before)
+
+    def clear(self):
+        self._postings.clear()
+        self._vocabulary = []
+        self._new_tokens = []
+        self.line_count = 0
+
+    def __len__(self):
+        """Number of distinct tokens"""
+        return len(self._postings)
+
+
+def _unique(numbers):
+    previous = None
+    for number in numbers:
+        if number != previous:
+            yield number
+            previous = number
+
+
+def _intersect(lists):
+    """Intersection of ascending arrays, probing the longer ones by binary search"""
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for numbers in lists[1:]:
+        if len(numbers) > GALLOP_RATIO * len(result):
+            kept = []
+            low = 0
+            size = len(numbers)
+            for number in result:
+                low = bisect_left(numbers, number, low)
+                if low == size:
+                    break
+                if numbers[low] == number:
+                    kept.append(number)
+        else:
+            # Lists of similar length: a hash probe beats repeated binary searches
+            members = set(numbers)
+            kept = [number for number in result if number in members]
+        result = kept
+        if not result:
+            break
+    # Copy, so the caller's result doesn't grow with the index
+    return result[:]
+
+
+def match_spans(line, query):
+    """(start, end) spans of a line matched by the query's terms, for highlighting"""
+    terms = [term for term in _TOKEN.findall(query.lower()) if term]
+    if not terms:
+        return []
+    *exact, last = terms
+    spans = []
+    for match in _TOKEN.finditer(line):
+        token = match.group().lower()
+        if token in exact or token.startswith(last):
+            spans.append(match.span())
+    return spans
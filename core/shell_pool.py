@@ -0,0 +1,291 @@
+"""
+Pool of long-lived shell host processes
+
+Instead of paying interpreter startup for every ``powershell -Command``,
+commands are written to a warm shell's stdin and framed by an end marker
+that the shell prints with the command's exit status. The framing only
+relies on the dialect's wrap template, so any local shell (sh, bash, pwsh)
+can stand in for PowerShell in tests.
+"""
+
+import os
+import re
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+
+from core.output import console_encoding
+from core.process_tree import ProcessTree, new_group_options
+
+# Seconds between checks of the cancel flag while waiting for a busy pool
+ACQUIRE_POLL = 0.25
+
+
+class ShellHostError(RuntimeError):
+    """Raised when a shell host dies, times out or cannot be started"""
+
+
+class ShellDialect:
+    """How to launch a shell and frame one command for it"""
+
+    def __init__(self, name, argv, wrap_template):
+        self.name = name
+        self.argv = list(argv)
+        # Must print "<marker> <status>" on stdout once the command is done
+        self.wrap_template = wrap_template
+
+    def wrap(self, command, marker):
+        return self.wrap_template.format(command=command, marker=marker)
+
+
+POWERSHELL = ShellDialect(
+    "powershell",
+    ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", "-"],
+    # A native program's exit code is in $LASTEXITCODE ($? only says whether it was 0);
+    # it is reset first because the warm shell keeps it from the previous command
+    "$global:LASTEXITCODE = $null\n{command}\n$__pct_ok = $?\n"
+    "Write-Output ('{marker} ' + $(if ($null -ne $LASTEXITCODE) {{$LASTEXITCODE}} elseif ($__pct_ok) {{0}} else {{1}}))\n",
+)
+
+PWSH = ShellDialect("pwsh", ["pwsh"] + POWERSHELL.argv[1:], POWERSHELL.wrap_template)
+
+POSIX_SH = ShellDialect(
+    "sh",
+    ["sh"],
+    "{command}\nprintf '%s %s\\n' '{marker}' \"$?\"\n",
+)
+
+
+def default_dialect():
+    """PowerShell on Windows, pwsh elsewhere if installed, otherwise None"""
+    if os.name == "nt":
+        return POWERSHELL
+    if shutil.which("pwsh"):
+        return PWSH
+    return None
+
+
+class ShellResult:
+    """Output and status of one command run in a shell host"""
+
+    def __init__(self, lines, exit_code, duration):
+        self.lines = lines
+        self.exit_code = exit_code
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.exit_code == 0
+
+
+class ShellHost:
+    """One long-lived shell process that executes framed commands"""
+
+    def __init__(self, dialect, encoding=None):
+        self.dialect = dialect
+        self.encoding = encoding or console_encoding()
+        self.process = None
+        self._lines = queue.Queue()
+        self.commands_run = 0
+
+    def start(self):
+        self.process = subprocess.Popen(
+            self.dialect.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding=self.encoding,
+            errors="replace",
+            bufsize=1,
+            **new_group_options()
+        )
+        threading.Thread(target=self._read, name=f"{self.dialect.name}-host-reader", daemon=True).start()
+
+    def _read(self):
+        stdout = self.process.stdout
+        try:
+            for line in stdout:
+                self._lines.put(line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._lines.put(None)
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def execute(self, command, timeout=None, on_line=None):
+        """Run ``command`` and return a ShellResult; ``on_line`` sees output as it arrives"""
+        if not self.is_alive():
+            raise ShellHostError(f"{self.dialect.name} host is not running")
+
+        marker = f"__PCT_END_{uuid.uuid4().hex}__"
+        pattern = re.compile(r"(.*?)" + re.escape(marker) + r" (-?\d+)\s*$")
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        try:
+            self.process.stdin.write(self.dialect.wrap(command, marker))
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ShellHostError(f"{self.dialect.name} host closed its input: {e}")
+
+        lines = []
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.kill()
+                raise ShellHostError(f"Command timed out after {timeout} s")
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise ShellHostError(f"{self.dialect.name} host exited while running a command")
+
+            match = pattern.match(line)
+            if match:
+                # Output without a trailing newline shares the marker's line
+                if match.group(1):
+                    lines.append(match.group(1))
+                    if on_line is not None:
+                        on_line(match.group(1))
+                self.commands_run += 1
+                return ShellResult(lines, int(match.group(2)), time.monotonic() - started)
+
+            lines.append(line)
+            if on_line is not None:
+                on_line(line)
+
+    def kill(self):
+        """Kill the shell and any command it is still running"""
+        if self.process is not None and self.process.poll() is None:
+            ProcessTree(self.process.pid).kill()
+
+    def close(self):
+        """Ask the shell to exit, killing it if it does not"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+class ShellHostPool:
+    """
+    A fixed number of warm shell hosts.
+
+    ``acquire``/``release`` hand out idle hosts; a host that died or was
+    killed (timeout, cancellation) is replaced on release, so the pool
+    always converges back to ``size`` live shells.
+    """
+
+    def __init__(self, dialect, size=2, encoding=None):
+        self.dialect = dialect
+        self.size = max(1, int(size))
+        self.encoding = encoding
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+    def _spawn(self):
+        host = ShellHost(self.dialect, self.encoding)
+        host.start()
+        return host
+
+    def warm_start(self, background=True):
+        """Start every host now (on a helper thread by default)"""
+        def start_all():
+            while True:
+                with self._lock:
+                    if self._closed or self._started >= self.size:
+                        return
+                    self._started += 1
+                try:
+                    self._idle.put(self._spawn())
+                except OSError:
+                    with self._lock:
+                        self._started -= 1
+                    return
+
+        if background:
+            threading.Thread(target=start_all, name="shell-pool-warmup", daemon=True).start()
+        else:
+            start_all()
+
+    def acquire(self, timeout=None, cancelled=None):
+        """
+        Return an idle host, starting one if the pool is not full yet.
+
+        While every host is busy this waits up to ``timeout`` seconds (None:
+        until one is released), giving up early when the pool is closed or
+        ``cancelled()`` returns True.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise ShellHostError("Shell pool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            # Checked on every pass: a host that could not be replaced frees its slot
+            with self._lock:
+                can_start = self._started < self.size
+                if can_start:
+                    self._started += 1
+            if can_start:
+                try:
+                    return self._spawn()
+                except OSError as e:
+                    with self._lock:
+                        self._started -= 1
+                    raise ShellHostError(f"Cannot start {self.dialect.name}: {e}")
+            if cancelled is not None and cancelled():
+                raise ShellHostError("Cancelled while waiting for a shell host")
+            wait = ACQUIRE_POLL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ShellHostError("No shell host became available")
+                wait = min(wait, remaining)
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                pass
+
+    def release(self, host):
+        """Return a host to the pool, replacing it if it is no longer alive"""
+        if self._closed:
+            host.close()
+            return
+        if not host.is_alive():
+            try:
+                host = self._spawn()
+            except OSError:
+                with self._lock:
+                    self._started -= 1
+                return
+        self._idle.put(host)
+
+    def run(self, command, timeout=None, on_line=None):
+        """Run one command on any idle host"""
+        host = self.acquire()
+        try:
+            return host.execute(command, timeout, on_line)
+        finally:
+            self.release(host)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,84 @@
+"""
+Startup phase timing
+
+A StartupTimer is created as early as possible in main.py and records how
+long each startup phase takes. Phases finished before the first frame are
+what the user waits for (time-to-first-paint); phases run afterwards
+(tray icon, remaining category cards) are reported as deferred work.
+"""
+
+import os
+import json
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Records named startup phases relative to the timer's creation"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.origin = clock()
+        self.phases = []
+        self.deferred = []
+        self.first_paint = None
+
+    def elapsed(self):
+        """Seconds since the timer was created"""
+        return self._clock() - self.origin
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; it counts as deferred once the first frame is painted"""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            target = self.phases if self.first_paint is None else self.deferred
+            target.append((name, self._clock() - started))
+
+    def mark_first_paint(self):
+        """Record the first frame; returns False if it was already recorded"""
+        if self.first_paint is not None:
+            return False
+        self.first_paint = self.elapsed()
+        return True
+
+    def unaccounted(self):
+        """Time before the first paint not covered by any phase (event loop, layout, painting)"""
+        if self.first_paint is None:
+            return 0.0
+        return max(0.0, self.first_paint - sum(duration for _, duration in self.phases))
+
+    def summary(self, budget_ms=None):
+        """One-line breakdown of time-to-first-paint, e.g. for the console"""
+        if self.first_paint is None:
+            return "Startup still in progress"
+        parts = [f"{name} {duration * 1000:.0f}" for name, duration in self.phases]
+        parts.append(f"layout/paint {self.unaccounted() * 1000:.0f}")
+        text = f"First paint in {self.first_paint * 1000:.0f} ms ({', '.join(parts)})"
+        if self.deferred:
+            text += f"; {sum(duration for _, duration in self.deferred) * 1000:.0f} ms deferred"
+        if budget_ms:
+            text += f" - budget {budget_ms} ms"
+        return text
+
+    def over_budget(self, budget_ms):
+        return bool(budget_ms) and self.first_paint is not None and self.first_paint * 1000 > budget_ms
+
+    def to_dict(self):
+        return {
+            "time": round(time.time(), 3),
+            "first_paint_ms": None if self.first_paint is None else round(self.first_paint * 1000, 1),
+            "phases": [{"name": name, "ms": round(duration * 1000, 1)} for name, duration in self.phases],
+            "deferred": [{"name": name, "ms": round(duration * 1000, 1)} for name, duration in self.deferred],
+        }
+
+    def write_report(self, path):
+        """Append this startup as one JSON line, so budgets can be tracked across launches"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_dict()) + "\n")
+        except OSError:
+            pass
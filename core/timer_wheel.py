@@ -0,0 +1,124 @@
+"""
+Hashed timer wheel shared by every running job
+
+Tool deadlines and cancellation escalation are deadlines measured in
+seconds or minutes, usually cancelled long before they fire. Rather than
+one timer thread per job, they all go into one wheel: a ring of slots
+advanced every TICK seconds by a single daemon thread. Scheduling and
+cancelling are O(1); the thread sleeps while the wheel is empty.
+"""
+
+import math
+import time
+import threading
+
+# Resolution of the wheel in seconds
+TICK = 0.25
+
+# Slots in the ring; timers further out than one revolution wait for their round
+SLOTS = 512
+
+
+class Timer:
+    """Handle of a scheduled callback"""
+
+    def __init__(self, callback, target):
+        self.callback = callback
+        self.target = target
+        self.cancelled = False
+        self.fired = False
+
+
+class TimerWheel:
+    """Runs callbacks after a delay on one background thread (at TICK resolution)"""
+
+    def __init__(self, tick=TICK, slots=SLOTS, clock=time.monotonic):
+        self.tick = tick
+        self._slots = [set() for _ in range(slots)]
+        self._clock = clock
+        self._origin = clock()
+        # Last tick whose slot has been processed
+        self._processed = 0
+        self._count = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def _now_tick(self):
+        return int((self._clock() - self._origin) / self.tick)
+
+    def schedule(self, delay, callback):
+        """Call ``callback()`` after ``delay`` seconds; returns a Timer for cancel()"""
+        with self._condition:
+            if self._count == 0:
+                # Skip the ticks the wheel spent idle; nothing was scheduled in them
+                self._processed = max(self._processed, self._now_tick())
+            ticks = max(1, math.ceil(max(0.0, delay) / self.tick))
+            timer = Timer(callback, self._processed + ticks)
+            self._slots[timer.target % len(self._slots)].add(timer)
+            self._count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return timer
+
+    def cancel(self, timer):
+        """Cancel a pending timer. Returns False if it already fired or was cancelled"""
+        if timer is None:
+            return False
+        with self._condition:
+            if timer.fired or timer.cancelled:
+                return False
+            timer.cancelled = True
+            self._slots[timer.target % len(self._slots)].discard(timer)
+            self._count -= 1
+            return True
+
+    def __len__(self):
+        with self._condition:
+            return self._count
+
+    def _expired(self):
+        """Remove and return the timers due up to now"""
+        due = []
+        now = self._now_tick()
+        while self._processed < now:
+            self._processed += 1
+            slot = self._slots[self._processed % len(self._slots)]
+            ready = [timer for timer in slot if timer.target <= self._processed]
+            for timer in ready:
+                slot.discard(timer)
+                timer.fired = True
+            self._count -= len(ready)
+            due.extend(ready)
+        return due
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._count == 0:
+                    self._condition.wait()
+                due = self._expired()
+                if not due:
+                    next_tick = (self._processed + 1) * self.tick + self._origin
+                    self._condition.wait(max(0.0, next_tick - self._clock()))
+                    continue
+            for timer in due:
+                try:
+                    timer.callback()
+                except Exception:
+                    # A failing callback must not stop every other deadline
+                    pass
+
+
+_wheel = None
+_wheel_lock = threading.Lock()
+
+
+def get_timer_wheel():
+    """Return the process-wide timer wheel"""
+    global _wheel
+    with _wheel_lock:
+        if _wheel is None:
+            _wheel = TimerWheel()
+        return _wheel
@@ -0,0 +1,109 @@
+"""
+Fixed-size multi-resolution time-series storage for system metrics
+"""
+
+import math
+import threading
+from array import array
+
+NAN = float("nan")
+
+# (step seconds, number of slots): 1 s for 10 min, 10 s for 6 h, 1 min for 7 days
+DEFAULT_ARCHIVES = ((1, 600), (10, 2160), (60, 10080))
+
+SNAPSHOT_FIELDS = ("cpu_percent", "memory_percent", "disk_read_rate",
+                   "disk_write_rate", "net_sent_rate", "net_recv_rate")
+
+
+class Archive:
+    """Ring of averaged values at a fixed step, stored as float32"""
+
+    def __init__(self, step, rows):
+        self.step = step
+        self.rows = rows
+        self.values = array("f", [NAN]) * rows
+        self.newest_slot = None
+        self._sum = 0.0
+        self._count = 0
+
+    def add(self, timestamp, value):
+        slot = int(timestamp // self.step)
+        if self.newest_slot is None:
+            self.newest_slot = slot
+        elif slot < self.newest_slot:
+            # Clock went backwards; fold into the current slot
+            slot = self.newest_slot
+        elif slot > self.newest_slot:
+            self._reset_accumulator()
+            # Mark skipped slots as gaps (at most one full lap)
+            for missing in range(max(self.newest_slot + 1, slot - self.rows), slot):
+                self.values[missing % self.rows] = NAN
+            self.newest_slot = slot
+        self._sum += value
+        self._count += 1
+        self.values[slot % self.rows] = self._sum / self._count
+
+    def _reset_accumulator(self):
+        self._sum = 0.0
+        self._count = 0
+
+    def span(self):
+        """Seconds of history this archive can hold"""
+        return self.step * self.rows
+
+    def series(self, count=None, now=None):
+        """Return up to ``count`` values ending at ``now`` (or the newest slot), oldest first"""
+        if self.newest_slot is None:
+            return []
+        count = self.rows if count is None else min(count, self.rows)
+        end = self.newest_slot if now is None else int(now // self.step)
+        result = []
+        for slot in range(end - count + 1, end + 1):
+            if slot > self.newest_slot or slot <= self.newest_slot - self.rows:
+                result.append(NAN)
+            else:
+                result.append(self.values[slot % self.rows])
+        return result
+
+
+class TimeSeriesStore:
+    """Named metrics, each kept in several archives of decreasing resolution"""
+
+    def __init__(self, archives=DEFAULT_ARCHIVES):
+        self.archive_spec = tuple(archives)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, timestamp, value):
+        with self._lock:
+            archives = self._series.get(name)
+            if archives is None:
+                archives = [Archive(step, rows) for step, rows in self.archive_spec]
+                self._series[name] = archives
+            for archive in archives:
+                archive.add(timestamp, value)
+
+    def add_snapshot(self, snapshot):
+        """Record every field of a MetricsSnapshot"""
+        for field in SNAPSHOT_FIELDS:
+            self.add(field, snapshot.timestamp, getattr(snapshot, field))
+
+    def names(self):
+        return sorted(self._series)
+
+    def series(self, name, seconds, now=None):
+        """Values covering the last ``seconds`` from the finest archive that spans them"""
+        with self._lock:
+            archives = self._series.get(name)
+            if not archives:
+                return []
+            archive = next((a for a in archives if a.span() >= seconds), archives[-1])
+            count = max(1, int(math.ceil(seconds / archive.step)))
+            return archive.series(count, now)
+
+    def average(self, name, seconds, now=None):
+        """Mean of the known values over the last ``seconds`` (None if there are none)"""
+        values = [value for value in self.series(name, seconds, now) if not math.isnan(value)]
+        if not values:
+            return None
+        return sum(values) / len(values)
@@ -2,16 +2,32 @@
 """
 PC Troubleshooter - Windows Desktop Application
 Built with PyQt6 and Batch/PowerShell scripts
+
+Run without arguments for the GUI, or ``python main.py run --help`` for the
+headless runner (``python main.py cleanup --help`` for the temp cleanup).
 """
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+import multiprocessing
+
+# Started before PyQt is imported so the startup report covers the imports
+from core.startup import StartupTimer
+startup_timer = StartupTimer()
 
 def main():
+    # Headless runner: never import PyQt
+    if len(sys.argv) > 1 and sys.argv[1] in ("run", "cleanup"):
+        from core.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
+    with startup_timer.phase("imports"):
+        from PyQt6.QtWidgets import QApplication
+        from ui.main_window import MainWindow
+    
     # Create the application
-    app = QApplication(sys.argv)
+    with startup_timer.phase("application"):
+        app = QApplication(sys.argv)
     
     # Set application properties
     app.setApplicationName("PC Troubleshooter")
@@ -19,11 +35,13 @@ def main():
     app.setOrganizationName("PC Troubleshooter")
     
     # Create and show the main window
-    window = MainWindow()
+    window = MainWindow(startup_timer)
     window.show()
     
     # Run the application
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Lets the frozen executable act as an execution_backend worker
+    multiprocessing.freeze_support()
     main()
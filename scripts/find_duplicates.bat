@@ -0,0 +1,16 @@
+@echo off
+echo ========================================
+echo    Duplicate File Finder
+echo ========================================
+echo.
+
+echo ##phase "Finding duplicate files"
+echo [INFO] Searching Desktop, Documents, Downloads, Pictures, Music and Videos...
+echo [INFO] Files of the same size are hashed to confirm they are identical.
+echo.
+powershell -Command "$roots = 'Desktop','Documents','Downloads','Pictures','Music','Videos' | ForEach-Object { Join-Path $env:USERPROFILE $_ } | Where-Object { Test-Path $_ }; $groups = Get-ChildItem $roots -Recurse -File -ErrorAction SilentlyContinue | Where-Object { $_.Length -ge 1MB } | Group-Object Length | Where-Object { $_.Count -gt 1 } | ForEach-Object { $_.Group | Get-FileHash -Algorithm SHA256 -ErrorAction SilentlyContinue } | Group-Object Hash | Where-Object { $_.Count -gt 1 }; $wasted = 0; foreach ($g in $groups) { $size = (Get-Item $g.Group[0].Path).Length; $wasted += $size * ($g.Count - 1); Write-Host ('[DUPLICATES] {0} copies of {1:N2} MB' -f $g.Count, ($size / 1MB)); $g.Group | ForEach-Object { Write-Host ('    ' + $_.Path) } }; Write-Host ''; if ($groups) { Write-Host ('[INFO] {0} duplicate group(s); {1:N2} MB can be reclaimed' -f @($groups).Count, ($wasted / 1MB)) } else { Write-Host '[INFO] No duplicate files found' }"
+
+echo.
+echo ========================================
+echo Duplicate file search completed!
+echo ========================================
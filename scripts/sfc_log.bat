@@ -0,0 +1,21 @@
+@echo off
+echo ========================================
+echo    SFC Log Analyzer
+echo ========================================
+echo.
+
+if not exist "C:\Windows\Logs\CBS\CBS.log" (
+    echo [INFO] CBS.log was not found; run System File Check first
+    goto :done
+)
+
+echo ##phase "Reading CBS.log"
+echo [INFO] Files reported by the latest System File Checker entries:
+echo.
+powershell -Command "$lines = Get-Content 'C:\Windows\Logs\CBS\CBS.log' -Tail 50000 | Select-String '\[SR\]'; $bad = $lines | Select-String 'Cannot repair member file|Could not reproject corrupted file'; $corrupt = $lines | Select-String 'Repairing corrupted file'; $fixed = $lines | Select-String 'Repaired file|Repairing file'; $bad | ForEach-Object { Write-Host ('UNREPAIRABLE ' + $_.Line.Substring($_.Line.IndexOf('[SR]') + 5)) }; $corrupt | ForEach-Object { Write-Host ('CORRUPT      ' + $_.Line.Substring($_.Line.IndexOf('[SR]') + 5)) }; $fixed | ForEach-Object { Write-Host ('REPAIRED     ' + $_.Line.Substring($_.Line.IndexOf('[SR]') + 5)) }; Write-Host ''; if ($bad) { Write-Host '[ERROR] Some files could not be repaired - run dism /online /cleanup-image /restorehealth' } elseif ($corrupt) { Write-Host '[WARNING] Corrupt files were found' } else { Write-Host '[INFO] No corruption detected' }; Write-Host ''; Write-Host '[INFO] Recent SFC log entries:'; $lines | Select-Object -Last 10 | ForEach-Object { Write-Host $_.Line }"
+
+:done
+echo.
+echo ========================================
+echo SFC log analysis completed!
+echo ========================================
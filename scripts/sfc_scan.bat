@@ -16,12 +16,15 @@ if %errorLevel% == 0 (
     exit
 )
 
+echo ##phase "System file scan"
+echo ##pct 5
 echo [INFO] Running System File Checker...
 echo [INFO] This may take several minutes. Please wait...
 echo.
 
 sfc /scannow
 
+echo ##pct 70
 echo.
 echo [INFO] SFC scan completed. Checking results...
 
@@ -29,9 +32,11 @@ echo [INFO] SFC scan completed. Checking results...
 if exist "C:\Windows\Logs\CBS\CBS.log" (
     echo.
     echo [INFO] Recent SFC log entries:
-    powershell -Command "Get-Content 'C:\Windows\Logs\CBS\CBS.log' | Select-String 'SFC' | Select-Object -Last 10"
+    powershell -Command "Get-Content 'C:\Windows\Logs\CBS\CBS.log' -Tail 20000 | Select-String '\[SR\]' | Select-Object -Last 10"
 )
 
+echo ##phase "DISM health check"
+echo ##pct 75
 echo.
 echo [INFO] Running DISM health check...
 dism /online /cleanup-image /checkhealth
@@ -41,9 +46,12 @@ echo [INFO] If SFC found issues, you can run additional DISM commands:
 echo   dism /online /cleanup-image /scanhealth
 echo   dism /online /cleanup-image /restorehealth
 
+echo ##phase "Integrity summary"
+echo ##pct 90
 echo.
 echo [INFO] System file integrity status:
-powershell -Command "if (Test-Path 'C:\Windows\Logs\CBS\CBS.log') { $sfcResults = Get-Content 'C:\Windows\Logs\CBS\CBS.log' | Select-String 'SFC' | Select-Object -Last 5; if ($sfcResults -match 'corrupt') { Write-Host 'CORRUPT FILES DETECTED - Run DISM repair' -ForegroundColor Red } else { Write-Host 'No corruption detected' -ForegroundColor Green } }"
+powershell -Command "if (Test-Path 'C:\Windows\Logs\CBS\CBS.log') { $sfcResults = Get-Content 'C:\Windows\Logs\CBS\CBS.log' -Tail 20000 | Select-String '\[SR\]'; if ($sfcResults -match 'corrupt') { Write-Host 'CORRUPT FILES DETECTED - Run DISM repair' -ForegroundColor Red } else { Write-Host 'No corruption detected' -ForegroundColor Green } }"
+echo [INFO] Run "Analyze SFC Log" for the files SFC found corrupt, repaired or could not repair.
 
 echo.
 echo ========================================
@@ -0,0 +1,111 @@
+"""
+CBS.log analysis: full scan, incremental scan of appended lines and rotation
+"""
+
+import os
+
+from core.cbs_log import CORRUPT, REPAIRED, UNREPAIRABLE, CbsLogIndex
+
+FILLER_LINES = 100000
+
+
+def _line(time, text, sr=False):
+    tag = "[SR] " if sr else ""
+    return f"{time}, Info                  CSI    00000001 {tag}{text}\r\n"
+
+
+def _filler(time, count=FILLER_LINES):
+    return "".join(_line(time, f"Servicing operation {i} on package Package_for_KB{i}") for i in range(count))
+
+
+def _sfc_run(time, findings):
+    lines = [_line(time, "Beginning Verify and Repair transaction", sr=True)]
+    lines += [_line(time, text, sr=True) for text in findings]
+    lines.append(_line(time, "Verify complete", sr=True))
+    return "".join(lines)
+
+
+def _write(path, text, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def _large_log(path):
+    """An old SFC run, a lot of other servicing, then the latest run at the end"""
+    _write(path, _sfc_run("2025-08-01 09:00:00", [r"Repairing corrupted file \??\C:\Windows\old.dll from store"])
+           + _filler("2025-08-01 09:30:00")
+           + _sfc_run("2025-08-20 10:00:00", [
+               r"Repairing corrupted file [l:20]'\??\C:\Windows\a.dll' from store",
+               r"Cannot repair member file [l:10]'b.dll' of Microsoft-Windows-B",
+           ]))
+
+
+def test_full_scan_only_reads_the_latest_run(tmp_path):
+    log = tmp_path / "CBS.log"
+    _large_log(log)
+    index = CbsLogIndex(str(log), str(tmp_path / "state.json"))
+    stats = index.update()
+    assert stats.full
+    assert stats.new_lines == 4
+    assert stats.parsed_bytes < 1000 < stats.size
+    assert [(f.kind, f.path) for f in index.findings()] == [
+        (CORRUPT, r"C:\Windows\a.dll"), (UNREPAIRABLE, "b.dll")]
+
+
+def test_appended_lines_are_parsed_incrementally(tmp_path):
+    log = tmp_path / "CBS.log"
+    state = str(tmp_path / "state.json")
+    _large_log(log)
+    CbsLogIndex(str(log), state).update()
+
+    appended = _filler("2025-08-20 10:01:00", 1000) + _line(
+        "2025-08-20 10:02:00", r"Repaired file \??\C:\Windows\a.dll by copying from backup", sr=True)
+    # A line still being written waits for the next update
+    _write(log, appended + "2025-08-20 10:02:01, Info", "a")
+    index = CbsLogIndex(str(log), state)
+    stats = index.update()
+    assert not stats.full
+    assert stats.new_lines == 1
+    assert stats.parsed_bytes == len(appended.encode())
+    assert index.offset == os.path.getsize(log) - len("2025-08-20 10:02:01, Info")
+    assert [(f.kind, f.path) for f in index.findings()][-1] == (REPAIRED, r"C:\Windows\a.dll")
+    assert len(index.findings()) == 3
+
+    # Nothing new: nothing parsed
+    assert index.update().parsed_bytes == 0
+
+
+def test_cancelled_update_keeps_the_saved_state(tmp_path):
+    log = tmp_path / "CBS.log"
+    state = str(tmp_path / "state.json")
+    _large_log(log)
+    index = CbsLogIndex(str(log), state)
+    stats = index.update(is_cancelled=lambda: True)
+    assert stats.cancelled
+    assert index.offset == 0 and index.findings() == []
+    assert not os.path.exists(state)
+
+    assert not index.update().cancelled
+    assert len(index.findings()) == 2
+
+
+def test_a_rotated_log_is_analyzed_from_scratch(tmp_path):
+    log = tmp_path / "CBS.log"
+    state = str(tmp_path / "state.json")
+    _large_log(log)
+    CbsLogIndex(str(log), state).update()
+
+    _write(log, _filler("2025-09-01 08:00:00", 10) + _sfc_run(
+        "2025-09-01 08:05:00", [r"Repairing file \??\C:\Windows\c.dll from store"]))
+    index = CbsLogIndex(str(log), state)
+    stats = index.update()
+    assert stats.full
+    assert [(f.kind, f.path) for f in index.findings()] == [(REPAIRED, r"C:\Windows\c.dll")]
+
+
+def test_state_path_without_a_directory_is_saved(tmp_path, monkeypatch):
+    log = tmp_path / "CBS.log"
+    _write(log, _sfc_run("2025-08-20 10:00:00", []))
+    monkeypatch.chdir(tmp_path)
+    CbsLogIndex(str(log), "cbs_state.json").update()
+    assert CbsLogIndex(str(log), "cbs_state.json").offset == os.path.getsize(log)
@@ -0,0 +1,118 @@
+"""
+CleanupEngine against synthetic directory trees
+"""
+
+import os
+import stat
+import sys
+
+import pytest
+
+from core import cleanup, collectors
+from core.cleanup import CleanupEngine, CleanupRoot
+
+
+def write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A root with nested folders, a read-only file, a link out of the root and a denied file"""
+    root = tmp_path / "root"
+    outside = tmp_path / "outside"
+    write(str(root / "a" / "b" / "deep.bin"), 1000)
+    write(str(root / "top.bin"), 500)
+    write(str(root / "readonly.txt"), 300)
+    os.chmod(root / "readonly.txt", stat.S_IREAD)
+    write(str(root / "denied" / "locked.bin"), 700)
+    write(str(outside / "keep.txt"), 200)
+    os.chmod(outside / "keep.txt", 0o640)
+    os.symlink(outside, root / "link_out")
+    os.symlink(outside / "keep.txt", root / "file_link")
+
+    # Tests run with enough rights to delete anything, so the denial is simulated
+    real_remove = os.remove
+
+    def remove(path):
+        if os.path.basename(path) == "locked.bin":
+            raise PermissionError(13, "Permission denied", path)
+        real_remove(path)
+
+    monkeypatch.setattr(cleanup.os, "remove", remove)
+    return root, outside
+
+
+def test_dry_run_sizes_without_deleting(tree):
+    root, _ = tree
+    result, = CleanupEngine([CleanupRoot("Root", str(root))], dry_run=True).run()
+    # Links count as entries of no size
+    assert result.files == 6
+    assert result.found_bytes == 1000 + 500 + 300 + 700
+    assert result.deleted_files == 0
+    assert (root / "a" / "b" / "deep.bin").exists()
+
+
+def test_cleanup_frees_exact_bytes_and_stays_inside_root(tree):
+    root, outside = tree
+    progress = []
+    result, = CleanupEngine([CleanupRoot("Root", str(root))], workers=2, on_progress=progress.append).run()
+
+    assert result.freed_bytes == 1000 + 500 + 300
+    assert result.deleted_files == 5
+    assert result.skipped_files == 1
+    assert result.skipped_bytes == 700
+    assert progress[-1] == 100
+
+    assert root.is_dir()
+    assert sorted(os.listdir(root)) == ["denied"]
+    assert os.listdir(root / "denied") == ["locked.bin"]
+    # The links went, their targets and modes did not
+    assert (outside / "keep.txt").read_bytes() == b"x" * 200
+    assert stat.S_IMODE(os.stat(outside / "keep.txt").st_mode) == 0o640
+    # A file that could not be deleted keeps its mode
+    assert os.stat(root / "denied" / "locked.bin").st_mode & stat.S_IRUSR
+
+
+def test_missing_root_is_reported(tmp_path):
+    result, = CleanupEngine([CleanupRoot("Gone", str(tmp_path / "gone"))]).run()
+    assert result.missing
+    assert result.freed_bytes == 0
+
+
+def test_pattern_limits_top_level_entries(tmp_path):
+    write(str(tmp_path / "thumbcache_32.db"), 100)
+    write(str(tmp_path / "iconcache.db"), 100)
+    result, = CleanupEngine([CleanupRoot("Thumbs", str(tmp_path), "thumbcache*")]).run()
+    assert result.freed_bytes == 100
+    assert os.listdir(tmp_path) == ["iconcache.db"]
+
+
+def test_custom_roots_leave_system_state_alone(tmp_path, monkeypatch):
+    write(str(tmp_path / "scratch" / "file.tmp"), 100)
+    commands = []
+    monkeypatch.setattr(collectors, "_run_quiet", commands.append)
+    monkeypatch.setattr(collectors.sys, "platform", "win32")
+    report = collectors.collect_temp_cleanup(roots=[CleanupRoot("Scratch", str(tmp_path / "scratch"))])
+    assert commands == []
+    assert [section.title for section in report.sections] == ["CLEANUP SUMMARY"]
+    assert report.sections[0].rows == [["Scratch", 1, 0, 0.0]]
+
+
+def test_cancelled_cleanup_leaves_the_rest(tmp_path, monkeypatch):
+    for i in range(cleanup.DELETE_BATCH * 10):
+        write(str(tmp_path / "scratch" / f"{i}.tmp"), 10)
+    monkeypatch.setattr(collectors, "_run_quiet", lambda command: None)
+    report = collectors.collect_temp_cleanup(roots=[CleanupRoot("Scratch", str(tmp_path / "scratch"))],
+                                             workers=1, is_cancelled=lambda: True)
+    [[_, deleted, _, _]] = report.sections[0].rows
+    assert 0 < deleted < cleanup.DELETE_BATCH * 10
+    assert report.sections[0].messages[-1][0] == "WARNING"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the default folders exist on Windows")
+def test_default_roots_need_windows():
+    with pytest.raises(collectors.CollectorUnavailable):
+        collectors.collect_temp_cleanup(dry_run=True)
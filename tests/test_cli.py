@@ -0,0 +1,43 @@
+"""
+Headless runner scheduling
+"""
+
+import io
+import stat
+
+from core.catalog import Category, ToolCatalog, ToolSpec
+from core.cli import EventWriter, run_tools
+
+
+def _catalog(tmp_path, resources):
+    """One sleeping script per tool that records when it starts and ends"""
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    trace = tmp_path / "trace.txt"
+    tools = []
+    for name, used in resources.items():
+        script = scripts / f"{name}.sh"
+        script.write_text(f"#!/bin/sh\necho start {name} >> '{trace}'\nsleep 0.3\necho end {name} >> '{trace}'\n")
+        script.chmod(script.stat().st_mode | stat.S_IXUSR)
+        tools.append(ToolSpec(name, name, script.name, "test", resources=used))
+    return ToolCatalog([Category("test", "Test")], tools, scripts_dir=str(scripts)), trace
+
+
+def test_tools_sharing_a_resource_never_overlap(tmp_path):
+    catalog, trace = _catalog(tmp_path, {"a": ["network_stack"], "b": ["network_stack"], "c": ["disk"]})
+    writer = EventWriter(io.StringIO(), True, False)
+    results = run_tools(["a", "b", "c"], 3, writer, native=False, catalog=catalog, timeout=0)
+    assert [result.tool for result in results] == ["a", "b", "c"]
+    assert all(result.success for result in results)
+    events = trace.read_text().split("\n")
+    # b waits for a; c shares nothing and runs alongside a
+    assert events.index("start b") > events.index("end a")
+    assert events.index("start c") < events.index("end a")
+
+
+def test_a_tool_listed_twice_runs_twice(tmp_path):
+    catalog, trace = _catalog(tmp_path, {"a": ["network_stack"]})
+    results = run_tools(["a", "a"], 2, EventWriter(io.StringIO(), True, False), native=False,
+                        catalog=catalog, timeout=0)
+    assert len(results) == 2 and all(result.success for result in results)
+    assert trace.read_text().split() == ["start", "a", "end", "a"] * 2
@@ -0,0 +1,111 @@
+"""
+Shape of the psutil-based collector reports
+"""
+
+import json
+import sys
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+
+from core.collectors import GB, MB, CollectorUnavailable, collect_disk_space, collect_memory, collect_performance
+from core.disk_index import DiskIndex
+
+Memory = namedtuple("Memory", "total available percent")
+Swap = namedtuple("Swap", "total used percent")
+Partition = namedtuple("Partition", "mountpoint")
+Usage = namedtuple("Usage", "total used free percent")
+Counters = namedtuple("Counters", "bytes_sent bytes_recv")
+Times = namedtuple("Times", "user system")
+Rss = namedtuple("Rss", "rss")
+
+
+def _fake_psutil(cpu=12.5, memory_percent=50.0):
+    """Deterministic stand-in for the psutil calls the collectors make"""
+    processes = [
+        {"pid": 1, "name": "idle", "memory_info": Rss(10 * MB), "cpu_times": Times(1.0, 0.5), "num_threads": 1},
+        {"pid": 2, "name": "browser", "memory_info": Rss(900 * MB), "cpu_times": Times(80.0, 20.0),
+         "num_threads": 120},
+        # A process that vanished during the snapshot has no name
+        {"pid": 3, "name": None},
+    ]
+    usage = {"/": Usage(100 * GB, 90 * GB, 10 * GB, 90.0), "/data": Usage(500 * GB, 100 * GB, 400 * GB, 20.0)}
+    return SimpleNamespace(
+        cpu_percent=lambda interval=None: cpu,
+        virtual_memory=lambda: Memory(16 * GB, 16 * GB * (100 - memory_percent) / 100, memory_percent),
+        swap_memory=lambda: Swap(4 * GB, 1 * GB, 25.0),
+        disk_partitions=lambda all=False: [Partition(mount) for mount in usage],
+        disk_usage=lambda mount: usage[mount],
+        net_io_counters=lambda pernic=False: {"eth0": Counters(5 * MB, 50 * MB), "Loopback": Counters(1, 1)},
+        process_iter=lambda attrs: [SimpleNamespace(info=dict(info)) for info in processes],
+        boot_time=lambda: 0.0,
+    )
+
+
+def _check_shape(report):
+    """Every table row fits its columns and the report renders and serializes"""
+    assert report.sections
+    for section in report.sections:
+        for row in section.rows:
+            assert len(row) == len(section.columns), section.title
+    lines = report.to_lines()
+    assert lines[1].strip() == report.title and lines[-2] == f"{report.title} completed!"
+    json.dumps(report.to_dict())
+    return {section.title: section for section in report.sections}
+
+
+def test_memory_report():
+    sections = _check_shape(collect_memory(_fake_psutil(memory_percent=75.0)))
+    assert sections["MEMORY OVERVIEW"].rows == [[16.0, 4.0, 12.0, 75.0]]
+    assert [row[0] for row in sections["TOP MEMORY PROCESSES"].rows] == ["browser", "idle"]
+    assert sections["VIRTUAL MEMORY (PAGEFILE)"].rows == [[4096, 1024, 25.0]]
+    assert [row[0] for row in sections["HIGH HANDLE/THREAD COUNT"].rows] == ["browser"]
+
+
+def test_performance_report_alerts():
+    sections = _check_shape(collect_performance(psutil=_fake_psutil(cpu=95.0, memory_percent=90.0)))
+    assert sections["CPU USAGE"].rows == [[95.0]]
+    assert [row[0] for row in sections["DISK USAGE"].rows] == ["/", "/data"]
+    # Loopback interfaces are left out
+    assert sections["NETWORK USAGE"].rows == [["eth0", 5.0, 50.0]]
+    assert sections["TOP CPU PROCESSES"].rows[0][:2] == ["browser", 100.0]
+    assert [level for level, _ in sections["PERFORMANCE ALERTS"].messages] == ["WARNING", "WARNING"]
+
+    quiet = _check_shape(collect_performance(psutil=_fake_psutil()))
+    assert quiet["PERFORMANCE ALERTS"].messages == [("INFO", "System performance is normal")]
+
+
+def test_disk_space_warns_about_low_drives(tmp_path):
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "folder" / "file.bin").write_bytes(b"x" * 1024)
+    output = []
+    report = collect_disk_space(_fake_psutil(), DiskIndex(str(tmp_path)), on_output=output.extend)
+    sections = _check_shape(report)
+    drives = sections["DISK SPACE"]
+    assert [row[0] for row in drives.rows] == ["/", "/data"]
+    assert drives.messages == [("WARNING", "Drive / is running low on space (10.00% free)")]
+    # The streamed lines are the report plus the scan notice
+    assert [line for line in output if not line.startswith("[INFO] Updating")] == report.to_lines()
+
+
+def test_disk_space_scan_can_be_cancelled(tmp_path):
+    (tmp_path / "folder").mkdir()
+    report = collect_disk_space(_fake_psutil(), DiskIndex(str(tmp_path)), is_cancelled=lambda: True)
+    folders = _check_shape(report)[f"LARGEST FOLDERS ON {tmp_path}"]
+    assert folders.rows == []
+    assert folders.messages[0][0] == "WARNING"
+
+
+def test_disk_space_needs_windows_without_an_index(monkeypatch):
+    monkeypatch.setattr(sys, "platform", "linux")
+    with pytest.raises(CollectorUnavailable):
+        collect_disk_space(_fake_psutil())
+
+
+@pytest.mark.parametrize("collector", [collect_memory, collect_performance])
+def test_reports_from_the_real_psutil(collector):
+    psutil = pytest.importorskip("psutil")
+    report = collector(psutil=psutil)
+    _check_shape(report)
+    assert report.duration > 0
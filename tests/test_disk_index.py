@@ -0,0 +1,101 @@
+"""
+Incremental directory-size index
+"""
+
+import os
+import time
+
+from core import disk_index
+from core.disk_index import DiskIndex
+
+
+def _tree(root):
+    """root/{a/{deep/x}, b/y, c}, with a few known sizes"""
+    for path, size in [("a/deep/x.bin", 3000), ("a/one.bin", 100), ("b/y.bin", 500), ("top.bin", 7)]:
+        full = root / path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_bytes(b"x" * size)
+    (root / "c").mkdir()
+
+
+def test_sizes_and_largest_folders(tmp_path):
+    _tree(tmp_path)
+    index = DiskIndex(str(tmp_path), workers=2)
+    stats = index.scan()
+    assert stats.full and stats.directories == 5 and stats.reused == 0
+    assert index.size(str(tmp_path)) == 3607
+    assert index.size(str(tmp_path / "a")) == 3100
+    assert index.largest_folders() == [(str(tmp_path / "a"), 3100), (str(tmp_path / "b"), 500),
+                                       (str(tmp_path / "c"), 0)]
+    assert index.largest_folders(str(tmp_path / "a"), count=1) == [(str(tmp_path / "a" / "deep"), 3000)]
+
+
+def test_rescan_reuses_unchanged_directories(tmp_path):
+    _tree(tmp_path)
+    state = str(tmp_path.parent / f"{tmp_path.name}_index.json")
+    DiskIndex(str(tmp_path), state).scan()
+
+    # Only b changes; a new index object starts from the saved file
+    (tmp_path / "b" / "z.bin").write_bytes(b"x" * 40)
+    index = DiskIndex(str(tmp_path), state)
+    assert len(index) == 5
+    stats = index.scan()
+    assert not stats.full
+    assert stats.directories == 5 and stats.reused == 4
+    assert index.size(str(tmp_path / "b")) == 540
+    assert index.size(str(tmp_path)) == 3647
+
+    # A removed directory disappears with its subtree
+    os.remove(tmp_path / "a" / "deep" / "x.bin")
+    os.rmdir(tmp_path / "a" / "deep")
+    stats = index.scan()
+    assert stats.directories == 4 and index.size(str(tmp_path / "a" / "deep")) is None
+    assert index.size(str(tmp_path)) == 647
+
+
+def test_old_index_is_rescanned_in_full(tmp_path):
+    _tree(tmp_path)
+    index = DiskIndex(str(tmp_path))
+    index.scan()
+    index.full_scan_time -= disk_index.FULL_SCAN_AGE + 1
+    stats = index.scan()
+    assert stats.full and stats.reused == 0
+    assert not index.scan().full
+    assert index.scan(full=True).full
+
+
+def test_cancelled_scan_keeps_the_previous_index(tmp_path):
+    _tree(tmp_path)
+    index = DiskIndex(str(tmp_path), workers=2)
+    index.scan()
+    (tmp_path / "b" / "z.bin").write_bytes(b"x" * 40)
+
+    stats = index.scan(is_cancelled=lambda: True)
+    assert stats.cancelled
+    assert index.size(str(tmp_path / "b")) == 500
+
+    progress = []
+    assert not index.scan(on_progress=progress.append).cancelled
+    assert index.size(str(tmp_path / "b")) == 540
+    assert progress[-1] == 100
+
+
+def test_recent_large_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_index, "LARGE_FILE_BYTES", 400)
+    _tree(tmp_path)
+    old = tmp_path / "b" / "y.bin"
+    os.utime(old, (time.time() - 30 * 86400, time.time() - 30 * 86400))
+    index = DiskIndex(str(tmp_path))
+    index.scan()
+    found = index.recent_large_files(min_size=400)
+    assert [(path, size) for path, size, _ in found] == [(str(tmp_path / "a" / "deep" / "x.bin"), 3000)]
+    assert len(index.recent_large_files(days=60, min_size=400)) == 2
+    assert index.recent_large_files(str(tmp_path / "b"), min_size=400) == []
+
+
+def test_symlinks_are_not_followed(tmp_path):
+    _tree(tmp_path)
+    os.symlink(tmp_path / "a", tmp_path / "link")
+    index = DiskIndex(str(tmp_path))
+    index.scan()
+    assert index.size(str(tmp_path)) == 3607
@@ -0,0 +1,61 @@
+"""
+DuplicateFinder on synthetic trees
+"""
+
+import os
+
+from core import duplicates
+from core.duplicates import EDGE_BYTES, DuplicateFinder
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_finds_copies_but_not_hard_links_or_look_alikes(tmp_path):
+    content = os.urandom(EDGE_BYTES * 4)
+    write(str(tmp_path / "a" / "one.bin"), content)
+    write(str(tmp_path / "b" / "two.bin"), content)
+    # Same size and same edges, different middle
+    look_alike = content[:EDGE_BYTES * 2] + b"\0" + content[EDGE_BYTES * 2 + 1:]
+    write(str(tmp_path / "c" / "similar.bin"), look_alike)
+    # A second name for one file, not a copy
+    unique = os.urandom(EDGE_BYTES * 3)
+    write(str(tmp_path / "d" / "linked.bin"), unique)
+    os.link(tmp_path / "d" / "linked.bin", tmp_path / "d" / "also_linked.bin")
+
+    found = []
+    finder = DuplicateFinder([str(tmp_path)], min_size=1, workers=2, on_group=found.append)
+    groups = finder.run()
+
+    assert [sorted(os.path.basename(path) for path in group.paths) for group in groups] == [["one.bin", "two.bin"]]
+    assert groups[0].wasted == len(content)
+    assert found == groups
+    assert finder.summary.files == 5
+    assert finder.summary.groups == 1
+
+
+def test_cancel_stops_the_walk(tmp_path, monkeypatch):
+    monkeypatch.setattr(duplicates, "WALK_REPORT_EVERY", 1)
+    for index in range(50):
+        write(str(tmp_path / f"dir{index}" / "same.bin"), b"x" * 10)
+
+    def progress(percent):
+        finder.cancel()
+
+    finder = DuplicateFinder([str(tmp_path)], min_size=1, on_progress=progress)
+    assert finder.run() == []
+    assert finder.cancelled
+    # The walk stopped long before listing every folder
+    assert finder.summary.files < 50
+
+
+def test_nested_roots_are_walked_once(tmp_path):
+    content = os.urandom(100)
+    write(str(tmp_path / "x" / "a.bin"), content)
+    write(str(tmp_path / "y" / "b.bin"), content)
+    groups = DuplicateFinder([str(tmp_path), str(tmp_path / "x")], min_size=1).run()
+    assert len(groups) == 1
+    assert len(groups[0].paths) == 2
@@ -0,0 +1,29 @@
+"""
+Run-time history and the progress estimates built from it
+"""
+
+import json
+
+from core.durations import MAX_ESTIMATED_PERCENT, STATS_VERSION, DurationModel, ToolStats
+
+
+def test_expected_duration_pulls_the_average_towards_the_median():
+    stats = ToolStats()
+    for duration in (10.0, 10.0, 10.0, 40.0):
+        stats.add(duration, 0, 0, alpha=0.5)
+    assert stats.expected_duration() == (stats.duration + 10.0) / 2
+    assert ToolStats().expected_duration() is None
+
+
+def test_stats_without_recent_durations_still_estimate(tmp_path):
+    values = {"runs": 3, "duration": 10.0, "recent": []}
+    assert ToolStats.from_dict(values).expected_duration() == 10.0
+
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps({"version": STATS_VERSION, "tools": {"tool": {"script": values}}}))
+    model = DurationModel(str(path))
+    estimate = model.estimate("tool", "script")
+    assert estimate.update(5.0) == (50, 5.0)
+    # Past the average there is no slower percentile to fall back on
+    percent, remaining = estimate.update(20.0)
+    assert percent == MAX_ESTIMATED_PERCENT and remaining is None
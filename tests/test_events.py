@@ -0,0 +1,91 @@
+"""
+Classification of streamed tool output into indexed events
+"""
+
+from core.events import ERROR, HEADER, INFO, KEY_VALUE, SUCCESS, TABLE, WARNING, EventIndex, OutputParser
+
+OUTPUT = [
+    "========================================",
+    "   Disk Space Check Tool",
+    "========================================",
+    "",
+    "[DISK SPACE]",
+    "Drive Size(GB) Free(GB)",
+    "----- -------- --------",
+    "C:\\   476.3    120.5",
+    "D:\\   931.5    800.1",
+    "",
+    "[WARNING] Drive C: is running low on space",
+    "Error: access denied",
+    "Computer Name: DESKTOP-01",
+    "Just some text.",
+    "[OK] done",
+]
+
+
+def _classify(lines, chunk=None):
+    """{line number: (kind, key, value)} with the lines fed ``chunk`` at a time"""
+    parser = OutputParser()
+    chunk = chunk or len(lines)
+    events = []
+    for start in range(0, len(lines), chunk):
+        events.extend(parser.feed(start, lines[start:start + chunk]))
+    events.extend(parser.flush())
+    return {number: (kind, key, value) for number, kind, key, value in events}
+
+
+def test_lines_are_classified():
+    events = _classify(OUTPUT)
+    assert events[1][0] == HEADER
+    assert events[4][0] == HEADER
+    assert [events[number][0] for number in (5, 7, 8)] == [TABLE, TABLE, TABLE]
+    assert events[10][0] == WARNING
+    assert events[11][0] == ERROR
+    assert events[12] == (KEY_VALUE, "Computer Name", "DESKTOP-01")
+    assert events[14][0] == SUCCESS
+    # Rules, blank lines and plain text are not events
+    assert not {0, 2, 3, 6, 9, 13} & events.keys()
+
+
+def test_batch_boundaries_do_not_change_the_result():
+    whole = _classify(OUTPUT)
+    for chunk in (1, 2, 5):
+        assert _classify(OUTPUT, chunk) == whole
+
+
+def test_index_queries_by_kind_and_run():
+    index = EventIndex(max_runs=3)
+    runs = []
+    number = 0
+    for tool, lines in [("disk", ["[WARNING] a", "[INFO] b"]), ("net", ["[ERROR] c"]),
+                        ("disk", ["[WARNING] d", "[WARNING] e"])]:
+        run_id = index.begin_run(tool)
+        index.add(run_id, number, lines)
+        index.end_run(run_id, True)
+        runs.append(run_id)
+        number += len(lines)
+    assert index.query([WARNING]) == [0, 3, 4]
+    assert index.query([WARNING, ERROR]) == [0, 2, 3, 4]
+    assert index.query([WARNING], last_runs=1) == [3, 4]
+    assert index.query([WARNING], tool="disk", last_runs=1) == [3, 4]
+    assert index.counts([WARNING, INFO], tool="disk") == {WARNING: 3, INFO: 1}
+    assert index.get(runs[0]).success is True
+
+    # The oldest run is forgotten beyond max_runs
+    index.begin_run("net")
+    assert index.get(runs[0]) is None
+    assert index.query([INFO]) == []
+
+
+def test_concurrent_runs_merge_in_log_order():
+    index = EventIndex()
+    first = index.begin_run("a")
+    second = index.begin_run("b")
+    index.add(first, 0, ["[ERROR] 0"])
+    index.add(second, 1, ["[ERROR] 1", "[ERROR] 2"])
+    index.add(first, 3, ["[ERROR] 3"])
+    # The last line of each run is held back until the run ends
+    assert index.query([ERROR]) == [0, 1]
+    index.end_run(first, False)
+    index.end_run(second, True)
+    assert index.query([ERROR]) == [0, 1, 2, 3]
@@ -0,0 +1,43 @@
+"""
+JobPool queueing and cancellation
+"""
+
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from core.collectors import Report
+from ui.job_pool import JobHandle, JobPool
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_cancelled_queued_job_is_cancelled_when_it_finishes(app):
+    release = threading.Event()
+
+    def collector(is_cancelled=None):
+        release.wait(5)
+        return Report("slow", "Slow Tool")
+
+    pool = JobPool(max_workers=1)
+    running = pool.submit("slow.bat", "Slow", collector)
+    queued = pool.submit("queued.bat", "Queued", collector)
+    assert (running.state, queued.state) == (JobHandle.RUNNING, JobHandle.QUEUED)
+
+    seen = []
+    pool.job_finished.connect(lambda job_id, success, message: seen.append((job_id, queued.state, success)))
+    try:
+        assert pool.cancel(queued.job_id)
+        assert seen == [(queued.job_id, JobHandle.CANCELLED, False)]
+        assert pool.get(queued.job_id) is None and pool.queued_count() == 0
+    finally:
+        release.set()
+        pool.cancel_all()
+        assert pool.wait_all(5000)
@@ -0,0 +1,89 @@
+"""
+Streaming export of the session log
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from core import log_export
+from core.events import EventIndex
+from core.log_export import (COMPRESSION_GZIP, COMPRESSION_ZSTD, FORMAT_NDJSON, FORMAT_TEXT, ExportCancelled,
+                             LogExport, detect_format, zstd_available)
+
+LINES = [
+    "[10:00:00] 🔧 Running Disk Space",
+    "[10:00:01] [disk] [WARNING] Drive C: is low",
+    "[10:00:01] [net] ERROR: no route \"to\" host",
+    "[10:00:02] plain line without a tool",
+]
+
+
+def _snapshot(lines=LINES, first=0):
+    return list(enumerate(lines, first))
+
+
+def test_formats_follow_the_file_name():
+    assert detect_format("session.txt") == (FORMAT_TEXT, None)
+    assert detect_format("session.log.gz") == (FORMAT_TEXT, COMPRESSION_GZIP)
+    assert detect_format("Session.NDJSON.GZ") == (FORMAT_NDJSON, COMPRESSION_GZIP)
+    assert detect_format("session.jsonl.zst") == (FORMAT_NDJSON, COMPRESSION_ZSTD)
+
+
+def test_text_export(tmp_path):
+    path = str(tmp_path / "session.txt")
+    assert LogExport(_snapshot(), path).run() == len(LINES)
+    text = open(path, encoding="utf-8").read()
+    assert text.startswith("PC Troubleshooter Log Export\n")
+    assert text.endswith("\n".join(LINES) + "\n")
+    assert not os.path.exists(path + ".part")
+
+
+def test_gzip_ndjson_round_trip(tmp_path, monkeypatch):
+    # Several chunks, with the tool spans crossing chunk boundaries
+    monkeypatch.setattr(log_export, "CHUNK_LINES", 3)
+    index = EventIndex()
+    disk = index.begin_run("disk")
+    net = index.begin_run("net")
+    index.add(disk, 1, LINES[1:2])
+    index.add(net, 2, LINES[2:3])
+    path = str(tmp_path / "session.ndjson.gz")
+    progress = []
+    export = LogExport(_snapshot(), path, tool_spans=index.tool_spans(),
+                       on_progress=lambda done, total: progress.append((done, total)))
+    assert export.run() == len(LINES)
+    assert progress == [(3, 4), (4, 4)]
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records[0] == {"n": 0, "time": "10:00:00", "tool": None, "level": None, "text": "🔧 Running Disk Space"}
+    assert records[1] == {"n": 1, "time": "10:00:01", "tool": "disk", "level": "warning",
+                          "text": "[WARNING] Drive C: is low"}
+    assert records[2]["tool"] == "net" and records[2]["level"] == "error"
+    assert records[2]["text"] == "ERROR: no route \"to\" host"
+    assert records[3]["tool"] is None
+
+
+def test_cancel_leaves_nothing_behind(tmp_path):
+    path = str(tmp_path / "session.txt")
+    with open(path, "w") as f:
+        f.write("previous export")
+    export = LogExport(_snapshot(), path, on_progress=lambda done, total: None)
+    export.cancel()
+    with pytest.raises(ExportCancelled):
+        export.run()
+    # The old file is untouched and the partial file removed
+    assert open(path).read() == "previous export"
+    assert os.listdir(tmp_path) == ["session.txt"]
+
+
+@pytest.mark.skipif(not zstd_available(), reason="zstandard is not installed")
+def test_zstd_export(tmp_path):
+    import zstandard
+    path = str(tmp_path / "session.log.zst")
+    LogExport(_snapshot(), path).run()
+    with open(path, "rb") as f:
+        text = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+    assert text.endswith("\n".join(LINES) + "\n")
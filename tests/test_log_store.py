@@ -0,0 +1,56 @@
+"""
+LogStore numbering, spilling and spill-file retention
+"""
+
+import os
+import time
+
+from core.log_store import LogStore, prune_spill_files
+
+
+def test_old_spill_files_are_pruned(tmp_path):
+    now = time.time()
+    for name, age_days in [("session_old.log", 40), ("session_new.log", 1), ("other_old.log", 40)]:
+        path = tmp_path / name
+        path.write_text("x\n")
+        os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+    assert prune_spill_files(str(tmp_path), 30, now) == 1
+    assert sorted(os.listdir(tmp_path)) == ["other_old.log", "session_new.log"]
+    # 0 keeps everything
+    assert prune_spill_files(str(tmp_path), 0, now + 400 * 86400) == 0
+
+
+def test_missing_directory_prunes_nothing(tmp_path):
+    assert prune_spill_files(str(tmp_path / "missing"), 30) == 0
+
+
+def test_spilled_lines_keep_their_numbers(tmp_path):
+    store = LogStore(4, str(tmp_path / "session_test.log"))
+    assert store.extend([f"a{i}" for i in range(3)]) == 0
+    # Evicts a0..a2 to make room, then spills b0 directly
+    assert store.extend([f"b{i}" for i in range(5)]) == 3
+    assert store.first_number() == 4
+    assert list(store.lines_by_number([0, 2, 3, 4, 7])) == [(0, "a0"), (2, "a2"), (3, "b0"), (4, "b1"), (7, "b4")]
+    assert list(store.snapshot()) == list(enumerate(["a0", "a1", "a2", "b0", "b1", "b2", "b3", "b4"]))
+
+
+def test_clear_leaves_a_file_still_being_read_alone(tmp_path, monkeypatch):
+    path = tmp_path / "session_test.log"
+    store = LogStore(2, str(path))
+    store.extend(["old0", "old1", "old2", "old3"])
+    snapshot = store.snapshot()
+
+    # As on Windows while an export has the file open
+    def locked(name):
+        raise PermissionError(13, "in use", name)
+
+    monkeypatch.setattr("core.log_store.os.remove", locked)
+    store.clear()
+    monkeypatch.undo()
+
+    store.extend(["new0", "new1", "new2"])
+    assert list(store.lines_by_number([4, 5, 6])) == [(4, "new0"), (5, "new1"), (6, "new2")]
+    assert list(store) == ["new0", "new1", "new2"]
+    # The snapshot taken before clear() still reads the old lines under their numbers
+    assert list(snapshot) == [(0, "old0"), (1, "old1"), (2, "old2"), (3, "old3")]
+    assert path.read_text() == "old0\nold1\n"
@@ -0,0 +1,83 @@
+"""
+ProbeEngine against local stand-in servers
+"""
+
+import socket
+
+from core.net_probe import (KIND_DNS, KIND_PING, KIND_TCP, METHOD_UDP, Probe, ProbeEngine, parse_target,
+                            percentile)
+
+
+def _free_port(kind):
+    """A local port nothing is bound to"""
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_tcp_listener_answers_every_attempt():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(8)
+        port = server.getsockname()[1]
+        [result] = ProbeEngine([Probe(KIND_TCP, "127.0.0.1", port)], count=3, timeout=1).run()
+    assert (result.sent, result.received, result.loss_percent, result.error) == (3, 3, 0.0, None)
+    assert result.minimum() <= result.median() <= result.p90() <= result.maximum()
+    data = result.to_dict()
+    assert data["target"] == f"127.0.0.1:{port}" and data["address"] == "127.0.0.1"
+
+
+def test_closed_tcp_port_is_refused():
+    [result] = ProbeEngine([Probe(KIND_TCP, "127.0.0.1", _free_port(socket.SOCK_STREAM))],
+                           count=2, timeout=1).run()
+    assert (result.sent, result.received, result.loss_percent) == (2, 0, 100.0)
+    assert result.error == "connection refused"
+    assert result.to_dict()["median_ms"] is None
+
+
+def test_unbound_udp_port_proves_the_host_is_up():
+    probe = Probe(KIND_PING, "127.0.0.1", _free_port(socket.SOCK_DGRAM))
+    [result] = ProbeEngine([probe], count=2, timeout=1, method=METHOD_UDP).run()
+    assert result.method == METHOD_UDP
+    assert (result.received, result.error) == (2, None)
+
+
+def test_silent_udp_port_times_out_concurrently():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(("127.0.0.1", 0))
+        port = silent.getsockname()[1]
+        engine = ProbeEngine([Probe(KIND_PING, "127.0.0.1", port)] * 4, count=1, timeout=0.3, method=METHOD_UDP)
+        results = engine.run()
+    assert all(result.received == 0 and result.error == "no reply within 0.3 s" for result in results)
+    # Four probes waiting on their deadline together, not one after another
+    assert engine.duration < 1.0
+
+
+def test_cancelled_probes_stop_attempting():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(8)
+        port = server.getsockname()[1]
+        polls = []
+
+        def is_cancelled():
+            polls.append(True)
+            return len(polls) > 1
+
+        [result] = ProbeEngine([Probe(KIND_TCP, "127.0.0.1", port)], count=5, timeout=1,
+                               is_cancelled=is_cancelled).run()
+    assert (result.sent, result.received) == (1, 1)
+
+
+def test_dns_probe_resolves_localhost():
+    [result] = ProbeEngine([Probe(KIND_DNS, "localhost")], count=1, timeout=2).run()
+    assert result.received == 1 and result.address is not None
+
+
+def test_targets_and_percentiles():
+    assert parse_target("example.com") == ("example.com", None)
+    assert parse_target("example.com:443") == ("example.com", 443)
+    assert parse_target("[::1]:53", 80) == ("::1", 53)
+    assert parse_target("::1", 80) == ("::1", 80)
+    assert percentile([4, 1, 3, 2], 0.5) == 2
+    assert percentile([4, 1, 3, 2], 0.9) == 4
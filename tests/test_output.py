@@ -0,0 +1,76 @@
+"""
+Chunked decoding and batching of script output
+"""
+
+import io
+
+from core.output import LineBatcher, stream_batches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feed_bytewise(batcher, data):
+    for i in range(len(data)):
+        batcher.feed(data[i:i + 1])
+
+
+def test_multibyte_characters_split_across_chunks():
+    # cp932 (a multibyte OEM code page) and UTF-8, fed one byte at a time
+    for encoding, text in [("cp932", "ディスク チェック 完了"), ("utf-8", "Überprüfung abgeschlossen ✓")]:
+        batcher = LineBatcher(encoding)
+        _feed_bytewise(batcher, (text + "\r\nnext\r\n").encode(encoding))
+        assert batcher.take() == [text, "next"]
+        assert batcher.total_bytes == len((text + "\r\nnext\r\n").encode(encoding))
+
+
+def test_oem_code_page_is_decoded():
+    batcher = LineBatcher("cp850")
+    batcher.feed("Fehler: Zugriff verweigert für Laufwerk Ä\n".encode("cp850"))
+    assert batcher.take() == ["Fehler: Zugriff verweigert für Laufwerk Ä"]
+
+
+def test_carriage_return_progress_keeps_the_last_update():
+    batcher = LineBatcher("utf-8")
+    batcher.feed(b"Verification 10% complete.\rVerification 55% complete.\rVerification 100% complete.\r\n")
+    batcher.feed(b"   padded   \n\r\r\n")
+    assert batcher.take() == ["Verification 100% complete.", "padded", ""]
+
+
+def test_unterminated_lines():
+    batcher = LineBatcher("utf-8", max_bytes=8)
+    batcher.feed(b"0123456789")
+    # A line without a newline is cut once it reaches max_bytes
+    assert batcher.take() == ["0123456789"]
+    batcher.feed(b"tail")
+    assert batcher.take() == []
+    assert batcher.finish() == ["tail"]
+    assert batcher.total_lines == 2
+
+
+def test_batches_are_due_by_time_or_size():
+    clock = FakeClock()
+    batcher = LineBatcher("utf-8", interval=0.05, max_bytes=100, clock=clock)
+    assert not batcher.due()
+    batcher.feed(b"one\n")
+    assert not batcher.due()
+    assert batcher.time_until_due() == 0.05
+    clock.now = 0.05
+    assert batcher.due()
+    assert batcher.take() == ["one"]
+
+    batcher.feed(b"x" * 99 + b"\n")
+    assert batcher.due()
+    assert batcher.take() == ["x" * 99]
+
+
+def test_stream_batches_yields_every_line():
+    data = b"".join(f"line {i}\r\n".encode() for i in range(10000)) + b"last"
+    lines = [line for batch in stream_batches(io.BytesIO(data), LineBatcher("utf-8"), chunk_size=4096)
+             for line in batch]
+    assert lines == [f"line {i}" for i in range(10000)] + ["last"]
@@ -0,0 +1,76 @@
+"""
+Stopping a spawned process tree: politely first, then by force
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from core.process_tree import ProcessTree, new_group_options
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses sh and POSIX signals")
+
+
+def _spawn(script):
+    """A shell that starts two background children, and their pids"""
+    process = subprocess.Popen(["sh", "-c", script], stdout=subprocess.PIPE, **new_group_options())
+    pids = [int(process.stdout.readline()) for _ in range(2)]
+    return process, pids
+
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Reaped by init or a zombie of an exited parent: gone for our purposes
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+def _wait_gone(pids, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(_running(pid) for pid in pids):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_stop_ends_a_cooperative_tree():
+    process, children = _spawn("sleep 30 & echo $!; sleep 30 & echo $!; wait")
+    tree = ProcessTree(process.pid)
+    tree.stop()
+    process.wait(timeout=3)
+    assert _wait_gone(children)
+
+
+def test_kill_ends_a_tree_that_ignores_the_polite_request():
+    # The ignored SIGTERM is inherited by the children
+    process, children = _spawn("trap '' TERM; sleep 30 & echo $!; sleep 30 & echo $!; wait")
+    tree = ProcessTree(process.pid)
+    tree.stop()
+    time.sleep(0.3)
+    assert process.poll() is None and all(_running(pid) for pid in children)
+    tree.kill()
+    process.wait(timeout=3)
+    assert _wait_gone(children)
+
+
+def test_children_that_left_the_group_are_killed():
+    pytest.importorskip("psutil")
+    # The children leave the group; only the snapshot still knows them
+    process, children = _spawn(
+        f"{sys.executable} -c 'import os, time; os.setsid(); time.sleep(30)' & echo $!; "
+        "sleep 30 & echo $!; wait")
+    tree = ProcessTree(process.pid)
+    assert sorted(p.pid for p in tree.alive()) == sorted([process.pid] + children)
+    tree.kill()
+    process.wait(timeout=3)
+    assert _wait_gone(children)
@@ -0,0 +1,39 @@
+"""
+##pct / ##phase directives in script output
+"""
+
+from core.protocol import split_directives
+
+
+def test_batch_without_directives_is_returned_as_is():
+    lines = ["[INFO] Checking", "# comment", "done"]
+    output, percent, phases = split_directives(lines)
+    assert output is lines
+    assert (percent, phases) == (None, [])
+
+
+def test_directives_are_taken_out_of_the_output():
+    output, percent, phases = split_directives([
+        "##phase \"DISM health check\"",
+        "Scanning...",
+        "##pct 40",
+        "##pct 55.7",
+        "##phase SFC scan ",
+        "Done",
+    ])
+    assert output == ["Scanning...", "Done"]
+    # The last percentage of the batch wins
+    assert percent == 55
+    assert phases == ["DISM health check", "SFC scan"]
+
+
+def test_percentages_are_clamped():
+    assert split_directives(["##pct 150"])[1] == 100
+    assert split_directives(["##pct -5"])[1] == 0
+
+
+def test_malformed_directives_stay_output():
+    lines = ["##pct", "##pct lots", "##progress 5", "## pct 5", "##pct  7"]
+    output, percent, phases = split_directives(lines)
+    assert output == lines[:4]
+    assert percent == 7 and phases == []
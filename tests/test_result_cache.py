@@ -0,0 +1,54 @@
+"""
+ResultCache invalidation while read-only tools are running
+"""
+
+from core.catalog import Category, ToolCatalog, ToolSpec
+from core.execution import ExecutionResult
+from core.result_cache import ResultCache
+
+
+def _cache(tmp_path):
+    for script in ("devices.bat", "reset.bat"):
+        (tmp_path / script).write_text("@echo off\n")
+    tools = [
+        ToolSpec("devices", "Devices", "devices.bat", "test", read_only=True, resources=["devices"], cache_ttl=300),
+        ToolSpec("reset", "Reset", "reset.bat", "test", resources=["devices"]),
+    ]
+    catalog = ToolCatalog([Category("test", "Test")], tools, scripts_dir=str(tmp_path))
+    return ResultCache(catalog), str(tmp_path / "devices.bat"), str(tmp_path / "reset.bat")
+
+
+def _ok():
+    return ExecutionResult("Devices", True, "done", 0)
+
+
+def test_result_is_stored_and_dropped_by_a_mutating_tool(tmp_path):
+    cache, devices, reset = _cache(tmp_path)
+    key = cache.key(devices)
+    cache.store(key, ["disk0"], _ok(), cache.generation)
+    assert cache.lookup(key).lines == ["disk0"]
+    assert cache.tool_ran(reset) == 1
+    assert cache.lookup(key) is None
+
+
+def test_run_overlapping_an_invalidation_is_not_stored(tmp_path):
+    cache, devices, reset = _cache(tmp_path)
+    generation = cache.generation
+    key = cache.key(devices)
+    # The reset finishes while the device list is still being read
+    cache.tool_ran(reset)
+    cache.store(key, ["disk0"], _ok(), generation)
+    assert cache.lookup(key) is None
+
+    generation = cache.generation
+    cache.clear()
+    cache.store(key, ["disk0"], _ok(), generation)
+    assert len(cache) == 0
+
+
+def test_read_only_tools_do_not_invalidate(tmp_path):
+    cache, devices, _ = _cache(tmp_path)
+    generation = cache.generation
+    assert cache.tool_ran(devices) == 0
+    cache.store(cache.key(devices), ["disk0"], _ok(), generation)
+    assert len(cache) == 1
@@ -0,0 +1,104 @@
+"""
+SuiteScheduler dependency and resource rules
+"""
+
+import pytest
+
+from core.scheduler import ScheduledTask, SchedulerError, SuiteScheduler
+
+
+def _names(tasks):
+    return [task.name for task in tasks]
+
+
+def test_independent_tasks_start_together():
+    scheduler = SuiteScheduler([ScheduledTask("a", ["dns"]), ScheduledTask("b", ["audio"]), ScheduledTask("c")])
+    assert _names(scheduler.next_ready()) == ["a", "b", "c"]
+    assert scheduler.next_ready() == []
+
+
+def test_conflicting_tasks_run_in_declaration_order():
+    scheduler = SuiteScheduler([ScheduledTask("a", ["network"]), ScheduledTask("b", ["network", "dns"])])
+    assert _names(scheduler.next_ready()) == ["a"]
+    assert scheduler.next_ready() == []
+    scheduler.mark_finished("a", True)
+    assert _names(scheduler.next_ready()) == ["b"]
+
+
+def test_blocked_task_holds_its_resources():
+    # b waits for a on "network"; c only conflicts with b, but must not overtake it
+    scheduler = SuiteScheduler([
+        ScheduledTask("a", ["network"]),
+        ScheduledTask("b", ["network", "dns"]),
+        ScheduledTask("c", ["dns"]),
+        ScheduledTask("d", ["audio"]),
+    ])
+    assert _names(scheduler.next_ready()) == ["a", "d"]
+    scheduler.mark_finished("a", True)
+    assert _names(scheduler.next_ready()) == ["b"]
+    scheduler.mark_finished("b", True)
+    assert _names(scheduler.next_ready()) == ["c"]
+
+
+def test_dependencies_wait_for_success():
+    scheduler = SuiteScheduler([
+        ScheduledTask("flush", ["dns"]),
+        ScheduledTask("reset", ["network"], depends_on=["flush"]),
+        ScheduledTask("check", [], depends_on=["reset"]),
+    ])
+    assert _names(scheduler.next_ready()) == ["flush"]
+    scheduler.mark_finished("flush", True)
+    assert _names(scheduler.next_ready()) == ["reset"]
+    scheduler.mark_finished("reset", True)
+    assert _names(scheduler.next_ready()) == ["check"]
+    scheduler.mark_finished("check", True)
+    assert scheduler.is_done()
+    assert scheduler.summary() == {ScheduledTask.SUCCEEDED: 3}
+
+
+def test_waiting_on_a_dependency_reserves_nothing():
+    # b is not ready yet, so c may use "dns" meanwhile
+    scheduler = SuiteScheduler([
+        ScheduledTask("a"),
+        ScheduledTask("b", ["dns"], depends_on=["a"]),
+        ScheduledTask("c", ["dns"]),
+    ])
+    assert _names(scheduler.next_ready()) == ["a", "c"]
+
+
+def test_failure_skips_dependents_transitively():
+    scheduler = SuiteScheduler([
+        ScheduledTask("a"),
+        ScheduledTask("b", depends_on=["a"]),
+        ScheduledTask("c", depends_on=["b"]),
+        ScheduledTask("d"),
+    ])
+    assert _names(scheduler.next_ready()) == ["a", "d"]
+    scheduler.mark_finished("a", False)
+    scheduler.mark_finished("d", True)
+    assert scheduler.next_ready() == []
+    assert scheduler.get("b").state == scheduler.get("c").state == ScheduledTask.SKIPPED
+    assert scheduler.is_done()
+    assert scheduler.finished_count() == 4
+
+
+def test_cancel_skips_pending_tasks():
+    scheduler = SuiteScheduler([ScheduledTask("a", ["x"]), ScheduledTask("b", ["x"])])
+    scheduler.next_ready()
+    scheduler.cancel()
+    assert _names(scheduler.running()) == ["a"]
+    assert scheduler.get("b").state == ScheduledTask.SKIPPED
+    scheduler.mark_finished("a", True)
+    assert scheduler.is_done()
+
+
+def test_invalid_suites_are_rejected():
+    with pytest.raises(SchedulerError, match="unknown"):
+        SuiteScheduler([ScheduledTask("a", depends_on=["missing"])])
+    with pytest.raises(SchedulerError, match="cycle"):
+        SuiteScheduler([ScheduledTask("a", depends_on=["b"]), ScheduledTask("b", depends_on=["a"])])
+    with pytest.raises(SchedulerError, match="Duplicate"):
+        SuiteScheduler([ScheduledTask("a"), ScheduledTask("a")])
+    scheduler = SuiteScheduler([ScheduledTask("a")])
+    with pytest.raises(SchedulerError):
+        scheduler.mark_finished("a", True)
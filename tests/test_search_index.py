@@ -0,0 +1,101 @@
+"""
+Incremental full-text search over the session log
+"""
+
+from core.search_index import GALLOP_RATIO, SearchIndex, match_spans, tokenize
+
+LINES = [
+    "[10:00:01] Checking disk C: for errors",
+    "[10:00:02] [WARNING] Disk C: is running low",
+    "[10:00:03] Network adapter reset",
+    "[10:00:04] [ERROR] Disk D: failed to respond",
+    "[10:00:05] DNS cache flushed",
+]
+
+
+def _index(lines=LINES, first=0):
+    index = SearchIndex(skip=r"\[\d\d:\d\d:\d\d\] ")
+    index.add(first, lines)
+    return index
+
+
+def test_every_term_must_match():
+    index = _index()
+    assert list(index.search("disk")) == [0, 1, 3]
+    assert list(index.search("disk warning")) == [1]
+    assert list(index.search("DISK   errors")) == [0]
+    assert list(index.search("disk dns")) == []
+    assert list(index.search("unknownword")) == []
+    assert list(index.search("")) == [] and list(index.search("  !! ")) == []
+
+
+def test_last_term_matches_as_a_prefix():
+    index = _index()
+    assert list(index.search("net")) == [2]
+    assert list(index.search("disk fail")) == [3]
+    assert list(index.search("fl")) == [4]
+    # Earlier terms must match whole tokens
+    assert list(index.search("fl cache")) == []
+
+
+def test_skipped_prefix_and_short_tokens_are_not_indexed():
+    index = _index()
+    assert list(index.search("10")) == []
+    assert tokenize("a C: is OK") == {"is", "ok"}
+    # Terms too short to be indexed don't narrow the search
+    assert list(index.search("c disk")) == [0, 1, 3]
+
+
+def test_numbers_continue_across_batches():
+    index = _index(LINES[:2], first=100)
+    index.add(102, LINES[2:])
+    assert list(index.search("disk")) == [100, 101, 103]
+    assert index.line_count == len(LINES)
+    index.clear()
+    assert list(index.search("disk")) == [] and len(index) == 0
+
+
+def test_rare_term_intersects_with_a_long_posting_list():
+    common = ["common word"] * (GALLOP_RATIO * 20)
+    index = SearchIndex()
+    index.add(0, common + ["common rare"] + common + ["rare common"])
+    total = len(common) * 2 + 2
+    assert list(index.search("rare common")) == [len(common), total - 1]
+    assert list(index.search("common rare")) == [len(common), total - 1]
+
+
+def test_results_do_not_grow_with_the_index():
+    index = _index()
+    found = index.search("disk")
+    index.add(5, ["Disk E: ok"])
+    assert list(found) == [0, 1, 3]
+    assert list(index.search("disk")) == [0, 1, 3, 5]
+
+
+def test_match_spans_highlight_terms_and_prefix():
+    line = "Disk C: failed, disk D: fine"
+    assert match_spans(line, "disk fi") == [(0, 4), (16, 20), (24, 28)]
+    assert [line[start:end] for start, end in match_spans(line, "fail")] == ["failed"]
+    assert match_spans(line, "") == []
+
+
+def test_prune_forgets_evicted_lines():
+    index = _index()
+    assert len(index) and list(index.search("disk")) == [0, 1, 3]
+    index.prune(2)
+    assert list(index.search("disk")) == [3]
+    assert index.line_count == 3 and index.first_number == 2
+    # Tokens only the evicted lines had are gone, from prefix lookups too
+    assert list(index.search("check")) == [] and list(index.search("warn")) == []
+    assert list(index.search("net")) == [2]
+    index.add(5, ["Checking again"])
+    assert list(index.search("check")) == [5]
+
+
+def test_prune_below_the_first_line_changes_nothing():
+    index = _index(first=10)
+    tokens = len(index)
+    index.prune(5)
+    assert len(index) == tokens and index.line_count == len(LINES)
+    index.prune(100)
+    assert len(index) == 0 and index.line_count == 0
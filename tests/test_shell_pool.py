@@ -0,0 +1,63 @@
+"""
+ShellHostPool framing and exit codes, with bash standing in for PowerShell
+"""
+
+import shutil
+import threading
+
+import pytest
+
+from core.shell_pool import POSIX_SH, ShellDialect, ShellHostError, ShellHostPool
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+
+BASH = ShellDialect("bash", ["bash"], POSIX_SH.wrap_template)
+
+
+@pytest.fixture
+def pool():
+    pool = ShellHostPool(BASH, size=1)
+    yield pool
+    pool.close()
+
+
+def test_exit_codes(pool):
+    assert pool.run("true").exit_code == 0
+    assert pool.run("false").exit_code == 1
+    result = pool.run("(exit 42)")
+    assert result.exit_code == 42 and not result.ok
+    # The host survives a failing command
+    assert pool.run("echo still here").lines == ["still here"]
+
+
+def test_output_is_framed_by_the_marker(pool):
+    seen = []
+    result = pool.run("echo one; echo two; printf 'no newline'", on_line=seen.append)
+    # Output without a trailing newline shares the marker's line and is split off it
+    assert result.lines == seen == ["one", "two", "no newline"]
+    assert pool.run("echo __PCT_END_fake__ 3").lines == ["__PCT_END_fake__ 3"]
+
+
+def test_hosts_are_reused(pool):
+    first = pool.run("echo $$").lines
+    assert pool.run("echo $$").lines == first
+
+
+def test_timeout_kills_and_replaces_the_host(pool):
+    with pytest.raises(ShellHostError):
+        pool.run("sleep 30", timeout=0.3)
+    assert pool.run("echo replaced").lines == ["replaced"]
+
+
+def test_acquire_gives_up_on_cancel(pool):
+    host = pool.acquire()
+    cancelled = threading.Event()
+    threading.Timer(0.3, cancelled.set).start()
+    with pytest.raises(ShellHostError):
+        pool.acquire(cancelled=cancelled.is_set)
+    with pytest.raises(ShellHostError):
+        pool.acquire(timeout=0.2)
+    pool.release(host)
+    again = pool.acquire(timeout=1)
+    pool.release(again)
+    assert again is host
@@ -0,0 +1,64 @@
+"""
+Deadlines on the shared timer wheel
+"""
+
+import threading
+import time
+
+from core.timer_wheel import TimerWheel
+
+
+def _wait(event, timeout=2.0):
+    return event.wait(timeout)
+
+
+def test_callbacks_fire_after_their_delay_in_order():
+    wheel = TimerWheel(tick=0.01, slots=8)
+    fired = []
+    done = threading.Event()
+    started = time.monotonic()
+    # 0.15 s is more than one lap of the 8 x 10 ms ring
+    wheel.schedule(0.15, lambda: (fired.append(("late", time.monotonic() - started)), done.set()))
+    wheel.schedule(0.03, lambda: fired.append(("early", time.monotonic() - started)))
+    assert len(wheel) == 2
+    assert _wait(done)
+    assert [name for name, _ in fired] == ["early", "late"]
+    # Deadlines are kept at tick resolution
+    assert fired[0][1] >= 0.02 and fired[1][1] >= 0.14
+    assert len(wheel) == 0
+
+
+def test_cancelled_timers_never_fire():
+    wheel = TimerWheel(tick=0.01)
+    fired = []
+    done = threading.Event()
+    timer = wheel.schedule(0.05, lambda: fired.append("cancelled"))
+    wheel.schedule(0.1, done.set)
+    assert wheel.cancel(timer)
+    assert not wheel.cancel(timer)
+    assert not wheel.cancel(None)
+    assert _wait(done)
+    assert fired == []
+
+
+def test_a_failing_callback_does_not_stop_the_wheel():
+    wheel = TimerWheel(tick=0.01)
+    done = threading.Event()
+    wheel.schedule(0.01, lambda: 1 / 0)
+    timer = wheel.schedule(0.03, done.set)
+    assert _wait(done)
+    assert timer.fired and not wheel.cancel(timer)
+
+
+def test_idle_wheel_restarts_from_now():
+    wheel = TimerWheel(tick=0.01)
+    first = threading.Event()
+    wheel.schedule(0.01, first.set)
+    assert _wait(first)
+    time.sleep(0.1)
+    # Time spent idle must not make a new timer fire early
+    second = threading.Event()
+    started = time.monotonic()
+    wheel.schedule(0.05, second.set)
+    assert _wait(second)
+    assert time.monotonic() - started >= 0.04
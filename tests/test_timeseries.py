@@ -0,0 +1,55 @@
+"""
+Multi-resolution metric archives
+"""
+
+import math
+
+from core.timeseries import Archive, TimeSeriesStore
+
+
+def _known(values):
+    return [value for value in values if not math.isnan(value)]
+
+
+def test_samples_in_one_slot_are_averaged():
+    archive = Archive(10, 6)
+    for timestamp, value in [(100, 10.0), (104, 20.0), (109, 60.0)]:
+        archive.add(timestamp, value)
+    assert len(archive.series()) == 6 and _known(archive.series()) == [30.0]
+    archive.add(110, 5.0)
+    assert _known(archive.series(2)) == [30.0, 5.0]
+
+
+def test_skipped_slots_are_gaps_and_old_slots_wrap():
+    archive = Archive(1, 4)
+    archive.add(0, 1.0)
+    archive.add(3, 4.0)
+    series = archive.series()
+    assert series[0] == 1.0 and math.isnan(series[1]) and math.isnan(series[2]) and series[3] == 4.0
+    # A lap later the oldest value has been overwritten
+    archive.add(4, 5.0)
+    assert _known(archive.series()) == [4.0, 5.0]
+    # Asking past the newest slot pads with gaps
+    assert math.isnan(archive.series(2, now=6)[-1])
+
+
+def test_clock_going_backwards_folds_into_the_newest_slot():
+    archive = Archive(1, 4)
+    archive.add(10, 2.0)
+    archive.add(8, 4.0)
+    assert _known(archive.series()) == [3.0]
+
+
+def test_series_come_from_the_finest_archive_that_spans_them():
+    store = TimeSeriesStore(((1, 60), (10, 60), (60, 60)))
+    for second in range(0, 600):
+        store.add("cpu", second, float(second % 20))
+    # 30 s fit the 1 s archive
+    assert store.series("cpu", 30) == [float(second % 20) for second in range(570, 600)]
+    # 5 min need the 10 s archive, averaged per 10 s slot
+    assert store.series("cpu", 300) == [4.5 if slot % 2 == 0 else 14.5 for slot in range(30, 60)]
+    # Longer than any archive: the coarsest one
+    assert len(store.series("cpu", 7200)) == 60
+    assert store.average("cpu", 30) == sum(second % 20 for second in range(570, 600)) / 30
+    assert store.series("missing", 30) == [] and store.average("missing", 30) is None
+    assert store.names() == ["cpu"]
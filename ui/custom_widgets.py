@@ -2,9 +2,12 @@
 Custom widgets for professional UI styling
 """
 
-from PyQt6.QtWidgets import QPushButton, QFrame, QLabel
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtProperty
-from PyQt6.QtGui import QPainter, QColor, QPalette
+import math
+from PyQt6.QtWidgets import QPushButton, QFrame, QLabel, QWidget
+from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QPointF, pyqtProperty
+from PyQt6.QtGui import QPainter, QColor, QPalette, QPen
+
+from ui.themes import repolish
 
 class AnimatedButton(QPushButton):
     """A button with hover animations"""
@@ -50,29 +53,84 @@ class ProfessionalCard(QFrame):
 class StatusIndicator(QLabel):
     """A status indicator with color coding"""
     
+    # Parsed once per widget; set_status only flips the "status" property
+    STYLESHEET = """
+        QLabel {
+            border-radius: 6px;
+            background-color: #6c757d;
+        }
+        QLabel[status="ready"] {
+            background-color: #28a745;
+        }
+        QLabel[status="running"] {
+            background-color: #ffc107;
+        }
+        QLabel[status="error"] {
+            background-color: #dc3545;
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setFixedSize(12, 12)
-        self.setStyleSheet("""
-            QLabel {
-                border-radius: 6px;
-                background-color: #28a745;
-            }
-        """)
+        self.setProperty("status", "ready")
+        self.setStyleSheet(self.STYLESHEET)
     
     def set_status(self, status):
         """Set status: 'ready', 'running', 'error'"""
-        colors = {
-            'ready': '#28a745',   # Green
-            'running': '#ffc107', # Yellow
-            'error': '#dc3545'    # Red
-        }
+        if self.property("status") == status:
+            return
+        self.setProperty("status", status)
+        repolish(self)
+
+class Sparkline(QWidget):
+    """A minimal line chart for a short series of values"""
+    
+    def __init__(self, color="#00ff00", parent=None):
+        super().__init__(parent)
+        self.values = []
+        self.color = QColor(color)
+        self.minimum = None
+        self.maximum = None
+        self.setMinimumSize(60, 24)
+    
+    def set_range(self, minimum, maximum):
+        """Fix the vertical scale (otherwise it follows the data)"""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.update()
+    
+    def set_values(self, values):
+        """Set the series to draw; NaN entries are gaps"""
+        self.values = list(values)
+        self.update()
+    
+    def paintEvent(self, event):
+        known = [v for v in self.values if not math.isnan(v)]
+        if len(self.values) < 2 or not known:
+            return
         
-        color = colors.get(status, '#6c757d')
-        self.setStyleSheet(f"""
-            QLabel {{
-                border-radius: 6px;
-                background-color: {color};
-            }}
-        """)
+        low = self.minimum if self.minimum is not None else min(known)
+        high = self.maximum if self.maximum is not None else max(known)
+        if high <= low:
+            high = low + 1
+        
+        width = self.width() - 2
+        height = self.height() - 2
+        step = width / (len(self.values) - 1)
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.color, 1.5))
+        
+        previous = None
+        for i, value in enumerate(self.values):
+            if math.isnan(value):
+                previous = None
+                continue
+            point = QPointF(1 + i * step, 1 + height - (min(max(value, low), high) - low) / (high - low) * height)
+            if previous is not None:
+                painter.drawLine(previous, point)
+            previous = point
+        painter.end()
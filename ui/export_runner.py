@@ -0,0 +1,32 @@
+"""
+Log export thread
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.log_export import ExportCancelled, LogExport
+
+
+class LogExportRunner(QThread):
+    """Writes a log snapshot to disk off the GUI thread"""
+    # Lines written so far and in total
+    progress_update = pyqtSignal(int, int)
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, snapshot, path, tool_spans=(), parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.export = LogExport(snapshot, path, tool_spans=tool_spans, on_progress=self.progress_update.emit)
+
+    def cancel(self):
+        self.export.cancel()
+
+    def run(self):
+        try:
+            count = self.export.run()
+        except ExportCancelled:
+            self.finished_signal.emit(False, "Export cancelled")
+        except (OSError, ValueError) as e:
+            self.finished_signal.emit(False, str(e))
+        else:
+            self.finished_signal.emit(True, f"{count} lines exported")
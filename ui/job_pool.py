@@ -0,0 +1,197 @@
+"""
+Bounded job pool for running troubleshooting scripts concurrently
+"""
+
+import itertools
+from collections import deque
+from PyQt6.QtCore import QDeadlineTimer, QObject, pyqtSignal
+
+from ui.script_runner import ScriptRunner
+
+
+class JobHandle:
+    """Handle for a single submitted job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id, script_path, tool_name, collector=None, force_refresh=False, timeout=None):
+        self.job_id = job_id
+        self.script_path = script_path
+        self.tool_name = tool_name
+        self.collector = collector
+        # Bypass the result cache for this run
+        self.force_refresh = force_refresh
+        # Seconds the job may run before its process tree is stopped (None = no limit)
+        self.timeout = timeout
+        self.state = JobHandle.QUEUED
+        self.runner = None
+        self.report = None
+        self.success = None
+        self.message = ""
+        # Estimated seconds remaining while running (-1 when unknown)
+        self.eta = -1
+        # Current phase announced by the script, if any
+        self.phase = ""
+
+    def is_active(self):
+        """Return True while the job is queued or running"""
+        return self.state in (JobHandle.QUEUED, JobHandle.RUNNING)
+
+
+class JobPool(QObject):
+    """Runs at most ``max_workers`` ScriptRunner threads, queueing the rest"""
+    job_queued = pyqtSignal(int)
+    job_started = pyqtSignal(int)
+    job_output = pyqtSignal(int, list)
+    job_progress = pyqtSignal(int, int)
+    job_eta = pyqtSignal(int, float)
+    job_phase = pyqtSignal(int, str)
+    job_finished = pyqtSignal(int, bool, str)
+    pool_changed = pyqtSignal()
+
+    def __init__(self, max_workers=3, shell_pool=None, durations=None, cache=None, isolated=False, parent=None):
+        super().__init__(parent)
+        self.max_workers = max(1, int(max_workers))
+        # Optional ShellHostPool for scripts that can be run in warm shells
+        self.shell_pool = shell_pool
+        # Optional DurationModel for progress/ETA estimates and run history
+        self.durations = durations
+        # Optional ResultCache for read-only tools
+        self.cache = cache
+        # Run each job in a worker process instead of a thread of this one
+        self.isolated = isolated
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._queue = deque()
+        self._running = set()
+
+    def submit(self, script_path, tool_name, collector=None, force_refresh=False, timeout=None):
+        """Queue a script (or its native collector) for execution and return its JobHandle"""
+        handle = JobHandle(next(self._ids), script_path, tool_name, collector, force_refresh, timeout)
+        self._jobs[handle.job_id] = handle
+        self._queue.append(handle)
+        self.job_queued.emit(handle.job_id)
+        self._start_next()
+        self.pool_changed.emit()
+        return handle
+
+    def get(self, job_id):
+        """Return the handle for an active job, or None"""
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        """Return handles of all queued and running jobs in submission order"""
+        return [self._jobs[job_id] for job_id in sorted(self._jobs)]
+
+    def running_count(self):
+        return len(self._running)
+
+    def queued_count(self):
+        return len(self._queue)
+
+    def active_count(self):
+        """Number of jobs that are running or waiting for a slot"""
+        return len(self._running) + len(self._queue)
+
+    def set_max_workers(self, max_workers):
+        """Resize the pool; extra queued jobs start immediately if it grew"""
+        self.max_workers = max(1, int(max_workers))
+        self._start_next()
+        self.pool_changed.emit()
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job. Returns False if it is unknown"""
+        handle = self._jobs.get(job_id)
+        if handle is None or not handle.is_active():
+            return False
+
+        if handle.state == JobHandle.QUEUED:
+            self._queue.remove(handle)
+            handle.state = JobHandle.CANCELLED
+            self._complete(handle, False, f"🛑 {handle.tool_name} cancelled before start")
+            self._jobs.pop(job_id, None)
+            self.pool_changed.emit()
+        else:
+            handle.state = JobHandle.CANCELLED
+            handle.runner.cancel()
+        return True
+
+    def cancel_all(self):
+        """Cancel every queued and running job. Returns the number cancelled"""
+        # Drop the queue first so cancelled runners don't free slots for it
+        cancelled = 0
+        for handle in list(self._queue):
+            cancelled += self.cancel(handle.job_id)
+        for job_id in list(self._running):
+            cancelled += self.cancel(job_id)
+        return cancelled
+
+    def wait_all(self, msecs):
+        """Block until every runner thread has stopped. Returns False if ``msecs`` ran out first"""
+        deadline = QDeadlineTimer(msecs)
+        for handle in list(self._jobs.values()):
+            runner = handle.runner
+            if runner is not None and not runner.wait(deadline):
+                return False
+        return True
+
+    def _start_next(self):
+        """Start queued jobs while there are free slots"""
+        while self._queue and len(self._running) < self.max_workers:
+            handle = self._queue.popleft()
+            runner = ScriptRunner(handle.script_path, handle.tool_name, handle.job_id,
+                                  handle.collector, self.shell_pool, self.durations,
+                                  self.cache, handle.force_refresh, self.isolated, handle.timeout)
+            runner.report_ready.connect(
+                lambda report, handle=handle: setattr(handle, "report", report))
+            runner.output_batch.connect(
+                lambda lines, job_id=handle.job_id: self.job_output.emit(job_id, lines))
+            runner.progress_update.connect(
+                lambda value, job_id=handle.job_id: self.job_progress.emit(job_id, value))
+            runner.eta_update.connect(
+                lambda seconds, handle=handle: self._on_eta(handle, seconds))
+            runner.phase_update.connect(
+                lambda phase, handle=handle: self._on_phase(handle, phase))
+            runner.finished_signal.connect(
+                lambda success, message, job_id=handle.job_id: self._on_runner_finished(job_id, success, message))
+            runner.finished.connect(
+                lambda job_id=handle.job_id: self._on_thread_finished(job_id))
+            handle.runner = runner
+            handle.state = JobHandle.RUNNING
+            self._running.add(handle.job_id)
+            runner.start()
+            self.job_started.emit(handle.job_id)
+
+    def _on_eta(self, handle, seconds):
+        handle.eta = seconds
+        self.job_eta.emit(handle.job_id, seconds)
+
+    def _on_phase(self, handle, phase):
+        handle.phase = phase
+        self.job_phase.emit(handle.job_id, phase)
+
+    def _complete(self, handle, success, message):
+        handle.success = success
+        handle.message = message
+        self.job_finished.emit(handle.job_id, success, message)
+
+    def _on_runner_finished(self, job_id, success, message):
+        handle = self._jobs.get(job_id)
+        if handle is None:
+            return
+        self._running.discard(job_id)
+        if handle.state != JobHandle.CANCELLED:
+            handle.state = JobHandle.FINISHED
+        self._complete(handle, success, message)
+        self._start_next()
+        self.pool_changed.emit()
+
+    def _on_thread_finished(self, job_id):
+        # Release the handle once the QThread has fully stopped
+        handle = self._jobs.pop(job_id, None)
+        if handle is not None and handle.runner is not None:
+            handle.runner.deleteLater()
+            handle.runner = None
@@ -0,0 +1,334 @@
+"""
+Virtualized output console backed by a LogStore, with an indexed search bar
+"""
+
+from bisect import bisect_left
+
+from PyQt6.QtWidgets import (QListView, QAbstractItemView, QApplication, QStyledItemDelegate, QStyle,
+                             QStyleOptionViewItem, QWidget, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+                             QCheckBox)
+from PyQt6.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QRect, QTimer
+from PyQt6.QtGui import QKeySequence, QColor
+
+from core.search_index import match_spans
+
+# Overlays painted on search matches (the console is dark in both themes)
+MATCH_COLOR = QColor(255, 213, 79, 110)
+CURRENT_MATCH_COLOR = QColor(255, 152, 0, 90)
+
+# Milliseconds between search refreshes while output keeps arriving
+SEARCH_REFRESH_MS = 250
+
+
+class LogListModel(QAbstractListModel):
+    """List model exposing the in-memory lines of a LogStore"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.store[index.row()]
+        return None
+
+    def number(self, row):
+        """Session line number shown in a row"""
+        return self.store.first_number() + row
+
+    def row(self, number):
+        """Row showing a line number, or -1 if it is no longer in memory"""
+        row = number - self.store.first_number()
+        return row if 0 <= row < len(self.store) else -1
+
+    def append_lines(self, lines):
+        """Append lines, evicting the oldest rows once the store is full; returns the first line's number"""
+        lines = [part for line in lines for part in str(line).split("\n")]
+        if not lines:
+            return None
+
+        keep = min(len(lines), self.store.capacity)
+        removed = min(len(self.store), max(0, len(self.store) + keep - self.store.capacity))
+        if removed:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            self.store.evict(removed)
+            self.endRemoveRows()
+
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + keep - 1)
+        number = self.store.extend(lines)
+        self.endInsertRows()
+        return number
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
+
+
+class FilteredLogModel(QAbstractListModel):
+    """Only the in-memory lines of a LogStore with the given numbers (search filter)"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.numbers = []
+
+    def set_numbers(self, numbers):
+        self.beginResetModel()
+        first = self.store.first_number()
+        self.numbers = numbers[bisect_left(numbers, first):]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.numbers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            row = self.numbers[index.row()] - self.store.first_number()
+            # Evicted since the filter was applied
+            return self.store[row] if row >= 0 else ""
+        return None
+
+    def number(self, row):
+        return self.numbers[row]
+
+    def row(self, number):
+        row = bisect_left(self.numbers, number)
+        return row if row < len(self.numbers) and self.numbers[row] == number else -1
+
+
+class SearchHighlightDelegate(QStyledItemDelegate):
+    """Paints the console's search matches over the matching words"""
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        console = self.parent()
+        if not console.search_query:
+            return
+        number = index.model().number(index.row())
+        if not console.is_match(number):
+            return
+        if number == console.current_number:
+            painter.fillRect(option.rect, CURRENT_MATCH_COLOR)
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget is not None else QApplication.style()
+        rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, opt, opt.widget)
+        left = rect.left() + style.pixelMetric(QStyle.PixelMetric.PM_FocusFrameHMargin, None, opt.widget) + 1
+        metrics = opt.fontMetrics
+        text = opt.text
+        for start, end in match_spans(text, console.search_query):
+            x = left + metrics.horizontalAdvance(text[:start])
+            painter.fillRect(QRect(x, rect.top(), metrics.horizontalAdvance(text[start:end]), rect.height()),
+                             MATCH_COLOR)
+
+
+class LogConsole(QListView):
+    """Read-only console that only renders the visible lines"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.log_model = LogListModel(store, self)
+        self.filter_model = FilteredLogModel(store, self)
+        self.setModel(self.log_model)
+        self.setItemDelegate(SearchHighlightDelegate(self))
+        # Uniform rows let the view skip measuring every line
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        # Current search: query, ascending matching line numbers and the selected match
+        self.search_query = ""
+        self.matches = []
+        self.current_number = None
+
+    @property
+    def store(self):
+        return self.log_model.store
+
+    def append_lines(self, lines):
+        """Append lines and follow the tail if the view was at the bottom; returns the first line's number"""
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 1
+        number = self.log_model.append_lines(lines)
+        if at_bottom:
+            self.scrollToBottom()
+        return number
+
+    def append(self, text):
+        self.append_lines([text])
+
+    def clear(self):
+        self.log_model.clear()
+        # Keep the query so new output is searched as it arrives
+        self.set_search(self.search_query, [])
+
+    def toPlainText(self):
+        return "\n".join(self.store.recent())
+
+    def is_match(self, number):
+        position = bisect_left(self.matches, number)
+        return position < len(self.matches) and self.matches[position] == number
+
+    def set_search(self, query, matches):
+        """Show a search result; the selected match is kept if it still matches"""
+        self.search_query = query
+        self.matches = matches
+        if self.current_number is not None and not self.is_match(self.current_number):
+            self.current_number = None
+        if self.model() is self.filter_model:
+            self.filter_model.set_numbers(matches)
+        self.viewport().update()
+
+    def set_filtered(self, filtered):
+        """Show only the matching lines, or every line"""
+        model = self.filter_model if filtered else self.log_model
+        if self.model() is model:
+            return
+        if filtered:
+            self.filter_model.set_numbers(self.matches)
+        self.setModel(model)
+        if self.current_number is not None:
+            self._show_number(self.current_number)
+
+    def visible_matches(self):
+        """Matches still held in memory, i.e. the ones the console can show"""
+        return self.matches[bisect_left(self.matches, self.store.first_number()):]
+
+    def jump(self, step):
+        """Select the next (step 1) or previous (step -1) match; returns its position and the match count"""
+        matches = self.visible_matches()
+        if not matches:
+            return None, 0
+        if self.current_number is None:
+            # Start from the first line on screen
+            top = self.indexAt(self.viewport().rect().topLeft())
+            start = self.model().number(top.row()) if top.isValid() else matches[0]
+            position = bisect_left(matches, start)
+            if step < 0:
+                position -= 1
+        else:
+            position = bisect_left(matches, self.current_number) + step
+        position %= len(matches)
+        self.current_number = matches[position]
+        self._show_number(self.current_number)
+        self.viewport().update()
+        return position, len(matches)
+
+    def _show_number(self, number):
+        row = self.model().row(number)
+        if row >= 0:
+            index = self.model().index(row)
+            self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+            self.setCurrentIndex(index)
+
+    def setText(self, text):
+        self.clear()
+        self.append(text)
+
+    def keyPressEvent(self, event):
+        """Copy the selected lines with the standard copy shortcut"""
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            model = self.model()
+            QApplication.clipboard().setText("\n".join(model.data(model.index(row)) for row in rows))
+            return
+        super().keyPressEvent(event)
+
+
+class ConsoleSearchBar(QWidget):
+    """Search field with match count, next/previous and filter toggle for a LogConsole"""
+
+    def __init__(self, console, parent=None):
+        super().__init__(parent)
+        self.setObjectName("consoleSearchBar")
+        self.console = console
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(6, 4, 6, 4)
+
+        self.field = QLineEdit()
+        self.field.setObjectName("consoleSearch")
+        self.field.setPlaceholderText("🔍 Search console (Ctrl+F)")
+        self.field.setClearButtonEnabled(True)
+        self.field.textChanged.connect(self.refresh)
+        # Enter, Shift+Enter and Esc are all handled in eventFilter
+        self.field.installEventFilter(self)
+        layout.addWidget(self.field, 1)
+
+        self.count_label = QLabel("")
+        layout.addWidget(self.count_label)
+
+        previous_button = QPushButton("▲")
+        previous_button.setToolTip("Previous match (Shift+Enter)")
+        previous_button.clicked.connect(self.previous_match)
+        layout.addWidget(previous_button)
+
+        next_button = QPushButton("▼")
+        next_button.setToolTip("Next match (Enter)")
+        next_button.clicked.connect(self.next_match)
+        layout.addWidget(next_button)
+
+        self.filter_box = QCheckBox("Only matches")
+        self.filter_box.toggled.connect(self.console.set_filtered)
+        layout.addWidget(self.filter_box)
+
+        # New output updates the result at most every SEARCH_REFRESH_MS
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(SEARCH_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        console.log_model.rowsInserted.connect(self._output_added)
+
+    def focus(self):
+        self.field.setFocus()
+        self.field.selectAll()
+
+    def _output_added(self):
+        if self.console.search_query and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def refresh(self):
+        """Run the query against the store's index and update the console"""
+        query = self.field.text().strip()
+        index = self.console.store.index
+        matches = index.search(query) if query and index is not None else []
+        self.console.set_search(query, matches)
+        self._update_count()
+
+    def _update_count(self, position=None):
+        if not self.console.search_query:
+            self.count_label.setText("")
+            return
+        total = len(self.console.visible_matches())
+        if position is None:
+            self.count_label.setText(f"{total} match(es)" if total else "No matches")
+        else:
+            self.count_label.setText(f"{position + 1} of {total}")
+
+    def next_match(self):
+        position, _ = self.console.jump(1)
+        self._update_count(position)
+
+    def previous_match(self):
+        position, _ = self.console.jump(-1)
+        self._update_count(position)
+
+    def eventFilter(self, watched, event):
+        """Enter: next match, Shift+Enter: previous match, Esc: clear the search"""
+        if watched is self.field and event.type() == QEvent.Type.KeyPress:
+            if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                    self.previous_match()
+                else:
+                    self.next_match()
+                return True
+            if event.key() == Qt.Key.Key_Escape:
+                self.field.clear()
+                return True
+        return super().eventFilter(watched, event)
@@ -12,10 +12,33 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QTabWidget, QScrollArea, QFrame, QMessageBox,
                             QFileDialog, QMenuBar, QMenu, QStatusBar, QProgressBar,
                             QSplitter, QGroupBox, QSpacerItem, QSizePolicy, QApplication,
-                            QGraphicsDropShadowEffect, QToolTip, QSystemTrayIcon, QStyle)
+                            QGraphicsDropShadowEffect, QToolTip, QSystemTrayIcon, QStyle,
+                            QDialog, QDialogButtonBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve, QRect, QParallelAnimationGroup
 from PyQt6.QtGui import QFont, QPixmap, QAction, QPalette, QLinearGradient, QColor, QPainter, QPainterPath, QCursor, QKeySequence, QShortcut, QIcon
 
+from core import config
+from core.catalog import ManifestError, ToolCatalog, get_catalog
+from core.collectors import collect_performance, get_collector
+from core.durations import DurationModel, format_remaining
+from core.events import ERROR, WARNING, EventIndex
+from core.log_export import zstd_available
+from core.log_store import SPILL_PREFIX, SPILL_SUFFIX, LogStore, prune_spill_files
+from core.metrics import MetricsSampler
+from core.process_tree import GRACE_PERIOD
+from core.result_cache import ResultCache
+from core.scheduler import ScheduledTask, SuiteScheduler
+from core.search_index import SearchIndex
+from core.shell_pool import ShellHostPool, default_dialect
+from core.startup import StartupTimer
+from core.timeseries import TimeSeriesStore
+from ui.custom_widgets import Sparkline
+from ui.export_runner import LogExportRunner
+from ui.job_pool import JobPool
+from ui.log_console import ConsoleSearchBar, LogConsole
+from ui.themes import DARK, LIGHT, apply_theme
+from ui.script_runner import ScriptRunner  # Re-exported for compatibility
+
 class ProfessionalButton(QPushButton):
     """A professional button with hover animations and effects"""
     
@@ -49,11 +72,12 @@ class ProfessionalButton(QPushButton):
 class StatusCard(QFrame):
     """A professional status card with real-time updates"""
     
-    def __init__(self, title, value, icon="", parent=None):
+    def __init__(self, title, value, icon="", sparkline=False, parent=None):
         super().__init__(parent)
         self.title = title
         self.value = value
         self.icon = icon
+        self.sparkline = Sparkline() if sparkline else None
         self.setup_ui()
         self.setup_styling()
     
@@ -85,7 +109,14 @@ class StatusCard(QFrame):
         self.value_label.setObjectName("cardValue")
         
         layout.addLayout(header_layout)
-        layout.addWidget(self.value_label)
+        if self.sparkline is not None:
+            # Value and trend side by side
+            value_layout = QHBoxLayout()
+            value_layout.addWidget(self.value_label)
+            value_layout.addWidget(self.sparkline, 1)
+            layout.addLayout(value_layout)
+        else:
+            layout.addWidget(self.value_label)
     
     def setup_styling(self):
         """Setup card styling"""
@@ -96,62 +127,24 @@ class StatusCard(QFrame):
         """Update the card value with animation"""
         self.value = new_value
         self.value_label.setText(str(new_value))
-
-class ScriptRunner(QThread):
-    """Enhanced thread for running scripts with better progress tracking"""
-    output_received = pyqtSignal(str)
-    finished_signal = pyqtSignal(bool, str)
-    progress_update = pyqtSignal(int)
     
-    def __init__(self, script_path, script_name):
-        super().__init__()
-        self.script_path = script_path
-        self.script_name = script_name
-        self.progress = 0
-    
-    def run(self):
-        try:
-            # Run the script and capture output
-            process = subprocess.Popen(
-                [self.script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                shell=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            # Simulate progress updates
-            self.progress_update.emit(10)
-            
-            # Read output line by line
-            line_count = 0
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    line_count += 1
-                    self.output_received.emit(output.strip())
-                    # Update progress based on output lines
-                    progress = min(90, 10 + (line_count * 5))
-                    self.progress_update.emit(progress)
-            
-            # Wait for process to complete
-            return_code = process.wait()
-            self.progress_update.emit(100)
-            
-            if return_code == 0:
-                self.finished_signal.emit(True, f"✅ {self.script_name} completed successfully")
-            else:
-                self.finished_signal.emit(False, f"❌ {self.script_name} failed with return code {return_code}")
-                
-        except Exception as e:
-            self.finished_signal.emit(False, f"💥 Error running {self.script_name}: {str(e)}")
+    def update_series(self, values):
+        """Update the trend sparkline (no-op for cards without one)"""
+        if self.sparkline is not None:
+            self.sparkline.set_values(values)
+
+# Category cards built before the first frame (those visible at the default size)
+INITIAL_CATEGORY_CARDS = 3
+
+# Seconds on top of the kill grace period that closing waits for running tools
+JOB_SHUTDOWN_SLACK = 2.0
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
+        # Startup phases are timed up to the first paint (see report_startup)
+        self.startup_timer = startup_timer or StartupTimer()
+        self.startup_reported = False
         self.setWindowTitle("PC Troubleshooter v1.0 - Professional System Diagnostics [DARK MODE]")
         self.setGeometry(100, 100, 1400, 900)
         self.setMinimumSize(1200, 800)
@@ -170,19 +163,66 @@ class MainWindow(QMainWindow):
                 # Fallback to built-in icon
                 self.setWindowIcon(self.style().standardIcon(self.style().StandardPixmap.SP_ComputerIcon))
         
-        # Initialize variables
-        self.current_theme = "dark"
-        self.scripts_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "scripts")
-        self.logs_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-        self.current_log = []
-        
-        # Setup UI
+        # Initialize variables and background services
+        with self.startup_timer.phase("services"):
+            self.current_theme = "dark"
+            self.scripts_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "scripts")
+            self.logs_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+            # Tool catalog from tools.json, shared with the scheduler, cache and CLI
+            self.catalog_error = None
+            try:
+                self.catalog = get_catalog()
+            except ManifestError as e:
+                self.catalog = ToolCatalog([], [], scripts_dir=self.scripts_path)
+                self.catalog_error = str(e)
+            # Session log: bounded in memory, older lines spill to logs/, every line indexed for search
+            prune_spill_files(self.logs_path, config.get_int("log_retention_days", 30))
+            self.current_log = LogStore(
+                config.get_int("console_max_lines", 100000),
+                os.path.join(self.logs_path, f"{SPILL_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}{SPILL_SUFFIX}"),
+                index=SearchIndex(skip=r"\[\d\d:\d\d:\d\d\] ")
+            )
+            self.last_status_info = None
+            
+            # Warm PowerShell hosts for scripts that only echo and call PowerShell
+            self.shell_pool = None
+            dialect = default_dialect()
+            shell_hosts = config.get_int("shell_hosts", 2)
+            if dialect is not None and shell_hosts > 0:
+                self.shell_pool = ShellHostPool(dialect, shell_hosts)
+            
+            # Per-tool run history for progress and time remaining estimates
+            self.durations = DurationModel(os.path.join(self.logs_path, "tool_stats.json"), catalog=self.catalog)
+            
+            # Recent results of read-only tools, replayed instead of re-running them
+            self.result_cache = ResultCache(self.catalog) if config.get_bool("result_cache", True) else None
+            
+            # Job pool shared by every tool launch
+            isolated = config.get_choice("execution_backend", ("thread", "process"), "thread") == "process"
+            self.job_pool = JobPool(config.get_int("max_concurrent_jobs", 3), self.shell_pool, self.durations,
+                                    self.result_cache, isolated, self)
+            self.job_pool.job_started.connect(self.job_started)
+            self.job_pool.job_output.connect(self.job_output_received)
+            self.job_pool.job_progress.connect(self.job_progress_updated)
+            self.job_pool.job_eta.connect(self.job_eta_updated)
+            self.job_pool.job_phase.connect(self.job_phase_changed)
+            self.job_pool.job_finished.connect(self.job_finished)
+            self.job_pool.pool_changed.connect(self.update_active_tasks)
+            self.job_callbacks = {}
+            # Structured events parsed from job output, and the run each running job feeds
+            self.event_index = EventIndex()
+            self.job_runs = {}
+            self.suite_scheduler = None
+            # Background log export in progress (None when idle)
+            self.export_runner = None
+        
+        # Setup UI (tray icon, shortcuts and off-screen cards wait for the first frame)
         self.setup_ui()
-        self.setup_menu()
-        self.setup_status_bar()
-        self.setup_system_tray()
-        self.setup_keyboard_shortcuts()
-        self.apply_professional_theme()
+        with self.startup_timer.phase("menu"):
+            self.setup_menu()
+            self.setup_status_bar()
+        with self.startup_timer.phase("theme"):
+            self.apply_professional_theme()
         
         # Ensure scripts and logs directories exist
         os.makedirs(self.scripts_path, exist_ok=True)
@@ -192,7 +232,38 @@ class MainWindow(QMainWindow):
         self.show_startup_message()
         
         # Setup status monitoring
-        self.setup_status_monitoring()
+        with self.startup_timer.phase("monitoring"):
+            self.setup_status_monitoring()
+    
+    def paintEvent(self, event):
+        """Detect the first frame and start the deferred startup work"""
+        super().paintEvent(event)
+        if self.startup_timer.mark_first_paint():
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Set up what the first frame does not need, then build the remaining cards"""
+        with self.startup_timer.phase("system tray"):
+            self.setup_system_tray()
+        with self.startup_timer.phase("shortcuts"):
+            self.setup_keyboard_shortcuts()
+        
+        # Start the shell hosts once the window is up
+        if self.shell_pool is not None:
+            self.shell_pool.warm_start()
+        
+        self.build_deferred_category_card()
+    
+    def report_startup(self):
+        """Log the time-to-first-paint breakdown and append it to logs/startup_times.log"""
+        if self.startup_reported:
+            return
+        self.startup_reported = True
+        budget = config.get_int("startup_budget_ms", 1500)
+        self.log_message(f"⏱️ {self.startup_timer.summary(budget)}")
+        if self.startup_timer.over_budget(budget):
+            self.log_message(f"⚠️ Startup exceeded its {budget} ms budget")
+        self.startup_timer.write_report(os.path.join(self.logs_path, "startup_times.log"))
     
     def show_startup_message(self):
         """Show a professional startup message"""
@@ -219,7 +290,9 @@ class MainWindow(QMainWindow):
 """
         if hasattr(self, 'console_output'):
             self.console_output.setText(startup_msg)
-            QTimer.singleShot(100, lambda: self.current_log.append("Session started - PC Troubleshooter v1.0"))
+            QTimer.singleShot(100, lambda: self.log_message("Session started - PC Troubleshooter v1.0"))
+            if self.catalog_error:
+                QTimer.singleShot(100, lambda: self.log_message(f"❌ {self.catalog_error}"))
     
     def setup_system_tray(self):
         """Setup system tray integration for professional experience"""
@@ -278,7 +351,7 @@ class MainWindow(QMainWindow):
         
         # Clear output shortcut
         clear_output_shortcut = QShortcut(QKeySequence("Ctrl+L"), self)
-        clear_output_shortcut.activated.connect(lambda: self.console_output.clear() if hasattr(self, 'console_output') else None)
+        clear_output_shortcut.activated.connect(self.clear_console)
         
         # Refresh shortcut
         refresh_shortcut = QShortcut(QKeySequence("F5"), self)
@@ -287,6 +360,10 @@ class MainWindow(QMainWindow):
         # Show help shortcut
         help_shortcut = QShortcut(QKeySequence("F1"), self)
         help_shortcut.activated.connect(self.show_help_dialog)
+        
+        # Console search shortcut
+        search_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
+        search_shortcut.activated.connect(self.focus_console_search)
     
     def setup_status_monitoring(self):
         """Setup real-time status monitoring"""
@@ -295,7 +372,13 @@ class MainWindow(QMainWindow):
         self.status_timer.timeout.connect(self.update_system_status)
         self.status_timer.start(5000)  # Update every 5 seconds
         
-        # Performance monitoring
+        # System counters are sampled off the GUI thread
+        self.metrics_sampler = MetricsSampler(interval=1.0)
+        self.metrics_history = TimeSeriesStore()
+        self.metrics_sampler.add_listener(self.metrics_history.add_snapshot)
+        self.metrics_sampler.start()
+        
+        # Performance monitoring (only reads the latest snapshot)
         self.performance_timer = QTimer()
         self.performance_timer.timeout.connect(self.update_performance_metrics)
         self.performance_timer.start(2000)  # Update every 2 seconds
@@ -303,7 +386,11 @@ class MainWindow(QMainWindow):
         # Initialize counters
         self.scripts_run_count = 0
         self.successful_scripts = 0
-        self.active_tasks_count = 0
+    
+    @property
+    def active_tasks_count(self):
+        """Number of running and queued jobs in the pool"""
+        return self.job_pool.active_count()
     
     def setup_ui(self):
         """Setup the enhanced professional user interface"""
@@ -316,7 +403,8 @@ class MainWindow(QMainWindow):
         main_layout.setSpacing(10)
         
         # Add status dashboard at top
-        status_dashboard = self.create_status_dashboard()
+        with self.startup_timer.phase("dashboard"):
+            status_dashboard = self.create_status_dashboard()
         main_layout.addWidget(status_dashboard)
         
         # Content layout with splitter
@@ -326,26 +414,18 @@ class MainWindow(QMainWindow):
         splitter = QSplitter(Qt.Orientation.Horizontal)
         
         # Left panel - Troubleshooting categories
-        left_panel = self.create_professional_left_panel()
+        with self.startup_timer.phase("left panel"):
+            left_panel = self.create_professional_left_panel()
         splitter.addWidget(left_panel)
         
-        # Right panel - Output console
-        right_panel = self.create_professional_right_panel()
+        # Right panel - Output console. Unlike the category cards it stays eager: it fills most of the
+        # first frame and the startup messages are written to its console before the first paint
+        with self.startup_timer.phase("right panel"):
+            right_panel = self.create_professional_right_panel()
         splitter.addWidget(right_panel)
         
         # Set initial splitter sizes (40% left, 60% right)
         splitter.setSizes([560, 840])
-        splitter.setStyleSheet("""
-            QSplitter::handle {
-                background-color: #333333;
-                width: 3px;
-                border-radius: 1px;
-                margin: 2px;
-            }
-            QSplitter::handle:hover {
-                background-color: #555555;
-            }
-        """)
         
         content_layout.addWidget(splitter)
         main_layout.addLayout(content_layout)
@@ -365,11 +445,14 @@ class MainWindow(QMainWindow):
         self.scripts_run_card = StatusCard("Scripts Run", "0", "🔧")
         self.success_rate_card = StatusCard("Success Rate", "100%", "✅")
         self.active_tasks_card = StatusCard("Active Tasks", "0", "⚡")
+        self.cpu_load_card = StatusCard("CPU Load", "--", "📈", sparkline=True)
+        self.cpu_load_card.sparkline.set_range(0, 100)
         
         layout.addWidget(self.system_status_card)
         layout.addWidget(self.scripts_run_card)
         layout.addWidget(self.success_rate_card)
         layout.addWidget(self.active_tasks_card)
+        layout.addWidget(self.cpu_load_card)
         layout.addStretch()
         
         # Quick action buttons
@@ -449,45 +532,14 @@ class MainWindow(QMainWindow):
         categories_layout.setContentsMargins(10, 10, 10, 10)
         categories_layout.setSpacing(15)
         
-        # Professional categories with icons and better organization
-        categories = [
-            ("🌐", "Network", "Connectivity & Internet", "#4CAF50", [
-                ("Reset Network Stack", "network_reset.bat"),
-                ("Flush DNS Cache", "flush_dns.bat"),
-                ("Reset Network Adapter", "reset_adapter.bat"),
-                ("Network Diagnostics", "network_diagnostics.bat")
-            ]),
-            ("📶", "Bluetooth", "Wireless Device Management", "#2196F3", [
-                ("Restart Bluetooth Service", "bluetooth_restart.bat"),
-                ("Check Bluetooth Drivers", "bluetooth_drivers.bat"),
-                ("Reset Bluetooth Stack", "bluetooth_reset.bat")
-            ]),
-            ("🔊", "Audio", "Sound & Audio Devices", "#FF9800", [
-                ("Restart Audio Services", "audio_restart.bat"),
-                ("Audio Device Detection", "audio_detect.bat"),
-                ("Audio Troubleshooter", "audio_troubleshoot.bat")
-            ]),
-            ("🖥️", "Display", "Graphics & Monitor Setup", "#9C27B0", [
-                ("Display Settings Check", "display_check.bat"),
-                ("Reset Graphics Driver", "graphics_reset.bat"),
-                ("Monitor Detection", "monitor_detect.bat")
-            ]),
-            ("💾", "Storage", "Disk Space & Cleanup", "#607D8B", [
-                ("Clear Temp Files", "clear_temp.bat"),
-                ("Disk Cleanup", "disk_cleanup.bat"),
-                ("Check Disk Space", "disk_space.bat")
-            ]),
-            ("⚡", "Performance", "System Optimization", "#E91E63", [
-                ("List Startup Programs", "startup_programs.bat"),
-                ("Memory Usage Check", "memory_check.bat"),
-                ("System File Check", "sfc_scan.bat"),
-                ("Performance Monitor", "performance_monitor.bat")
-            ])
-        ]
-        
-        for icon, category_name, category_desc, color, tools in categories:
-            category_widget = self.create_professional_category_card(icon, category_name, category_desc, color, tools)
-            categories_layout.addWidget(category_widget)
+        # Categories and their tools come from the tools.json manifest. Only the
+        # first cards are built now; the rest follow after the first frame or on scroll
+        self.categories_layout = categories_layout
+        self.pending_categories = self.catalog.categories()
+        self.built_category_cards = 0
+        for _ in range(INITIAL_CATEGORY_CARDS):
+            self.build_next_category_card()
+        scroll_area.verticalScrollBar().valueChanged.connect(self.build_remaining_category_cards)
         
         # Quick actions section
         quick_actions_frame = QFrame()
@@ -516,7 +568,31 @@ class MainWindow(QMainWindow):
         
         return container
     
-    def create_professional_category_card(self, icon, name, description, color, tools):
+    def build_next_category_card(self):
+        """Build the next pending category card above the quick actions. Returns False when none are left"""
+        if not self.pending_categories:
+            return False
+        category = self.pending_categories.pop(0)
+        card = self.create_professional_category_card(category)
+        self.categories_layout.insertWidget(self.built_category_cards, card)
+        self.built_category_cards += 1
+        return True
+    
+    def build_deferred_category_card(self):
+        """Build one pending card per event loop pass, then report startup"""
+        if self.pending_categories:
+            with self.startup_timer.phase(f"card {self.pending_categories[0].id}"):
+                self.build_next_category_card()
+            QTimer.singleShot(0, self.build_deferred_category_card)
+        else:
+            self.report_startup()
+    
+    def build_remaining_category_cards(self):
+        """Build every pending card at once (the user started scrolling)"""
+        while self.build_next_category_card():
+            pass
+    
+    def create_professional_category_card(self, category):
         """Create a professional-looking category card"""
         card = QFrame()
         card.setObjectName("categoryCard")
@@ -530,28 +606,24 @@ class MainWindow(QMainWindow):
         header_layout = QHBoxLayout()
         
         # Icon
-        icon_label = QLabel(icon)
+        icon_label = QLabel(category.icon)
         icon_label.setFont(QFont("Segoe UI", 20))
         icon_label.setFixedSize(40, 40)
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        icon_label.setStyleSheet(f"""
-            QLabel {{
-                background-color: {color};
-                border-radius: 20px;
-                color: white;
-            }}
-        """)
+        # Colored by the compiled theme's per-category rule
+        icon_label.setObjectName("categoryIcon")
+        icon_label.setProperty("category", category.id)
         header_layout.addWidget(icon_label)
         
         # Title and description
         text_layout = QVBoxLayout()
         text_layout.setSpacing(2)
         
-        title_label = QLabel(name)
+        title_label = QLabel(category.name)
         title_label.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
         title_label.setObjectName("categoryTitle")
         
-        desc_label = QLabel(description)
+        desc_label = QLabel(category.description)
         desc_label.setFont(QFont("Segoe UI", 9))
         desc_label.setObjectName("categoryDescription")
         desc_label.setWordWrap(True)
@@ -568,13 +640,15 @@ class MainWindow(QMainWindow):
         tools_grid.setSpacing(8)
         
         row, col = 0, 0
-        for tool_name, script_file in tools:
-            btn = QPushButton(tool_name)
+        for spec in category.tools:
+            btn = QPushButton(spec.name)
             btn.setObjectName("toolButton")
             btn.setFont(QFont("Segoe UI", 9))
             btn.setMinimumHeight(32)
             btn.setMaximumHeight(32)
-            btn.clicked.connect(lambda checked, sf=script_file, tn=tool_name: self.run_script(sf, tn))
+            btn.setToolTip(self.tool_tooltip(spec))
+            btn.setProperty("script", spec.script)
+            btn.clicked.connect(self.tool_button_clicked)
             
             tools_grid.addWidget(btn, row, col)
             col += 1
@@ -586,6 +660,23 @@ class MainWindow(QMainWindow):
         
         return card
     
+    def tool_button_clicked(self):
+        """Run the clicked button's tool (Shift+click bypasses the result cache)"""
+        spec = self.catalog.by_script(self.sender().property("script"))
+        force_refresh = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
+        self.run_script(spec.script, spec.name, force_refresh)
+    
+    def tool_tooltip(self, spec):
+        """Describe a tool's manifest flags for its button"""
+        lines = ["Read-only diagnostic" if spec.read_only else "Changes system settings"]
+        if spec.admin:
+            lines.append("Requires administrator rights")
+        if spec.deadline:
+            lines.append(f"Stopped if it runs longer than {format_remaining(spec.deadline)}")
+        if self.result_cache is not None and spec.cacheable:
+            lines.append("Recent results are reused - Shift+click to force a refresh")
+        return "\n".join(lines)
+    
     def create_professional_right_panel(self):
         """Create the professional right panel with output console"""
         container = QWidget()
@@ -645,9 +736,8 @@ class MainWindow(QMainWindow):
         console_layout = QVBoxLayout(console_frame)
         console_layout.setContentsMargins(1, 1, 1, 1)
         
-        self.console_output = QTextEdit()
+        self.console_output = LogConsole(self.current_log)
         self.console_output.setObjectName("consoleOutput")
-        self.console_output.setReadOnly(True)
         self.console_output.setFont(QFont("JetBrains Mono", 10))
         
         # Add welcome message
@@ -666,6 +756,8 @@ class MainWindow(QMainWindow):
 """
         self.console_output.setText(welcome_msg)
         
+        self.console_search = ConsoleSearchBar(self.console_output)
+        console_layout.addWidget(self.console_search)
         console_layout.addWidget(self.console_output)
         layout.addWidget(console_frame)
         
@@ -692,10 +784,6 @@ class MainWindow(QMainWindow):
         
         return container
     
-    def create_category_frame(self, name, description, tools):
-        """Legacy method - kept for compatibility"""
-        return self.create_professional_category_card("🔧", name, description, "#607D8B", tools)
-    
     def create_right_panel(self):
         """Legacy method - kept for compatibility"""
         return self.create_professional_right_panel()
@@ -729,6 +817,14 @@ class MainWindow(QMainWindow):
         clear_console_action.triggered.connect(self.clear_console)
         view_menu.addAction(clear_console_action)
         
+        clear_cache_action = QAction("Clear Cached Results", self)
+        clear_cache_action.triggered.connect(self.clear_result_cache)
+        view_menu.addAction(clear_cache_action)
+        
+        problems_action = QAction("Show Problems from Recent Runs", self)
+        problems_action.triggered.connect(lambda: self.show_recent_problems())
+        view_menu.addAction(problems_action)
+        
         # Help menu
         help_menu = menubar.addMenu("Help")
         
@@ -742,11 +838,12 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready")
     
-    def run_script(self, script_file, tool_name):
+    def run_script(self, script_file, tool_name, force_refresh=False):
         """Run a troubleshooting script with enhanced professional feedback"""
-        script_path = os.path.join(self.scripts_path, script_file)
+        # Availability was checked once when the catalog was loaded
+        spec = self.catalog.by_script(script_file)
         
-        if not os.path.exists(script_path):
+        if spec is None or not spec.available:
             self.log_message(f"❌ Script not found: {script_file}")
             QMessageBox.warning(self, "Script Not Found", 
                               f"The script '{script_file}' was not found in the scripts directory.")
@@ -758,25 +855,116 @@ class MainWindow(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Update active tasks counter
-            self.active_tasks_count += 1
+            handle = self.submit_tool(spec, tool_name, force_refresh)
             self.update_performance_metrics()
             
+            if force_refresh:
+                self.log_message(f"🔄 Refreshing {tool_name} (cached result ignored)")
+            
             # Enhanced status feedback
-            self.log_message(f"🚀 Starting: {tool_name}")
+            if handle.state == handle.QUEUED:
+                self.log_message(f"⏳ Queued: {tool_name} (job #{handle.job_id})")
+            else:
+                self.log_message(f"🚀 Starting: {tool_name} (job #{handle.job_id})")
             self.status_bar.showMessage(f"Running: {tool_name}")
             self.status_indicator.setText("🟡 Running...")
             self.progress_container.setVisible(True)
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)  # Indeterminate progress
-            self.progress_label.setText(f"Executing: {tool_name}")
-            
-            # Create and start the script runner thread
-            self.script_runner = ScriptRunner(script_path, tool_name)
-            self.script_runner.output_received.connect(self.log_message)
-            self.script_runner.finished_signal.connect(self.script_finished)
-            self.script_runner.progress_update.connect(self.update_progress)
-            self.script_runner.start()
+            self.update_progress_label()
+    
+    def submit_tool(self, spec, tool_name, force_refresh=False):
+        """Submit a tool to the job pool (queued if all worker slots are busy) and return its JobHandle"""
+        # Standalone and suite runs share the native collectors, the result cache and the deadline
+        return self.job_pool.submit(spec.path, tool_name, self.native_collector(spec.path), force_refresh,
+                                    spec.deadline)
+    
+    def native_collector(self, script_file):
+        """Return an in-process replacement for a script, or None to run the .bat"""
+        if not config.get_bool("native_collectors", True):
+            return None
+        collector = get_collector(script_file)
+        if collector is collect_performance:
+            # Reuse the sampler's CPU, disk and network rates
+            return lambda is_cancelled=None: collect_performance(self.metrics_sampler.latest(),
+                                                                 is_cancelled=is_cancelled)
+        return collector
+    
+    def job_output_received(self, job_id, lines):
+        """Route a batch of job output to the console, tagging it when jobs overlap"""
+        handle = self.job_pool.get(job_id)
+        raw_lines = lines
+        if handle is not None and self.job_pool.running_count() > 1:
+            lines = [f"[{handle.tool_name}] {line}" for line in lines]
+        first = self.log_messages(lines)
+        # Classify the untagged lines against their place in the session log
+        run_id = self.job_runs.get(job_id)
+        if run_id is not None and first is not None:
+            self.event_index.add(run_id, first, raw_lines)
+    
+    def job_started(self, job_id):
+        """Start indexing the structured events of a job's output"""
+        handle = self.job_pool.get(job_id)
+        if handle is not None:
+            self.job_runs[job_id] = self.event_index.begin_run(handle.tool_name)
+    
+    def job_progress_updated(self, job_id, value):
+        """Show real progress only while a single standalone job is running"""
+        # Suite jobs drive the bar by step count instead
+        if job_id in self.job_callbacks:
+            return
+        if self.job_pool.running_count() == 1:
+            self.update_progress(value)
+        else:
+            self.update_progress(-1)
+    
+    def job_eta_updated(self, job_id, value):
+        """Refresh the time remaining shown for standalone jobs"""
+        if job_id not in self.job_callbacks and self.suite_scheduler is None:
+            self.update_progress_label()
+    
+    def job_phase_changed(self, job_id, phase):
+        """Show the phase a job announced: in the progress label, or the status bar during a suite"""
+        if job_id not in self.job_callbacks and self.suite_scheduler is None:
+            self.update_progress_label()
+            return
+        handle = self.job_pool.get(job_id)
+        if handle is not None and phase:
+            self.status_bar.showMessage(f"{handle.tool_name}: {phase}")
+    
+    def job_finished(self, job_id, success, message):
+        """Dispatch job completion to its owner"""
+        run_id = self.job_runs.pop(job_id, None)
+        if run_id is not None:
+            self.event_index.end_run(run_id, success)
+        callback = self.job_callbacks.pop(job_id, self.script_finished)
+        callback(success, message)
+    
+    def update_active_tasks(self):
+        """Refresh the active tasks card and progress label from the pool"""
+        if hasattr(self, 'active_tasks_card'):
+            self.active_tasks_card.update_value(self.active_tasks_count)
+        if hasattr(self, 'progress_label') and self.suite_scheduler is None:
+            self.update_progress_label()
+    
+    def update_progress_label(self):
+        """Describe the running and queued jobs in the progress label"""
+        running = []
+        for handle in self.job_pool.jobs():
+            if handle.state != handle.RUNNING:
+                continue
+            name = f"{handle.tool_name}: {handle.phase}" if handle.phase else handle.tool_name
+            if handle.eta >= 0:
+                running.append(f"{name} (~{format_remaining(handle.eta)} left)")
+            else:
+                running.append(name)
+        queued = self.job_pool.queued_count()
+        if not running:
+            return
+        text = f"Executing: {', '.join(running)}"
+        if queued:
+            text += f" ({queued} queued)"
+        self.progress_label.setText(text)
     
     def update_progress(self, value):
         """Update progress bar with current value"""
@@ -788,63 +976,83 @@ class MainWindow(QMainWindow):
                 self.progress_bar.setRange(0, 0)  # Indeterminate
     
     def run_all_basic_fixes(self):
-        """Run all basic troubleshooting fixes"""
-        basic_scripts = [
-            ("flush_dns.bat", "Flush DNS Cache"),
-            ("clear_temp.bat", "Clear Temp Files"),
-            ("network_reset.bat", "Reset Network Stack"),
-            ("audio_restart.bat", "Restart Audio Services")
-        ]
+        """Run all basic troubleshooting fixes, in parallel where they don't conflict"""
+        suite = self.catalog.suite("basic_fixes")
+        if suite is None:
+            self.log_message("❌ The basic fixes suite is not defined in tools.json")
+            return
         
         reply = QMessageBox.question(self, "Confirm Action", 
                                    "This will run multiple troubleshooting scripts. Continue?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.log_message("🔧 Starting Basic Fixes Suite...")
-            self.status_indicator.setText("🟡 Running Suite...")
-            self.progress_container.setVisible(True)
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, len(basic_scripts))
-            self.progress_bar.setValue(0)
-            self.run_script_sequence(basic_scripts, 0)
-    
-    def run_script_sequence(self, scripts, index):
-        """Run a sequence of scripts"""
-        if index >= len(scripts):
-            self.log_message("✅ All basic fixes completed!")
-            self.status_bar.showMessage("All basic fixes completed")
-            self.status_indicator.setText("🟢 Ready")
-            self.progress_container.setVisible(False)
-            self.progress_bar.setVisible(False)
+            # Tools that share a resource from the manifest never run together
+            tasks = [ScheduledTask(spec.name, spec.resources, payload=spec) for spec in suite.tools]
+            self.run_script_suite(suite.name, SuiteScheduler(tasks))
+    
+    def run_script_suite(self, suite_name, scheduler):
+        """Run a suite of scripts through the dependency/conflict scheduler"""
+        self.log_message(f"🔧 Starting {suite_name}...")
+        self.status_indicator.setText("🟡 Running Suite...")
+        self.progress_container.setVisible(True)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, len(scheduler.tasks))
+        self.progress_bar.setValue(0)
+        self.suite_name = suite_name
+        self.suite_scheduler = scheduler
+        self.dispatch_suite_tasks()
+    
+    def dispatch_suite_tasks(self):
+        """Submit every suite task that is ready to run"""
+        scheduler = self.suite_scheduler
+        if scheduler is None:
             return
         
-        script_file, tool_name = scripts[index]
-        script_path = os.path.join(self.scripts_path, script_file)
-        
-        if os.path.exists(script_path):
-            self.log_message(f"🚀 Running: {tool_name}")
-            self.status_bar.showMessage(f"Running: {tool_name} ({index + 1}/{len(scripts)})")
-            self.progress_label.setText(f"Executing: {tool_name} ({index + 1}/{len(scripts)})")
-            self.progress_bar.setValue(index)
-            
-            # Create script runner for this script
-            self.script_runner = ScriptRunner(script_path, tool_name)
-            self.script_runner.output_received.connect(self.log_message)
-            self.script_runner.finished_signal.connect(
-                lambda success, msg, scripts=scripts, idx=index: self.script_sequence_finished(success, msg, scripts, idx)
-            )
-            self.script_runner.start()
-        else:
-            self.log_message(f"⚠️ Skipping {tool_name} - script not found")
-            # Continue with next script
-            QTimer.singleShot(100, lambda: self.run_script_sequence(scripts, index + 1))
+        # A missing script frees its resources at once, so keep asking
+        ready = scheduler.next_ready()
+        while ready:
+            for task in ready:
+                spec = task.payload
+                if not spec.available:
+                    self.log_message(f"⚠️ Skipping {task.name} - script not found")
+                    scheduler.mark_finished(task.name, False)
+                    continue
+                
+                self.log_message(f"🚀 Running: {task.name}")
+                handle = self.submit_tool(spec, task.name)
+                self.job_callbacks[handle.job_id] = (
+                    lambda success, msg, name=task.name: self.suite_task_finished(name, success, msg)
+                )
+            ready = scheduler.next_ready()
+        
+        running = [task.name for task in scheduler.running()]
+        total = len(scheduler.tasks)
+        done = scheduler.finished_count()
+        self.progress_bar.setValue(done)
+        if running:
+            self.status_bar.showMessage(f"Running: {', '.join(running)} ({done}/{total} done)")
+            self.progress_label.setText(f"Executing: {', '.join(running)} ({done}/{total} done)")
+        
+        if scheduler.is_done():
+            self.suite_scheduler = None
+            summary = scheduler.summary()
+            if summary.get(ScheduledTask.SKIPPED):
+                self.log_message(f"⚠️ {summary[ScheduledTask.SKIPPED]} step(s) of the {self.suite_name} were skipped")
+            self.log_message(f"✅ {self.suite_name} completed!")
+            self.show_ready_state()
+            self.status_bar.showMessage(f"{self.suite_name} completed")
     
-    def script_sequence_finished(self, success, message, scripts, index):
-        """Handle completion of a script in a sequence"""
+    def suite_task_finished(self, name, success, message):
+        """Handle completion of a script in a suite and start what it unblocked"""
         self.log_message(message)
-        # Continue with next script
-        QTimer.singleShot(500, lambda: self.run_script_sequence(scripts, index + 1))
+        if self.suite_scheduler is None:
+            # Suite was stopped; reset once the cancelled jobs have drained
+            if self.active_tasks_count == 0:
+                self.show_ready_state()
+            return
+        self.suite_scheduler.mark_finished(name, success)
+        self.dispatch_suite_tasks()
     
     def script_finished(self, success, message):
         """Handle script completion with enhanced feedback"""
@@ -852,73 +1060,137 @@ class MainWindow(QMainWindow):
         if success:
             self.successful_scripts += 1
         
-        self.active_tasks_count = max(0, self.active_tasks_count - 1)
-        
         # Update performance metrics
         self.update_performance_metrics()
         
         # Log completion
         self.log_message(message)
         
+        # Other jobs are still running or queued
+        if self.active_tasks_count > 0:
+            self.update_progress_label()
+            return
+        
         # Update status indicators
-        self.status_bar.showMessage("Ready")
-        self.status_indicator.setText("🟢 Ready")
-        self.progress_container.setVisible(False)
-        self.progress_bar.setVisible(False)
-        self.progress_label.setText("")
+        self.show_ready_state()
         
         # Update status bar with detailed metrics
         success_rate = (self.successful_scripts / self.scripts_run_count * 100) if self.scripts_run_count > 0 else 100
         status_msg = f"Scripts: {self.scripts_run_count} | Success Rate: {success_rate:.0f}% | Active: {self.active_tasks_count}"
         self.status_bar.showMessage(status_msg, 5000)  # Show for 5 seconds
     
+    def show_ready_state(self):
+        """Reset status indicators once no jobs are active"""
+        self.status_bar.showMessage("Ready")
+        self.status_indicator.setText("🟢 Ready")
+        self.progress_container.setVisible(False)
+        self.progress_bar.setVisible(False)
+        self.progress_label.setText("")
+    
     def log_message(self, message):
         """Add a message to the console output"""
+        self.log_messages([message])
+    
+    def log_messages(self, messages):
+        """Add a batch of messages with a single console update; returns the log number of the first"""
+        if not messages:
+            return None
         timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
+        formatted_messages = [f"[{timestamp}] {message}" for message in messages]
         
-        self.console_output.append(formatted_message)
-        self.current_log.append(formatted_message)
+        # The console follows the tail while it is scrolled to the bottom
+        return self.console_output.append_lines(formatted_messages)
+    
+    def clear_result_cache(self):
+        """Forget every cached tool result"""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        self.log_message("🧹 Cached results cleared")
+    
+    def show_recent_problems(self, last_runs=10):
+        """List the warnings and errors of the last runs, looked up in the event index"""
+        numbers = self.event_index.query((WARNING, ERROR), last_runs)
+        if not numbers:
+            QMessageBox.information(self, "No Problems", f"No warnings or errors in the last {last_runs} runs.")
+            return
         
-        # Auto-scroll to bottom
-        self.console_output.verticalScrollBar().setValue(
-            self.console_output.verticalScrollBar().maximum()
-        )
+        counts = self.event_index.counts((WARNING, ERROR), last_runs)
+        store = LogStore(len(numbers))
+        store.extend(line for _, line in self.current_log.lines_by_number(numbers))
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Problems from Recent Runs")
+        dialog.resize(800, 400)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"{counts[ERROR]} error(s) and {counts[WARNING]} warning(s) "
+                                f"in the last {last_runs} runs"))
+        layout.addWidget(LogConsole(store, dialog))
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.exec()
+    
+    def focus_console_search(self):
+        """Move the keyboard focus to the console search field"""
+        if hasattr(self, 'console_search'):
+            self.console_search.focus()
     
     def clear_console(self):
         """Clear the console output"""
         self.console_output.clear()
-        self.current_log.clear()
         self.log_message("Console cleared")
     
     def export_logs(self):
-        """Export console logs to a file"""
+        """Export the session log in the background, as text or NDJSON, optionally compressed"""
         if not self.current_log:
             QMessageBox.information(self, "No Logs", "No logs to export.")
             return
+        if self.export_runner is not None:
+            QMessageBox.information(self, "Export Running", "A log export is already in progress.")
+            return
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"pc_troubleshooter_log_{timestamp}.txt"
         
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Export Logs", default_filename, "Text Files (*.txt);;All Files (*)"
+        # Filter -> suffix appended when the name has none of its own
+        filters = [("Text Files (*.txt)", ".txt"), ("Compressed Text (*.txt.gz)", ".txt.gz"),
+                   ("NDJSON Events (*.ndjson)", ".ndjson"), ("Compressed NDJSON (*.ndjson.gz)", ".ndjson.gz")]
+        if zstd_available():
+            filters += [("Zstandard Text (*.txt.zst)", ".txt.zst"), ("Zstandard NDJSON (*.ndjson.zst)", ".ndjson.zst")]
+        filename, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Logs", default_filename, ";;".join(name for name, _ in filters) + ";;All Files (*)"
         )
-        
-        if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("PC Troubleshooter Log Export\n")
-                    f.write("=" * 50 + "\n")
-                    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    
-                    for log_entry in self.current_log:
-                        f.write(log_entry + "\n")
-                
-                QMessageBox.information(self, "Export Successful", f"Logs exported to:\n{filename}")
-                self.log_message(f"📄 Logs exported to: {filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Export Failed", f"Failed to export logs:\n{str(e)}")
+        if not filename:
+            return
+        suffix = dict(filters).get(selected_filter)
+        if suffix and not filename.lower().endswith(suffix):
+            filename = os.path.splitext(filename)[0] + suffix
+        
+        # Snapshot on the GUI thread; the runner only reads the copy and the spill file
+        self.export_runner = LogExportRunner(self.current_log.snapshot(), filename, self.event_index.tool_spans(), self)
+        self.export_runner.progress_update.connect(self.export_progress)
+        self.export_runner.finished_signal.connect(self.export_finished)
+        self.export_runner.start()
+        self.log_message(f"📄 Exporting logs to: {filename}")
+    
+    def export_progress(self, done, total):
+        """Show the export's progress in the status bar"""
+        if hasattr(self, 'status_bar') and total:
+            self.status_bar.showMessage(f"📄 Exporting logs... {done * 100 // total}%")
+    
+    def export_finished(self, success, message):
+        """Report the outcome of a background export"""
+        runner = self.export_runner
+        self.export_runner = None
+        runner.wait()
+        runner.deleteLater()
+        if success:
+            self.status_bar.showMessage("📄 Log export complete", 5000)
+            self.log_message(f"📄 Logs exported to: {runner.path} ({message})")
+        else:
+            self.status_bar.showMessage("Log export failed", 5000)
+            self.log_message(f"❌ Log export failed: {message}")
+            QMessageBox.critical(self, "Export Failed", f"Failed to export logs:\n{message}")
     
     def toggle_theme(self):
         """Toggle between light and dark themes"""
@@ -943,19 +1215,20 @@ class MainWindow(QMainWindow):
             self.console_output.append("\n🔍 Starting Quick System Scan...")
         
         # Run basic network connectivity test
-        network_script = os.path.join(self.scripts_path, "network", "reset_network_stack.bat")
-        if os.path.exists(network_script):
-            self.run_script("network/reset_network_stack.bat", "Quick Network Test")
+        spec = self.catalog.get("network_diagnostics")
+        if spec is not None and spec.available:
+            self.run_script(spec.script, "Quick Network Test")
     
     def emergency_stop(self):
         """Emergency stop all running operations"""
-        if hasattr(self, 'script_runner') and self.script_runner.isRunning():
-            self.script_runner.terminate()
+        if self.suite_scheduler is not None:
+            self.suite_scheduler.cancel()
+            self.suite_scheduler = None
+        cancelled = self.job_pool.cancel_all()
+        if cancelled:
             if hasattr(self, 'console_output'):
-                self.console_output.append("\n🛑 Emergency stop activated - All operations halted")
-            self.active_tasks_count = 0
-            if hasattr(self, 'active_tasks_card'):
-                self.active_tasks_card.update_value(0)
+                self.console_output.append(f"\n🛑 Emergency stop activated - {cancelled} operation(s) halted")
+            self.update_active_tasks()
     
     def refresh_system_status(self):
         """Refresh system status display"""
@@ -972,12 +1245,14 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'system_status_card'):
                 self.system_status_card.update_value("Online")
             
-            # Log status update
-            self.current_log.append(f"Status update: {system_info}")
+            # Log status only when it changes so a long-running session stays quiet
+            if system_info != self.last_status_info:
+                self.last_status_info = system_info
+                self.log_message(f"Status update: {system_info}")
         except Exception as e:
             if hasattr(self, 'system_status_card'):
                 self.system_status_card.update_value("Error")
-            self.current_log.append(f"Status error: {str(e)}")
+            self.log_message(f"Status error: {str(e)}")
     
     def update_performance_metrics(self):
         """Update performance metrics"""
@@ -993,22 +1268,23 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'active_tasks_card'):
                 self.active_tasks_card.update_value(self.active_tasks_count)
             
-            # Try to get system performance if psutil is available
-            try:
-                import psutil
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                memory_percent = psutil.virtual_memory().percent
+            # Latest reading from the background sampler (None without psutil)
+            snapshot = self.metrics_sampler.latest() if hasattr(self, 'metrics_sampler') else None
+            if snapshot is not None:
+                if hasattr(self, 'cpu_load_card'):
+                    self.cpu_load_card.update_value(f"{snapshot.cpu_percent:.0f}%")
+                    self.cpu_load_card.update_series(self.metrics_history.series("cpu_percent", 120))
                 
-                if hasattr(self, 'system_status_card'):
-                    if cpu_percent > 80 or memory_percent > 80:
+                # Judge load on a 30 s average rather than a single spike
+                cpu_average = self.metrics_history.average("cpu_percent", 30)
+                memory_average = self.metrics_history.average("memory_percent", 30)
+                if cpu_average is not None and hasattr(self, 'system_status_card'):
+                    if cpu_average > 80 or memory_average > 80:
                         self.system_status_card.update_value("High Load")
                     else:
                         self.system_status_card.update_value("Normal")
-            except ImportError:
-                # psutil not available, use basic metrics
-                pass
         except Exception as e:
-            self.current_log.append(f"Performance error: {str(e)}")
+            self.log_message(f"Performance error: {str(e)}")
     
     def tray_icon_activated(self, reason):
         """Handle system tray icon activation"""
@@ -1030,6 +1306,7 @@ class MainWindow(QMainWindow):
 <tr><td><b>Ctrl+Q</b></td><td>Quick System Scan</td></tr>
 <tr><td><b>Ctrl+Shift+S</b></td><td>Emergency Stop</td></tr>
 <tr><td><b>Ctrl+L</b></td><td>Clear Output</td></tr>
+<tr><td><b>Ctrl+F</b></td><td>Search Output</td></tr>
 <tr><td><b>F5</b></td><td>Refresh Status</td></tr>
 <tr><td><b>F1</b></td><td>Show This Help</td></tr>
 </table>
@@ -1053,538 +1330,11 @@ class MainWindow(QMainWindow):
     
     def apply_light_professional_theme(self):
         """Apply light professional theme"""
-        self.setStyleSheet("""
-            /* Main Window */
-            QMainWindow {
-                background-color: #f8f9fa;
-                color: #2c3e50;
-            }
-            
-            /* Left Panel */
-            QWidget#leftPanel {
-                background-color: #ffffff;
-                border-right: 1px solid #e9ecef;
-            }
-            
-            /* Right Panel */
-            QWidget#rightPanel {
-                background-color: #ffffff;
-            }
-            
-            /* Header Frame */
-            QFrame#headerFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                border-radius: 12px;
-                color: white;
-            }
-            
-            QLabel#mainTitle {
-                color: white;
-            }
-            
-            QLabel#subtitle {
-                color: rgba(255, 255, 255, 0.9);
-            }
-            
-            /* Category Cards */
-            QFrame#categoryCard {
-                background-color: #ffffff;
-                border: 1px solid #e9ecef;
-                border-radius: 12px;
-                margin: 5px;
-            }
-            
-            QFrame#categoryCard:hover {
-                border: 1px solid #007acc;
-                background-color: #f8f9fa;
-            }
-            
-            QLabel#categoryTitle {
-                color: #2c3e50;
-                font-weight: bold;
-            }
-            
-            QLabel#categoryDescription {
-                color: #6c757d;
-            }
-            
-            /* Buttons */
-            QPushButton#primaryButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #007acc, stop:1 #0099ff);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-weight: bold;
-            }
-            
-            QPushButton#primaryButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #0066aa, stop:1 #0088dd);
-            }
-            
-            QPushButton#primaryButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #005599, stop:1 #0077cc);
-            }
-            
-            QPushButton#secondaryButton {
-                background-color: #6c757d;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-            }
-            
-            QPushButton#secondaryButton:hover {
-                background-color: #5a6268;
-            }
-            
-            QPushButton#toolButton {
-                background-color: #f8f9fa;
-                color: #495057;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                padding: 6px 12px;
-                text-align: left;
-            }
-            
-            QPushButton#toolButton:hover {
-                background-color: #e9ecef;
-                border-color: #007acc;
-                color: #007acc;
-            }
-            
-            QPushButton#toolButton:pressed {
-                background-color: #dee2e6;
-            }
-            
-            /* Console Styling */
-            QFrame#consoleHeader {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #495057, stop:1 #6c757d);
-                border-radius: 8px 8px 0 0;
-                color: white;
-            }
-            
-            QLabel#consoleTitle {
-                color: white;
-            }
-            
-            QLabel#statusIndicator {
-                color: rgba(255, 255, 255, 0.9);
-                font-weight: bold;
-            }
-            
-            QFrame#consoleFrame {
-                background-color: #ffffff;
-                border: 1px solid #dee2e6;
-                border-radius: 0 0 8px 8px;
-            }
-            
-            QTextEdit#consoleOutput {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                border: none;
-                font-family: 'JetBrains Mono', 'Consolas', monospace;
-                selection-background-color: #264f78;
-                selection-color: #ffffff;
-            }
-            
-            /* Progress Bar */
-            QFrame#progressContainer {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-            }
-            
-            QProgressBar#modernProgressBar {
-                border: none;
-                background-color: #e9ecef;
-                border-radius: 4px;
-                text-align: center;
-            }
-            
-            QProgressBar#modernProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #007acc, stop:1 #0099ff);
-                border-radius: 4px;
-            }
-            
-            /* Quick Actions */
-            QFrame#quickActionsFrame {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-            }
-            
-            QLabel#sectionLabel {
-                color: #495057;
-                font-weight: bold;
-            }
-            
-            /* Scroll Areas */
-            QScrollArea#categoryScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            
-            QScrollBar:vertical {
-                background-color: #f8f9fa;
-                width: 12px;
-                border-radius: 6px;
-            }
-            
-            QScrollBar::handle:vertical {
-                background-color: #ced4da;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            
-            QScrollBar::handle:vertical:hover {
-                background-color: #adb5bd;
-            }
-            
-            /* Menu Bar */
-            QMenuBar {
-                background-color: #ffffff;
-                color: #2c3e50;
-                border-bottom: 1px solid #e9ecef;
-                padding: 4px;
-            }
-            
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 8px 12px;
-                border-radius: 4px;
-            }
-            
-            QMenuBar::item:selected {
-                background-color: #f8f9fa;
-                color: #007acc;
-            }
-            
-            QMenu {
-                background-color: #ffffff;
-                color: #2c3e50;
-                border: 1px solid #dee2e6;
-                border-radius: 6px;
-                padding: 4px;
-            }
-            
-            QMenu::item {
-                padding: 8px 20px;
-                border-radius: 4px;
-            }
-            
-            QMenu::item:selected {
-                background-color: #f8f9fa;
-                color: #007acc;
-            }
-            
-            /* Status Bar */
-            QStatusBar {
-                background-color: #f8f9fa;
-                color: #6c757d;
-                border-top: 1px solid #e9ecef;
-            }
-        """)
+        apply_theme(self, LIGHT, self.catalog.categories())
     
     def apply_dark_professional_theme(self):
         """Apply complete black dark professional theme"""
-        self.setStyleSheet("""
-            /* Main Window */
-            QMainWindow {
-                background-color: #000000;
-                color: #ffffff;
-            }
-            
-            /* Left Panel */
-            QWidget#leftPanel {
-                background-color: #0a0a0a;
-                border-right: 1px solid #1a1a1a;
-            }
-            
-            /* Right Panel */
-            QWidget#rightPanel {
-                background-color: #0a0a0a;
-            }
-            
-            /* Header Frame */
-            QFrame#headerFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #1a1a1a, stop:1 #333333);
-                border: 1px solid #333333;
-                border-radius: 12px;
-                color: #ffffff;
-            }
-            
-            QLabel#mainTitle {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            QLabel#subtitle {
-                color: #cccccc;
-            }
-            
-            /* Category Cards */
-            QFrame#categoryCard {
-                background-color: #111111;
-                border: 1px solid #222222;
-                border-radius: 12px;
-                margin: 5px;
-            }
-            
-            QFrame#categoryCard:hover {
-                border: 1px solid #444444;
-                background-color: #1a1a1a;
-            }
-            
-            QLabel#categoryTitle {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            QLabel#categoryDescription {
-                color: #aaaaaa;
-            }
-            
-            /* Buttons */
-            QPushButton#primaryButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #1a1a1a, stop:1 #333333);
-                color: #ffffff;
-                border: 1px solid #444444;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-weight: bold;
-            }
-            
-            QPushButton#primaryButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #333333, stop:1 #555555);
-                border-color: #666666;
-            }
-            
-            QPushButton#primaryButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #0a0a0a, stop:1 #1a1a1a);
-            }
-            
-            QPushButton#secondaryButton {
-                background-color: #1a1a1a;
-                color: #ffffff;
-                border: 1px solid #333333;
-                border-radius: 6px;
-                padding: 8px 16px;
-            }
-            
-            QPushButton#secondaryButton:hover {
-                background-color: #333333;
-                border-color: #555555;
-            }
-            
-            QPushButton#toolButton {
-                background-color: #111111;
-                color: #cccccc;
-                border: 1px solid #222222;
-                border-radius: 6px;
-                padding: 6px 12px;
-                text-align: left;
-            }
-            
-            QPushButton#toolButton:hover {
-                background-color: #1a1a1a;
-                border-color: #444444;
-                color: #ffffff;
-            }
-            
-            QPushButton#toolButton:pressed {
-                background-color: #0a0a0a;
-            }
-            
-            /* Console Styling */
-            QFrame#consoleHeader {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #111111, stop:1 #1a1a1a);
-                border: 1px solid #333333;
-                border-radius: 8px 8px 0 0;
-                color: #ffffff;
-            }
-            
-            QLabel#consoleTitle {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            QLabel#statusIndicator {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            QFrame#consoleFrame {
-                background-color: #000000;
-                border: 1px solid #222222;
-                border-radius: 0 0 8px 8px;
-            }
-            
-            QTextEdit#consoleOutput {
-                background-color: #000000;
-                color: #00ff00;
-                border: none;
-                font-family: 'JetBrains Mono', 'Consolas', monospace;
-                selection-background-color: #333333;
-                selection-color: #ffffff;
-            }
-            
-            /* Progress Bar */
-            QFrame#progressContainer {
-                background-color: #111111;
-                border: 1px solid #222222;
-                border-radius: 6px;
-            }
-            
-            QProgressBar#modernProgressBar {
-                border: none;
-                background-color: #1a1a1a;
-                border-radius: 4px;
-                text-align: center;
-                color: #ffffff;
-            }
-            
-            QProgressBar#modernProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #333333, stop:1 #555555);
-                border-radius: 4px;
-            }
-            
-            /* Quick Actions */
-            QFrame#quickActionsFrame {
-                background-color: #111111;
-                border: 1px solid #222222;
-                border-radius: 8px;
-            }
-            
-            QLabel#sectionLabel {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            
-            QLabel#progressLabel {
-                color: #cccccc;
-            }
-            
-            /* Scroll Areas */
-            QScrollArea#categoryScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            
-            QScrollBar:vertical {
-                background-color: #111111;
-                width: 12px;
-                border-radius: 6px;
-                border: 1px solid #222222;
-            }
-            
-            QScrollBar::handle:vertical {
-                background-color: #333333;
-                border-radius: 6px;
-                min-height: 20px;
-                border: 1px solid #444444;
-            }
-            
-            QScrollBar::handle:vertical:hover {
-                background-color: #555555;
-            }
-            
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                background-color: #1a1a1a;
-                border: 1px solid #333333;
-            }
-            
-            /* Menu Bar */
-            QMenuBar {
-                background-color: #000000;
-                color: #ffffff;
-                border-bottom: 1px solid #222222;
-                padding: 4px;
-            }
-            
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 8px 12px;
-                border-radius: 4px;
-            }
-            
-            QMenuBar::item:selected {
-                background-color: #1a1a1a;
-                color: #ffffff;
-            }
-            
-            QMenu {
-                background-color: #111111;
-                color: #ffffff;
-                border: 1px solid #333333;
-                border-radius: 6px;
-                padding: 4px;
-            }
-            
-            QMenu::item {
-                padding: 8px 20px;
-                border-radius: 4px;
-            }
-            
-            QMenu::item:selected {
-                background-color: #1a1a1a;
-                color: #ffffff;
-            }
-            
-            /* Status Bar */
-            QStatusBar {
-                background-color: #000000;
-                color: #cccccc;
-                border-top: 1px solid #222222;
-            }
-            
-            /* Message Boxes */
-            QMessageBox {
-                background-color: #111111;
-                color: #ffffff;
-            }
-            
-            QMessageBox QPushButton {
-                background-color: #1a1a1a;
-                color: #ffffff;
-                border: 1px solid #333333;
-                border-radius: 4px;
-                padding: 6px 12px;
-            }
-            
-            QMessageBox QPushButton:hover {
-                background-color: #333333;
-            }
-            
-            /* File Dialog */
-            QFileDialog {
-                background-color: #111111;
-                color: #ffffff;
-            }
-            
-            /* Splitter */
-            QSplitter::handle {
-                background-color: #222222;
-                width: 3px;
-                border-radius: 1px;
-            }
-            
-            QSplitter::handle:hover {
-                background-color: #444444;
-            }
-        """)
+        apply_theme(self, DARK, self.catalog.categories())
     
     def show_about(self):
         """Show professional about dialog"""
@@ -1630,6 +1380,22 @@ class MainWindow(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            if hasattr(self, 'metrics_sampler'):
+                self.metrics_sampler.stop()
+            if hasattr(self, 'job_pool'):
+                # Stop every tool's process tree before the shells and logs go away;
+                # the forced kill follows GRACE_PERIOD after the polite request
+                if self.suite_scheduler is not None:
+                    self.suite_scheduler.cancel()
+                    self.suite_scheduler = None
+                self.job_pool.cancel_all()
+                self.job_pool.wait_all(int((GRACE_PERIOD + JOB_SHUTDOWN_SLACK) * 1000))
+            if self.shell_pool is not None:
+                self.shell_pool.close()
+            if self.export_runner is not None:
+                self.export_runner.cancel()
+                self.export_runner.wait()
+            self.current_log.close()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,62 @@
+"""
+Script execution thread used by the job pool
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.execution import ScriptExecution
+from core.process_backend import ProcessExecution
+
+
+class ScriptRunner(QThread):
+    """Enhanced thread for running scripts with better progress tracking"""
+    # Output arrives as batches of lines (one signal per ~50 ms / 64 KB window)
+    output_batch = pyqtSignal(list)
+    finished_signal = pyqtSignal(bool, str)
+    progress_update = pyqtSignal(int)
+    # Estimated seconds remaining (-1 when unknown)
+    eta_update = pyqtSignal(float)
+    # Phase announced by the script (##phase)
+    phase_update = pyqtSignal(str)
+    # Structured Report from a native collector
+    report_ready = pyqtSignal(object)
+    # ExecutionResult with timing and output statistics
+    result_ready = pyqtSignal(object)
+
+    def __init__(self, script_path, script_name, job_id=0, collector=None, shell_pool=None, durations=None,
+                 cache=None, force_refresh=False, isolated=False, timeout=None):
+        super().__init__()
+        self.script_path = script_path
+        self.script_name = script_name
+        self.job_id = job_id
+        callbacks = dict(
+            on_output=self.output_batch.emit,
+            on_progress=self.progress_update.emit,
+            on_report=self.report_ready.emit,
+            durations=durations,
+            on_eta=self.eta_update.emit,
+            cache=cache,
+            force_refresh=force_refresh,
+            timeout=timeout,
+            on_phase=self.phase_update.emit,
+        )
+        if isolated:
+            # Output is decoded in a worker process and read here in bulk
+            self.execution = ProcessExecution(
+                script_path, script_name, native=collector is not None,
+                stats_path=durations.path if durations is not None else None, **callbacks)
+        else:
+            self.execution = ScriptExecution(script_path, script_name, collector, shell_pool, **callbacks)
+
+    @property
+    def cancelled(self):
+        return self.execution.cancelled
+
+    def cancel(self):
+        """Request cancellation and kill the running process"""
+        self.execution.cancel()
+
+    def run(self):
+        result = self.execution.run()
+        self.result_ready.emit(result)
+        self.finished_signal.emit(result.success, result.message)
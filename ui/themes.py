@@ -0,0 +1,707 @@
+"""
+Precompiled light and dark themes
+
+Both themes are compiled once into a single stylesheet (including the
+per-category icon colors from the tool catalog) whose rules are scoped by
+the main window's "theme" property, and each theme's palette is cached.
+A theme switch flips that property and repolishes only the widgets the
+theme rules style; the stylesheet is never parsed again. Widgets that
+change appearance at runtime likewise use dynamic properties matched by
+the stylesheet's selectors plus a targeted repolish instead of their own
+stylesheet strings.
+"""
+
+import re
+
+from PyQt6.QtCore import QEvent
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QApplication, QWidget
+
+LIGHT = "light"
+DARK = "dark"
+
+LIGHT_QSS = """
+    /* Main Window */
+    QMainWindow {
+        background-color: #f8f9fa;
+        color: #2c3e50;
+    }
+    
+    /* Left Panel */
+    QWidget#leftPanel {
+        background-color: #ffffff;
+        border-right: 1px solid #e9ecef;
+    }
+    
+    /* Right Panel */
+    QWidget#rightPanel {
+        background-color: #ffffff;
+    }
+    
+    /* Header Frame */
+    QFrame#headerFrame {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #667eea, stop:1 #764ba2);
+        border-radius: 12px;
+        color: white;
+    }
+    
+    QLabel#mainTitle {
+        color: white;
+    }
+    
+    QLabel#subtitle {
+        color: rgba(255, 255, 255, 0.9);
+    }
+    
+    /* Category Cards */
+    QFrame#categoryCard {
+        background-color: #ffffff;
+        border: 1px solid #e9ecef;
+        border-radius: 12px;
+        margin: 5px;
+    }
+    
+    QFrame#categoryCard:hover {
+        border: 1px solid #007acc;
+        background-color: #f8f9fa;
+    }
+    
+    QLabel#categoryTitle {
+        color: #2c3e50;
+        font-weight: bold;
+    }
+    
+    QLabel#categoryDescription {
+        color: #6c757d;
+    }
+    
+    /* Buttons */
+    QPushButton#primaryButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #007acc, stop:1 #0099ff);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 12px 20px;
+        font-weight: bold;
+    }
+    
+    QPushButton#primaryButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #0066aa, stop:1 #0088dd);
+    }
+    
+    QPushButton#primaryButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #005599, stop:1 #0077cc);
+    }
+    
+    QPushButton#secondaryButton {
+        background-color: #6c757d;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+    }
+    
+    QPushButton#secondaryButton:hover {
+        background-color: #5a6268;
+    }
+    
+    QPushButton#toolButton {
+        background-color: #f8f9fa;
+        color: #495057;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+        padding: 6px 12px;
+        text-align: left;
+    }
+    
+    QPushButton#toolButton:hover {
+        background-color: #e9ecef;
+        border-color: #007acc;
+        color: #007acc;
+    }
+    
+    QPushButton#toolButton:pressed {
+        background-color: #dee2e6;
+    }
+    
+    /* Console Styling */
+    QFrame#consoleHeader {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #495057, stop:1 #6c757d);
+        border-radius: 8px 8px 0 0;
+        color: white;
+    }
+    
+    QLabel#consoleTitle {
+        color: white;
+    }
+    
+    QLabel#statusIndicator {
+        color: rgba(255, 255, 255, 0.9);
+        font-weight: bold;
+    }
+    
+    QFrame#consoleFrame {
+        background-color: #ffffff;
+        border: 1px solid #dee2e6;
+        border-radius: 0 0 8px 8px;
+    }
+    
+    QListView#consoleOutput {
+        background-color: #1e1e1e;
+        color: #d4d4d4;
+        border: none;
+        font-family: 'JetBrains Mono', 'Consolas', monospace;
+        selection-background-color: #264f78;
+        selection-color: #ffffff;
+    }
+    
+    /* Progress Bar */
+    QFrame#progressContainer {
+        background-color: #f8f9fa;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+    }
+    
+    QProgressBar#modernProgressBar {
+        border: none;
+        background-color: #e9ecef;
+        border-radius: 4px;
+        text-align: center;
+    }
+    
+    QProgressBar#modernProgressBar::chunk {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #007acc, stop:1 #0099ff);
+        border-radius: 4px;
+    }
+    
+    /* Quick Actions */
+    QFrame#quickActionsFrame {
+        background-color: #f8f9fa;
+        border: 1px solid #dee2e6;
+        border-radius: 8px;
+    }
+    
+    QLabel#sectionLabel {
+        color: #495057;
+        font-weight: bold;
+    }
+    
+    /* Scroll Areas */
+    QScrollArea#categoryScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    
+    QScrollBar:vertical {
+        background-color: #f8f9fa;
+        width: 12px;
+        border-radius: 6px;
+    }
+    
+    QScrollBar::handle:vertical {
+        background-color: #ced4da;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    
+    QScrollBar::handle:vertical:hover {
+        background-color: #adb5bd;
+    }
+    
+    /* Menu Bar */
+    QMenuBar {
+        background-color: #ffffff;
+        color: #2c3e50;
+        border-bottom: 1px solid #e9ecef;
+        padding: 4px;
+    }
+    
+    QMenuBar::item {
+        background-color: transparent;
+        padding: 8px 12px;
+        border-radius: 4px;
+    }
+    
+    QMenuBar::item:selected {
+        background-color: #f8f9fa;
+        color: #007acc;
+    }
+    
+    QMenu {
+        background-color: #ffffff;
+        color: #2c3e50;
+        border: 1px solid #dee2e6;
+        border-radius: 6px;
+        padding: 4px;
+    }
+    
+    QMenu::item {
+        padding: 8px 20px;
+        border-radius: 4px;
+    }
+    
+    QMenu::item:selected {
+        background-color: #f8f9fa;
+        color: #007acc;
+    }
+    
+    /* Status Bar */
+    QStatusBar {
+        background-color: #f8f9fa;
+        color: #6c757d;
+        border-top: 1px solid #e9ecef;
+    }
+    
+    /* Splitter */
+    QSplitter::handle {
+        background-color: #333333;
+        width: 3px;
+        border-radius: 1px;
+        margin: 2px;
+    }
+    
+    QSplitter::handle:hover {
+        background-color: #555555;
+    }
+"""
+
+DARK_QSS = """
+    /* Main Window */
+    QMainWindow {
+        background-color: #000000;
+        color: #ffffff;
+    }
+    
+    /* Left Panel */
+    QWidget#leftPanel {
+        background-color: #0a0a0a;
+        border-right: 1px solid #1a1a1a;
+    }
+    
+    /* Right Panel */
+    QWidget#rightPanel {
+        background-color: #0a0a0a;
+    }
+    
+    /* Header Frame */
+    QFrame#headerFrame {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #1a1a1a, stop:1 #333333);
+        border: 1px solid #333333;
+        border-radius: 12px;
+        color: #ffffff;
+    }
+    
+    QLabel#mainTitle {
+        color: #ffffff;
+        font-weight: bold;
+    }
+    
+    QLabel#subtitle {
+        color: #cccccc;
+    }
+    
+    /* Category Cards */
+    QFrame#categoryCard {
+        background-color: #111111;
+        border: 1px solid #222222;
+        border-radius: 12px;
+        margin: 5px;
+    }
+    
+    QFrame#categoryCard:hover {
+        border: 1px solid #444444;
+        background-color: #1a1a1a;
+    }
+    
+    QLabel#categoryTitle {
+        color: #ffffff;
+        font-weight: bold;
+    }
+    
+    QLabel#categoryDescription {
+        color: #aaaaaa;
+    }
+    
+    /* Buttons */
+    QPushButton#primaryButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #1a1a1a, stop:1 #333333);
+        color: #ffffff;
+        border: 1px solid #444444;
+        border-radius: 8px;
+        padding: 12px 20px;
+        font-weight: bold;
+    }
+    
+    QPushButton#primaryButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #333333, stop:1 #555555);
+        border-color: #666666;
+    }
+    
+    QPushButton#primaryButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #0a0a0a, stop:1 #1a1a1a);
+    }
+    
+    QPushButton#secondaryButton {
+        background-color: #1a1a1a;
+        color: #ffffff;
+        border: 1px solid #333333;
+        border-radius: 6px;
+        padding: 8px 16px;
+    }
+    
+    QPushButton#secondaryButton:hover {
+        background-color: #333333;
+        border-color: #555555;
+    }
+    
+    QPushButton#toolButton {
+        background-color: #111111;
+        color: #cccccc;
+        border: 1px solid #222222;
+        border-radius: 6px;
+        padding: 6px 12px;
+        text-align: left;
+    }
+    
+    QPushButton#toolButton:hover {
+        background-color: #1a1a1a;
+        border-color: #444444;
+        color: #ffffff;
+    }
+    
+    QPushButton#toolButton:pressed {
+        background-color: #0a0a0a;
+    }
+    
+    /* Console Styling */
+    QFrame#consoleHeader {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #111111, stop:1 #1a1a1a);
+        border: 1px solid #333333;
+        border-radius: 8px 8px 0 0;
+        color: #ffffff;
+    }
+    
+    QLabel#consoleTitle {
+        color: #ffffff;
+        font-weight: bold;
+    }
+    
+    QLabel#statusIndicator {
+        color: #ffffff;
+        font-weight: bold;
+    }
+    
+    QFrame#consoleFrame {
+        background-color: #000000;
+        border: 1px solid #222222;
+        border-radius: 0 0 8px 8px;
+    }
+    
+    QListView#consoleOutput {
+        background-color: #000000;
+        color: #00ff00;
+        border: none;
+        font-family: 'JetBrains Mono', 'Consolas', monospace;
+        selection-background-color: #333333;
+        selection-color: #ffffff;
+    }
+    
+    /* Progress Bar */
+    QFrame#progressContainer {
+        background-color: #111111;
+        border: 1px solid #222222;
+        border-radius: 6px;
+    }
+    
+    QProgressBar#modernProgressBar {
+        border: none;
+        background-color: #1a1a1a;
+        border-radius: 4px;
+        text-align: center;
+        color: #ffffff;
+    }
+    
+    QProgressBar#modernProgressBar::chunk {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #333333, stop:1 #555555);
+        border-radius: 4px;
+    }
+    
+    /* Quick Actions */
+    QFrame#quickActionsFrame {
+        background-color: #111111;
+        border: 1px solid #222222;
+        border-radius: 8px;
+    }
+    
+    QLabel#sectionLabel {
+        color: #ffffff;
+        font-weight: bold;
+    }
+    
+    QLabel#progressLabel {
+        color: #cccccc;
+    }
+    
+    /* Scroll Areas */
+    QScrollArea#categoryScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    
+    QScrollBar:vertical {
+        background-color: #111111;
+        width: 12px;
+        border-radius: 6px;
+        border: 1px solid #222222;
+    }
+    
+    QScrollBar::handle:vertical {
+        background-color: #333333;
+        border-radius: 6px;
+        min-height: 20px;
+        border: 1px solid #444444;
+    }
+    
+    QScrollBar::handle:vertical:hover {
+        background-color: #555555;
+    }
+    
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        background-color: #1a1a1a;
+        border: 1px solid #333333;
+    }
+    
+    /* Menu Bar */
+    QMenuBar {
+        background-color: #000000;
+        color: #ffffff;
+        border-bottom: 1px solid #222222;
+        padding: 4px;
+    }
+    
+    QMenuBar::item {
+        background-color: transparent;
+        padding: 8px 12px;
+        border-radius: 4px;
+    }
+    
+    QMenuBar::item:selected {
+        background-color: #1a1a1a;
+        color: #ffffff;
+    }
+    
+    QMenu {
+        background-color: #111111;
+        color: #ffffff;
+        border: 1px solid #333333;
+        border-radius: 6px;
+        padding: 4px;
+    }
+    
+    QMenu::item {
+        padding: 8px 20px;
+        border-radius: 4px;
+    }
+    
+    QMenu::item:selected {
+        background-color: #1a1a1a;
+        color: #ffffff;
+    }
+    
+    /* Status Bar */
+    QStatusBar {
+        background-color: #000000;
+        color: #cccccc;
+        border-top: 1px solid #222222;
+    }
+    
+    /* Message Boxes */
+    QMessageBox {
+        background-color: #111111;
+        color: #ffffff;
+    }
+    
+    QMessageBox QPushButton {
+        background-color: #1a1a1a;
+        color: #ffffff;
+        border: 1px solid #333333;
+        border-radius: 4px;
+        padding: 6px 12px;
+    }
+    
+    QMessageBox QPushButton:hover {
+        background-color: #333333;
+    }
+    
+    /* File Dialog */
+    QFileDialog {
+        background-color: #111111;
+        color: #ffffff;
+    }
+    
+    /* Splitter */
+    QSplitter::handle {
+        background-color: #333333;
+        width: 3px;
+        border-radius: 1px;
+        margin: 2px;
+    }
+    
+    QSplitter::handle:hover {
+        background-color: #555555;
+    }
+"""
+
+# Rules shared by both themes; category icons pick their color by property
+COMMON_QSS = """
+    QLabel#categoryIcon {
+        border-radius: 20px;
+        color: white;
+    }
+"""
+
+# (window, window text, base, text, button, highlight)
+PALETTE_COLORS = {
+    LIGHT: ("#f8f9fa", "#2c3e50", "#ffffff", "#2c3e50", "#ffffff", "#007acc"),
+    DARK: ("#000000", "#ffffff", "#111111", "#ffffff", "#222222", "#007acc"),
+}
+
+# Both themes live in one stylesheet; each rule is scoped to windows whose
+# "theme" property names its theme, so a switch never re-parses the sheet
+THEME_PROPERTY = "theme"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_RULE_SELECTORS = re.compile(r"([^{}]+)\{")
+_COMPOUND = re.compile(r"(Q\w+)(?:#(\w+))?")
+
+_stylesheets = {}
+_palettes = {}
+# Selector targets of the themed rules: object name -> class names (None: any object name)
+_targets = {}
+
+
+def _category_rules(categories):
+    return "\n".join(
+        f'    QLabel#categoryIcon[category="{category.id}"] {{ background-color: {category.color}; }}'
+        for category in categories
+    )
+
+
+def _scope_selector(selector, name):
+    scope = f'QMainWindow[{THEME_PROPERTY}="{name}"]'
+    if selector.startswith("QMainWindow"):
+        return scope + selector[len("QMainWindow"):]
+    return f"{scope} {selector}"
+
+
+def _scope_theme(qss, name):
+    """A theme's rules, each limited to windows whose theme property is ``name``"""
+    def scoped(match):
+        selectors = (selector.strip() for selector in match.group(1).split(","))
+        return "\n    " + ", ".join(_scope_selector(selector, name) for selector in selectors) + " {"
+    return _RULE_SELECTORS.sub(scoped, _COMMENT.sub("", qss))
+
+
+def _selector_targets(qss):
+    """{object name or None: {class names}} of the widgets the rules of ``qss`` style"""
+    targets = {}
+    for match in _RULE_SELECTORS.finditer(_COMMENT.sub("", qss)):
+        for selector in match.group(1).split(","):
+            # The styled widget is the last compound; sub-controls and states don't matter
+            compound = _COMPOUND.match(selector.split()[-1])
+            if compound is not None:
+                targets.setdefault(compound.group(2), set()).add(compound.group(1))
+    return targets
+
+
+def compile_theme(categories=()):
+    """Return the stylesheet holding both themes, compiled on first use"""
+    key = tuple((category.id, category.color) for category in categories)
+    stylesheet = _stylesheets.get(key)
+    if stylesheet is None:
+        stylesheet = (_scope_theme(LIGHT_QSS, LIGHT) + _scope_theme(DARK_QSS, DARK)
+                      + COMMON_QSS + _category_rules(categories) + "\n")
+        _stylesheets[key] = stylesheet
+        if not _targets:
+            _targets.update(_selector_targets(LIGHT_QSS + DARK_QSS))
+    return stylesheet
+
+
+def theme_palette(name):
+    """Return the cached palette for a theme (used by widgets the stylesheet doesn't cover)"""
+    palette = _palettes.get(name)
+    if palette is None:
+        window, window_text, base, text, button, highlight = PALETTE_COLORS.get(name, PALETTE_COLORS[LIGHT])
+        palette = QPalette()
+        palette.setColor(QPalette.ColorRole.Window, QColor(window))
+        palette.setColor(QPalette.ColorRole.WindowText, QColor(window_text))
+        palette.setColor(QPalette.ColorRole.Base, QColor(base))
+        palette.setColor(QPalette.ColorRole.Text, QColor(text))
+        palette.setColor(QPalette.ColorRole.Button, QColor(button))
+        palette.setColor(QPalette.ColorRole.ButtonText, QColor(text))
+        palette.setColor(QPalette.ColorRole.Highlight, QColor(highlight))
+        _palettes[name] = palette
+    return palette
+
+
+def themed_widgets(window):
+    """The window and the descendants a themed rule may match"""
+    anonymous = _targets.get(None, set())
+    widgets = [window]
+    for child in window.findChildren(QWidget):
+        classes = _targets.get(child.objectName(), anonymous)
+        if classes is not anonymous:
+            classes = classes | anonymous
+        if any(child.inherits(class_name) for class_name in classes):
+            widgets.append(child)
+    return widgets
+
+
+def apply_theme(window, name, categories=()):
+    """
+    Switch a main window to a theme; a no-op if it is already active.
+
+    The combined stylesheet is set (and parsed) once. Later switches only
+    flip the window's theme property and repolish the widgets the theme
+    rules style.
+    """
+    if window.property(THEME_PROPERTY) == name:
+        return False
+    stylesheet = compile_theme(tuple(categories))
+    # Restyle everything first and repaint once at the end
+    window.setUpdatesEnabled(False)
+    try:
+        window.setPalette(theme_palette(name))
+        window.setProperty(THEME_PROPERTY, name)
+        if window.styleSheet() != stylesheet:
+            window.setStyleSheet(stylesheet)
+        else:
+            style = window.style()
+            for widget in themed_widgets(window):
+                style.unpolish(widget)
+                style.polish(widget)
+                # Borders and fonts differ between the themes, so sizes are recomputed
+                QApplication.sendEvent(widget, QEvent(QEvent.Type.StyleChange))
+    finally:
+        window.setUpdatesEnabled(True)
+    return True
+
+
+def repolish(widget):
+    """Re-evaluate a widget's stylesheet rules after one of its dynamic properties changed"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()